@@ -18,6 +18,9 @@ from assets.instruments import Stock, Currency, Futures, Option
 # Price Providers
 from assets import price_providers # import subpackage
 
+# Registry snapshots
+from assets.core.snapshot import save_registry, load_registry, AssetBatch
+
 # Utilities
 from assets.utils.expiration_date import ExpirationDate
 
@@ -38,6 +41,11 @@ __all__ = [
     # Price Providers
     "price_providers",
 
+    # Registry snapshots
+    "save_registry",
+    "load_registry",
+    "AssetBatch",
+
     # Utilities
     "ExpirationDate",
 ]
@@ -0,0 +1,79 @@
+# Command-line entry point: python -m assets
+
+import argparse
+import sys
+from datetime import datetime
+
+
+def _parse_price(text):
+    name, sep, price = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected NAME=PRICE, got '{text}'.")
+    return name, float(price)
+
+
+def _parse_date(text):
+    for fmt in ("%Y-%m-%d", "%y%m%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Invalid date '{text}'. Expected 'YYYY-MM-DD' or 'YYMMDD'.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the parser of the command line."""
+    parser = argparse.ArgumentParser(prog="python -m assets", description="Tools for the assets package.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    revalue = commands.add_parser("revalue", help="Revalue a CSV position file in chunks.",
+                                  description="Stream a CSV position file in chunks, value every position "
+                                              "as of a date and write the results incrementally.")
+    revalue.add_argument("positions", help="CSV position file (see assets.batch.revalue_file for the columns).")
+    revalue.add_argument("-o", "--output", default="-", help="Output CSV file. Defaults to standard output.")
+    revalue.add_argument("--as-of", type=_parse_date, default=None,
+                         help="Valuation date, 'YYYY-MM-DD' or 'YYMMDD'. Defaults to now.")
+    revalue.add_argument("--prices", help="CSV file of underlying prices with 'name' and 'price' columns.")
+    revalue.add_argument("--price", type=_parse_price, action="append", default=[], metavar="NAME=PRICE",
+                         help="Underlying price. Can be repeated; overrides --prices.")
+    revalue.add_argument("--vol", type=float, default=0.0, help="Volatility for options without a 'vol' cell.")
+    revalue.add_argument("--rate", type=float, default=0.0, help="Continuously compounded rate.")
+    revalue.add_argument("--chunk-size", type=int, default=10000, help="Rows per chunk.")
+    revalue.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+    revalue.add_argument("--progress", action="store_true", help="Report progress after each chunk.")
+    return parser
+
+
+def _revalue(args):
+    from assets.batch import revalue_file, read_prices
+
+    prices = read_prices(args.prices) if args.prices else {}
+    prices.update(args.price)
+
+    def report(stats):
+        print(f"chunk {stats.chunks}: {stats.rows} rows, {stats.errors} errors, "
+              f"{stats.seconds:.2f}s ({stats.rows_per_second:,.0f} rows/s)", file=sys.stderr)
+
+    stats = revalue_file(args.positions, args.output, prices, as_of=args.as_of, vol=args.vol, r=args.rate,
+                         chunk_size=args.chunk_size, workers=args.workers,
+                         progress=report if args.progress else None)
+    print(f"revalued {stats.rows} positions in {stats.chunks} chunks in {stats.seconds:.2f}s "
+          f"({stats.rows_per_second:,.0f} rows/s); {stats.errors} errors; total value {stats.value:,.2f}",
+          file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+def main(argv=None) -> int:
+    """Run the command line and return its exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "revalue":
+            return _revalue(args)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
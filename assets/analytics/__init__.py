@@ -0,0 +1,20 @@
+"""
+Analytics on price histories.
+
+Provides vectorized functions and incremental estimators operating on
+arrays of prices or returns for many assets at once.
+"""
+
+from .returns import (simple_returns, log_returns, rolling_mean, rolling_std, ewma_volatility,
+                      correlation_matrix, RollingStats, EWMAVolatility)
+
+__all__ = [
+    "simple_returns",
+    "log_returns",
+    "rolling_mean",
+    "rolling_std",
+    "ewma_volatility",
+    "correlation_matrix",
+    "RollingStats",
+    "EWMAVolatility",
+]
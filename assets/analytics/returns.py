@@ -0,0 +1,322 @@
+# Contains functions and classes for returns and realized volatility
+
+import numpy as np
+from scipy.signal import lfilter
+
+#################################
+# Returns
+#################################
+
+def simple_returns(prices, axis: int = 0) -> np.ndarray:
+    """
+    Compute simple returns P_t / P_{t-1} - 1.
+
+    Parameters
+    ----------
+    prices : array-like
+        Price history, with time along `axis` (e.g., shape (n_bars, n_assets)).
+    axis : int, optional
+        Time axis. Defaults to 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Returns, one element shorter than `prices` along `axis`.
+    """
+    prices = np.asarray(prices, dtype=float)
+    return np.diff(prices, axis=axis) / np.delete(prices, -1, axis=axis)
+
+
+def log_returns(prices, axis: int = 0) -> np.ndarray:
+    """
+    Compute log returns log(P_t / P_{t-1}).
+
+    See `simple_returns` for the parameters.
+    """
+    return np.diff(np.log(np.asarray(prices, dtype=float)), axis=axis)
+
+
+#################################
+# Rolling statistics
+#################################
+
+def rolling_mean(x, window: int) -> np.ndarray:
+    """
+    Rolling mean over the first axis, in O(n) using cumulative sums.
+
+    Parameters
+    ----------
+    x : array-like
+        Observations with time along the first axis (e.g., shape (n_bars, n_assets)).
+    window : int
+        Number of observations per window.
+
+    Returns
+    -------
+    numpy.ndarray
+        Means of every full window, of length n_bars - window + 1 along the first axis.
+
+    Raises
+    ------
+    ValueError
+        If the window is not between 1 and the number of observations.
+    """
+    x = np.asarray(x, dtype=float)
+    _check_window(x, window)
+    return _window_sums(x - x[0], window) / window + x[0]
+
+
+def rolling_std(x, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation over the first axis, in O(n) using cumulative sums.
+
+    Observations are shifted by their first value before summing, which keeps the
+    sums of squares small and avoids catastrophic cancellation for price-like data.
+
+    Parameters
+    ----------
+    x : array-like
+        Observations with time along the first axis.
+    window : int
+        Number of observations per window.
+    ddof : int, optional
+        Delta degrees of freedom. Defaults to 1 (sample standard deviation).
+
+    Returns
+    -------
+    numpy.ndarray
+        Standard deviations of every full window.
+
+    Raises
+    ------
+    ValueError
+        If the window is not larger than `ddof` or exceeds the number of observations.
+    """
+    x = np.asarray(x, dtype=float)
+    _check_window(x, window)
+    if window <= ddof:
+        raise ValueError("'window' must be larger than 'ddof'.")
+    shifted = x - x[0]
+    sums = _window_sums(shifted, window)
+    squares = _window_sums(shifted ** 2, window)
+    variance = (squares - sums ** 2 / window) / (window - ddof)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def ewma_volatility(returns, lam: float = 0.94, initial_variance=None, periods_per_year: float = None) -> np.ndarray:
+    """
+    Exponentially weighted moving average (RiskMetrics) volatility.
+
+    Implements var_t = lam * var_{t-1} + (1 - lam) * r_t^2 as a linear filter over the
+    first axis, so the recursion runs in compiled code for all assets at once.
+
+    Parameters
+    ----------
+    returns : array-like
+        Returns with time along the first axis.
+    lam : float, optional
+        Decay factor in (0, 1). Defaults to 0.94.
+    initial_variance : float or array-like, optional
+        Variance before the first return. Defaults to the first squared return.
+    periods_per_year : float or None, optional
+        If given, volatilities are annualized with sqrt(periods_per_year).
+
+    Returns
+    -------
+    numpy.ndarray
+        Volatility after each return, same shape as `returns`.
+    """
+    if not 0 < lam < 1:
+        raise ValueError("'lam' must lie in (0, 1).")
+    squared = np.asarray(returns, dtype=float) ** 2
+    if initial_variance is None:
+        initial_variance = squared[0]
+    zi = lam * np.broadcast_to(np.asarray(initial_variance, dtype=float), squared.shape[1:])[np.newaxis]
+    variance, _ = lfilter([1 - lam], [1, -lam], squared, axis=0, zi=zi)
+    vol = np.sqrt(variance)
+    return vol * np.sqrt(periods_per_year) if periods_per_year is not None else vol
+
+
+def correlation_matrix(returns) -> np.ndarray:
+    """
+    Correlation matrix of the columns of a returns array.
+
+    Parameters
+    ----------
+    returns : array-like
+        Returns of shape (n_bars, n_assets).
+
+    Returns
+    -------
+    numpy.ndarray
+        Correlation matrix of shape (n_assets, n_assets).
+    """
+    returns = np.asarray(returns, dtype=float)
+    centered = returns - returns.mean(axis=0)
+    cov = centered.T @ centered
+    scale = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.outer(scale, scale)
+
+
+#################################
+# Incremental statistics
+#################################
+
+class RollingStats:
+    """
+    Rolling mean and standard deviation updated in O(n_assets) per appended bar.
+
+    Keeps the last `window` bars in a preallocated ring buffer together with running
+    sums, which are recomputed from the buffer once per full cycle to bound the
+    accumulation of rounding errors. As in `rolling_std`, observations are stored and
+    summed relative to a shift (the first bar, then the window mean at each full
+    cycle), which avoids catastrophic cancellation for price-like data.
+
+    Attributes
+    ----------
+    window : int
+        Number of bars per window.
+    count : int
+        Number of bars currently in the window (at most `window`).
+    """
+
+    def __init__(self, window: int, n_assets: int = 1, ddof: int = 1):
+        """
+        Initialize empty rolling statistics.
+
+        Parameters
+        ----------
+        window : int
+            Number of bars per window.
+        n_assets : int, optional
+            Number of assets per bar.
+        ddof : int, optional
+            Delta degrees of freedom for the standard deviation.
+        """
+        if window <= ddof:
+            raise ValueError("'window' must be larger than 'ddof'.")
+        self.window = window
+        self.ddof = ddof
+        self.count = 0
+        self._buffer = np.zeros((window, n_assets))
+        self._position = 0
+        self._shift = None
+        self._sum = np.zeros(n_assets)
+        self._sum_sq = np.zeros(n_assets)
+
+    def append(self, bar) -> None:
+        """
+        Add a bar of observations, dropping the oldest one once the window is full.
+
+        Parameters
+        ----------
+        bar : float or array-like
+            One observation per asset.
+        """
+        bar = np.asarray(bar, dtype=float)
+        if self._shift is None:
+            self._shift = np.broadcast_to(bar, self._sum.shape).copy()
+        bar = bar - self._shift
+        old = self._buffer[self._position]
+        if self.count == self.window:
+            self._sum -= old
+            self._sum_sq -= old ** 2
+        else:
+            self.count += 1
+        old[...] = bar
+        self._sum += bar
+        self._sum_sq += bar ** 2
+        self._position = (self._position + 1) % self.window
+        if self._position == 0:
+            # Re-center on the window mean so the shift follows drifting prices.
+            center = self._buffer[:self.count].mean(axis=0)
+            self._buffer[:self.count] -= center
+            self._shift += center
+            self._sum = self._buffer[:self.count].sum(axis=0)
+            self._sum_sq = (self._buffer[:self.count] ** 2).sum(axis=0)
+
+    def extend(self, bars) -> None:
+        """Append several bars, oldest first."""
+        for bar in np.asarray(bars, dtype=float):
+            self.append(bar)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean per asset over the current window."""
+        return self._shift + self._sum / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        """Standard deviation per asset over the current window (NaN until enough bars)."""
+        if self.count <= self.ddof:
+            return np.full(self._sum.shape, np.nan)
+        variance = (self._sum_sq - self._sum ** 2 / self.count) / (self.count - self.ddof)
+        return np.sqrt(np.maximum(variance, 0.0))
+
+
+class EWMAVolatility:
+    """
+    EWMA volatility updated in O(n_assets) per appended return bar.
+
+    Attributes
+    ----------
+    lam : float
+        Decay factor in (0, 1).
+    variance : numpy.ndarray or None
+        Current variance per asset, None before the first bar.
+    """
+
+    def __init__(self, lam: float = 0.94, initial_variance=None):
+        """
+        Initialize the estimator.
+
+        Parameters
+        ----------
+        lam : float, optional
+            Decay factor in (0, 1). Defaults to 0.94.
+        initial_variance : float or array-like, optional
+            Variance before the first return. Defaults to the first squared return.
+        """
+        if not 0 < lam < 1:
+            raise ValueError("'lam' must lie in (0, 1).")
+        self.lam = lam
+        self.variance = None if initial_variance is None else np.asarray(initial_variance, dtype=float)
+
+    def update(self, returns) -> np.ndarray:
+        """
+        Incorporate one bar of returns.
+
+        Parameters
+        ----------
+        returns : float or array-like
+            One return per asset.
+
+        Returns
+        -------
+        numpy.ndarray
+            The updated volatility per asset.
+        """
+        squared = np.asarray(returns, dtype=float) ** 2
+        previous = squared if self.variance is None else self.variance
+        self.variance = self.lam * previous + (1 - self.lam) * squared
+        return self.volatility
+
+    @property
+    def volatility(self) -> np.ndarray:
+        """Current volatility per asset."""
+        return np.sqrt(self.variance)
+
+
+#################################
+# Helpers
+#################################
+
+def _check_window(x, window):
+    if not 1 <= window <= len(x):
+        raise ValueError(f"'window' must be between 1 and the number of observations ({len(x)}).")
+
+
+def _window_sums(x, window):
+    sums = np.cumsum(x, axis=0)
+    return np.concatenate((sums[window - 1:window], sums[window:] - sums[:-window]), axis=0)
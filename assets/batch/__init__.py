@@ -0,0 +1,16 @@
+"""
+Batch processing of position files.
+
+Provides a chunked, streaming revaluation pipeline, also available from the
+command line as ``python -m assets revalue``.
+"""
+
+from .revaluation import RevaluationStats, revalue_file, revalue_rows, read_prices, OUTPUT_COLUMNS
+
+__all__ = [
+    "RevaluationStats",
+    "revalue_file",
+    "revalue_rows",
+    "read_prices",
+    "OUTPUT_COLUMNS",
+]
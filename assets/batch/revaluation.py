@@ -0,0 +1,361 @@
+# Contains the chunked revaluation pipeline for position files
+
+import csv
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import NamedTuple
+import numpy as np
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.instruments.stock import Stock
+from assets.pricing.black76 import black76_price
+from assets.utils.expiration_date import ExpirationDate
+from assets.utils.symbols import parse_option_symbol
+
+OUTPUT_COLUMNS = ("row", "name", "quantity", "underlying_price", "T", "unit_value", "value", "error")
+
+#################################
+# RevaluationStats
+#################################
+
+class RevaluationStats(NamedTuple):
+    """
+    Progress and timing of a revaluation run.
+
+    Attributes
+    ----------
+    rows : int
+        Number of positions revalued so far.
+    chunks : int
+        Number of chunks written so far.
+    errors : int
+        Number of positions that could not be valued (e.g., malformed row or unpriced underlying).
+    value : float
+        Total value of the valued positions.
+    seconds : float
+        Wall-clock time elapsed since the start of the run.
+    """
+    rows: int
+    chunks: int
+    errors: int
+    value: float
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+#################################
+# Pipeline
+#################################
+
+def revalue_file(input_path, output_path, prices, as_of: datetime = None, vol: float = 0.0, r: float = 0.0,
+                 chunk_size: int = 10000, workers: int = 1, progress=None) -> RevaluationStats:
+    """
+    Revalue a CSV position file chunk by chunk and stream the results to a CSV file.
+
+    Only `chunk_size` input rows (times the number of chunks in flight when `workers`
+    is above 1) are held in memory at once. Each chunk is parsed into plain arrays
+    and valued in one vectorized pass with the given underlying prices and the times
+    to expiration as of `as_of`; no instrument is registered, so neither the live
+    registry nor its prices are touched, and memory does not grow with the number of
+    distinct contracts. Results are written in input order as soon as each chunk is
+    done. Rows that cannot be parsed or valued are reported in the ``error`` column.
+
+    Input columns (header row required):
+
+    - ``instrument``: 'option' (default when the column is absent or empty) or 'futures'.
+    - Options: ``symbol`` (OCC-like symbol), or ``underlying``, ``strike``, ``expiration``
+      ('YYMMDD') and ``option_type``; optional ``multiplier`` (default 100) and ``vol``.
+    - Futures: ``underlying``, ``expiration``, ``forward_price`` and ``contract_size``.
+    - ``quantity``: number of contracts (default 1).
+
+    Parameters
+    ----------
+    input_path : str or path-like
+        The position file.
+    output_path : str, path-like or file-like
+        Where the results are written, with the columns of `OUTPUT_COLUMNS`. '-' writes
+        to standard output.
+    prices : dict
+        Prices of the underlyings, keyed by ticker.
+    as_of : datetime or None, optional
+        Valuation date. Defaults to now.
+    vol : float, optional
+        Volatility used for options without a ``vol`` cell. 0 values options at their
+        discounted intrinsic value on the forward.
+    r : float, optional
+        Continuously compounded rate, used for discounting and as cost of carry.
+    chunk_size : int, optional
+        Number of rows read, valued and written at a time.
+    workers : int, optional
+        Number of worker processes. 1 values the chunks in the current process.
+    progress : callable or None, optional
+        Called with the running `RevaluationStats` after each chunk.
+
+    Returns
+    -------
+    RevaluationStats
+        Totals of the run.
+
+    Raises
+    ------
+    ValueError
+        If `chunk_size` or `workers` is not positive, or a required column is missing.
+    """
+    if chunk_size < 1 or workers < 1:
+        raise ValueError("chunk_size and workers must be at least 1.")
+    as_of = datetime.now() if as_of is None else as_of
+    start = time.perf_counter()
+    rows = chunks = errors = 0
+    total = 0.0
+
+    with open(input_path, newline="") as source, _open_output(output_path) as target:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"'{input_path}' is empty.")
+        _check_header(header, input_path)
+        writer = csv.writer(target)
+        writer.writerow(OUTPUT_COLUMNS)
+        settings = (header, dict(prices), as_of, vol, r)
+
+        for results in _map_chunks(_chunks(reader, chunk_size), settings, workers):
+            writer.writerows(results)
+            rows += len(results)
+            chunks += 1
+            for row in results:
+                if row[-1]:
+                    errors += 1
+                else:
+                    total += row[6]
+            if progress is not None:
+                progress(RevaluationStats(rows, chunks, errors, total, time.perf_counter() - start))
+    return RevaluationStats(rows, chunks, errors, total, time.perf_counter() - start)
+
+
+def revalue_rows(header, rows, prices, as_of: datetime, vol: float = 0.0, r: float = 0.0,
+                 first_row: int = 0) -> list:
+    """
+    Revalue one chunk of position rows. See `revalue_file` for the columns and parameters.
+
+    Rows are parsed into plain arrays and valued with one vectorized `black76_price`
+    call; no instrument is created, so nothing outlives the chunk and the registry
+    does not grow with the number of distinct contracts. A row that cannot be parsed
+    or valued is reported in the ``error`` column and does not stop the chunk.
+
+    Parameters
+    ----------
+    header : list of str
+        Column names.
+    rows : list of list of str
+        The rows of the chunk.
+    first_row : int, optional
+        Index of the first row in the file, reported in the ``row`` output column.
+
+    Returns
+    -------
+    list of tuple
+        One result row per input row, with the columns of `OUTPUT_COLUMNS`.
+    """
+    columns = {name: i for i, name in enumerate(header)}
+    spots = {Stock._make_name(name): price for name, price in prices.items()}
+    times = {}  # expiration date -> years to expiration, or the parsing error
+    n = len(rows)
+    names, errors = [""] * n, [""] * n
+    quantity, spot, T, sigma = np.ones(n), np.full(n, np.nan), np.full(n, np.nan), np.zeros(n)
+    is_futures = np.zeros(n, dtype=bool)
+    strike, scale = np.zeros(n), np.zeros(n)  # strike and multiplier, or forward price and contract size
+    option_types = ["C"] * n
+
+    for i, row in enumerate(rows):
+        try:
+            kind, names[i], ticker, expiration, strike[i], scale[i], option_type, sigma[i], quantity[i] = \
+                _parse_row(row, columns, vol)
+            T[i] = _years_to(expiration, as_of, times)
+        except (ValueError, TypeError, KeyError) as e:
+            errors[i] = str(e)
+            continue
+        is_futures[i] = kind == "futures"
+        option_types[i] = option_type
+        spot[i] = spots.get(ticker, np.nan)
+        if spot[i] != spot[i]:
+            errors[i] = f"no price for {ticker}"
+
+    valued = np.array([not e for e in errors], dtype=bool)
+    unit = np.full(n, np.nan)
+    T_pos = np.maximum(T, 0.0)
+    forward = spot * np.exp(r * T_pos)
+    options = valued & ~is_futures
+    if options.any():
+        unit[options] = scale[options] * black76_price(forward[options], strike[options], T[options], sigma[options],
+                                                       r, [t for t, o in zip(option_types, options) if o])
+    futures = valued & is_futures
+    unit[futures] = scale[futures] * (forward[futures] - strike[futures])
+
+    quantity, spot, T, unit, valued = (x.tolist() for x in (quantity, spot, T, unit, valued))
+    results = []
+    for i in range(n):
+        if valued[i]:
+            results.append((first_row + i, names[i], quantity[i], spot[i], T[i], unit[i],
+                            quantity[i] * unit[i], ""))
+        else:
+            results.append((first_row + i, names[i], quantity[i] if quantity[i] == quantity[i] else "", "",
+                            T[i] if T[i] == T[i] else "", "", "", errors[i]))
+    return results
+
+
+def read_prices(path) -> dict:
+    """
+    Read underlying prices from a CSV file with ``name`` and ``price`` columns.
+
+    Returns
+    -------
+    dict
+        Prices keyed by ticker.
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or not {"name", "price"} <= set(reader.fieldnames):
+            raise ValueError(f"'{path}' must have 'name' and 'price' columns.")
+        return {row["name"]: float(row["price"]) for row in reader if row["price"].strip()}
+
+
+#################################
+# Helpers
+#################################
+
+def _chunks(reader, chunk_size):
+    first_row = 0
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        yield first_row, rows
+        first_row += len(rows)
+
+
+def _revalue_chunk(settings, chunk):
+    header, prices, as_of, vol, r = settings
+    first_row, rows = chunk
+    return revalue_rows(header, rows, prices, as_of, vol, r, first_row)
+
+
+def _map_chunks(chunks, settings, workers):
+    """Yield the results of each chunk in order, keeping at most 2 * `workers` chunks in flight."""
+    if workers == 1:
+        for chunk in chunks:
+            yield _revalue_chunk(settings, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_revalue_chunk, settings, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _parse_row(row, columns, vol):
+    """Return (kind, name, ticker, expiration, strike or forward, multiplier or size, option type, vol, quantity)."""
+    def cell(name):
+        i = columns.get(name)
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    kind = cell("instrument").lower() or "option"
+    quantity = _number(cell("quantity"), "quantity", 1.0)
+    if kind == "futures":
+        ticker, expiration = Stock._make_name(_required(cell("underlying"), "underlying")), cell("expiration")
+        ExpirationDate(expiration)  # validates the date before it is used in the name
+        name = Futures._format_name(ticker, expiration)
+        return (kind, name, ticker, expiration, _number(cell("forward_price"), "forward_price"),
+                _number(cell("contract_size"), "contract_size"), "C", 0.0, quantity)
+    if kind != "option":
+        raise ValueError(f"invalid instrument '{kind}'")
+    if cell("symbol"):
+        underlying, expiration, option_type, strike = parse_option_symbol(cell("symbol"))
+    else:
+        underlying, expiration = _required(cell("underlying"), "underlying"), cell("expiration")
+        strike = _number(cell("strike"), "strike")
+        option_type = cell("option_type").upper()
+        if option_type not in ("C", "CALL", "P", "PUT"):
+            raise ValueError(f"invalid option_type '{cell('option_type')}'")
+    ticker = Stock._make_name(underlying)
+    name = Option._format_name(ticker, strike, expiration, option_type)
+    return (kind, name, ticker, expiration, strike, _number(cell("multiplier"), "multiplier", 100.0),
+            option_type[0], _number(cell("vol"), "vol", vol), quantity)
+
+
+def _check_header(header, path):
+    if "symbol" not in header:
+        missing = [c for c in ("underlying", "expiration") if c not in header]
+        if missing:
+            raise ValueError(f"Missing column in '{path}': {missing[0]}")
+
+
+def _open_output(path):
+    if path == "-":
+        return _Unclosed(sys.stdout)
+    if hasattr(path, "write"):
+        return _Unclosed(path)
+    return open(path, "w", newline="")
+
+
+class _Unclosed:
+    """Context manager yielding a stream without closing it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc):
+        self.stream.flush()
+
+
+def _years_to(expiration, as_of, times):
+    """Years from `as_of` to an expiration date, parsing each distinct date once per chunk."""
+    T = times.get(expiration)
+    if T is None:
+        try:
+            T = _years_between(as_of, ExpirationDate(expiration).expiration_time)
+        except (ValueError, TypeError) as e:
+            T = e
+        times[expiration] = T
+    if isinstance(T, Exception):
+        raise T
+    return T
+
+
+def _years_between(as_of, expiration_time):
+    # Same convention as ExpirationDate.T: the expiration day itself counts.
+    delta = expiration_time - as_of
+    return (delta.days + delta.seconds / (3600 * 24) + 1) / 365
+
+
+def _number(cell, label, default=None):
+    if not cell:
+        if default is None:
+            raise ValueError(f"missing {label}")
+        return default
+    try:
+        value = float(cell)
+    except ValueError:
+        raise ValueError(f"invalid {label} '{cell}'")
+    if not math.isfinite(value):
+        raise ValueError(f"invalid {label} '{cell}'")
+    return value
+
+
+def _required(cell, label):
+    if not cell:
+        raise ValueError(f"missing {label}")
+    return cell
@@ -2,12 +2,26 @@
 Core abstract base classes (ABCs) for all assets.
 """
 
+from .price_book import PriceBook
+from .tick_buffer import TickBuffer, Bars
+from .valuation_context import ValuationContext
 from .asset import Asset
 from .underlying import Underlying
 from .derivative import Derivative
+from .snapshot import save_registry, load_registry, AssetBatch
+from .profiling import Profiler, profiler
 
 __all__ = [
+    "PriceBook",
+    "TickBuffer",
+    "Bars",
+    "ValuationContext",
     "Asset",
     "Underlying",
     "Derivative",
+    "save_registry",
+    "load_registry",
+    "AssetBatch",
+    "Profiler",
+    "profiler",
 ]
@@ -1,6 +1,15 @@
 # Contains the Asset ABC
 
+import time
 from abc import ABC, abstractmethod
+from assets.core.price_book import PriceBook
+from assets.core.tick_buffer import TickBuffer
+from assets.core.valuation_context import ValuationContext
+from assets.core.expiration_index import ExpirationIndex
+from assets.core.derivative_index import DerivativeIndex
+
+# Attributes that only make sense in the current process, left out when pickling.
+_LOCAL_ATTRS = {"_name", "_id", "_initialized", "_tick_buffer"}
 
 #################################
 # Asset Class
@@ -17,25 +26,94 @@ class Asset(ABC):
     ----------
     _assets : dict
         Class-level dictionary to store the existing assets.
+    price_book : PriceBook
+        Class-level storage holding the prices of all registered assets, indexed by asset ID.
+    expiration_index : ExpirationIndex
+        Class-level index of the registered assets with an expiration date, sorted by expiry.
+    derivative_index : DerivativeIndex
+        Class-level reverse index from each registered asset to the derivatives written on it.
     name : str
         Name of the asset (e.g., "AAPL" for Apple stock).
-    _price : float or None
-        Current price of the asset.
+    _id : int
+        Stable integer ID of the asset, i.e. its slot in `price_book`.
     _initialized : bool
         Whether the asset already exist or not.
+    _tick_buffer : TickBuffer or None
+        Buffer recording every price set through `set_price`, if enabled with `record_ticks`.
+    _currency : Currency or None
+        Currency the price is denominated in, if set with `set_currency`.
     """
 
     _assets = {}
+    price_book = PriceBook()
+    expiration_index = ExpirationIndex()
+    derivative_index = DerivativeIndex()
+    _tick_buffer = None
+    _currency = None
 
     def __new__(cls, *args, **kwargs):
-        name = cls._make_name(*args, **kwargs)  
-        key = f"{cls.__name__}({name})"  
-        if key in cls._assets:
-            return cls._assets[key]
+        name = cls._make_name(*args, **kwargs)
+        key = f"{cls.__name__}({name})"
+        instance = cls._assets.get(key)
+        if instance is not None:
+            return instance
         instance = object.__new__(cls)
+        instance._id = Asset.price_book.register(instance)
         cls._assets[key] = instance
         return instance
 
+    @staticmethod
+    def _registry_key(cls, name: str) -> str:
+        """Return the key under which an asset of class `cls` named `name` is registered."""
+        return f"{cls.__name__}({name})"
+
+    @classmethod
+    def _register_many(cls, instances) -> None:
+        """
+        Insert already initialized instances into the registry in one batch.
+
+        Used by bulk construction paths that bypass `__new__`/`__init__`. Instances
+        are registered under the same keys `__new__` would use, so subsequent
+        constructor calls return them, and receive consecutive IDs in `price_book`.
+        Their prices are left unset. Instances with an expiration date are added to
+        `expiration_index`, and derivatives to `derivative_index`.
+
+        Parameters
+        ----------
+        instances : iterable of Asset
+            Instances with their name set. Must not already be registered.
+        """
+        instances = list(instances)
+        for inst, asset_id in zip(instances, Asset.price_book.register_many(instances).tolist()):
+            inst._id = asset_id
+        Asset._assets.update((Asset._registry_key(type(inst), inst._name), inst) for inst in instances)
+        Asset.expiration_index.add_many(instances)
+        Asset.derivative_index.add_many(instances)
+
+    @classmethod
+    def _unregister_many(cls, instances) -> None:
+        """
+        Remove instances from the registry, `expiration_index` and `derivative_index`,
+        and release them from `price_book`.
+
+        The instances keep their ID and their price in `price_book`, so existing
+        references remain usable, but constructor calls will create new instances and
+        the instances are freed once no one else references them.
+
+        Parameters
+        ----------
+        instances : iterable of Asset
+            Registered instances.
+        """
+        instances = list(instances)
+        for inst in instances:
+            key = Asset._registry_key(type(inst), inst._name)
+            if Asset._assets.get(key) is inst:
+                del Asset._assets[key]
+        Asset.expiration_index.remove_many(instances)
+        Asset.derivative_index.remove_many(instances)
+        Asset.price_book.release(inst._id for inst in instances)
+
     def __init__(self, name: str, price : float = None):
         """
         Initialize the Asset.
@@ -45,13 +123,29 @@ class Asset(ABC):
         name : str
             Name of the asset (e.g., stock ticker).
         price : float or None
-            Current price of the asset.
+            Current price of the asset. When an existing asset is looked up again,
+            None keeps its current price.
         """
         if not hasattr(self, "_initialized"):
             self._name = name
             self._initialized = True
+        elif price is None:
+            return
         self.set_price(price)
 
+    def __reduce__(self):
+        """
+        Pickle the asset so that it is re-interned into the registry on load.
+
+        The state is pickled without process-local attributes (ID, tick buffer).
+        Underlyings are pickled by reference through the same mechanism, so links are
+        preserved and each asset is stored once per pickle. On load, an asset that is
+        already registered under the same name is reused as is; otherwise it is
+        registered with its pickled state and price.
+        """
+        state = {k: v for k, v in vars(self).items() if k not in _LOCAL_ATTRS}
+        return _restore_asset, (self.__class__, self._name, state, Asset.price_book.get(self._id))
+
     def __repr__(self) -> str:
         """
         Provide a string representation of the asset.
@@ -94,6 +188,19 @@ class Asset(ABC):
         """
         return self._name
 
+    @property
+    def id(self) -> int:
+        """
+        Get the stable integer ID of the asset.
+
+        Returns
+        -------
+        int
+            The asset's slot in `Asset.price_book`. IDs are assigned in registration
+            order and are never reused within a process.
+        """
+        return self._id
+
     @property
     def price(self) -> float:
         """
@@ -103,11 +210,84 @@ class Asset(ABC):
         -------
         float or None
             The most recently set price for the asset. May be ``None``
-            if no price has been assigned yet.
+            if no price has been assigned yet. Inside a `ValuationContext`,
+            the price seen from that context.
+        """
+        context = ValuationContext.current()
+        if context is not None:
+            return context.price(self)
+        return Asset.price_book.get(self._id)
+
+    @property
+    def currency(self):
+        """
+        Get the currency the price of the asset is denominated in.
+
+        Returns
+        -------
+        Currency or None
+            The currency set with `set_currency`. Derivatives without one inherit the
+            currency of their underlying. None means USD, the currency `Currency`
+            prices are quoted in.
+        """
+        asset = self
+        while asset._currency is None:
+            asset = getattr(asset, "underlying", None)
+            if asset is None:
+                return None
+        return asset._currency
+
+    def set_currency(self, currency) -> None:
+        """
+        Set the currency the price of the asset is denominated in.
+
+        Parameters
+        ----------
+        currency : Currency, str or None
+            The currency, or its code (e.g., 'EUR'), which is looked up in the registry
+            and registered without exchange rate if needed. None removes the currency,
+            so that the asset inherits the currency of its underlying or is in USD.
+
+        Raises
+        ------
+        TypeError
+            If `currency` is neither a Currency, a string nor None.
+        """
+        from assets.instruments.currency import Currency
+
+        if isinstance(currency, str):
+            code = Currency._make_name(currency)
+            currency = Currency(code, 1.0) if code == "USD" else Currency(code)
+        elif currency is not None and not isinstance(currency, Currency):
+            raise TypeError(f"Expected Currency or str, got {type(currency).__name__} instead.")
+        self._currency = currency
+
+    @property
+    def price_timestamp(self) -> float:
+        """
+        Get the time the stored price was observed at.
+
+        Returns
+        -------
+        float or None
+            Seconds since the epoch, or None if the price is unset or was stored
+            without a time (e.g., in bulk through `Asset.price_book`).
+        """
+        return Asset.price_book.get_timestamp(self._id)
+
+    @property
+    def price_source(self):
+        """
+        Get the source of the stored price.
+
+        Returns
+        -------
+        object or None
+            Typically the PriceProvider that fetched the price, or None if unknown.
         """
-        return self._price
+        return Asset.price_book.get_source(self._id)
 
-    def set_price(self, price: float = None) -> None:
+    def set_price(self, price: float = None, as_of=None, source=None) -> None:
         """
         Set the price of the asset.
     
@@ -115,9 +295,100 @@ class Asset(ABC):
         ----------
         price : float or None, optional
             The new price to assign to the asset. Can be ``None`` to
-            indicate that the price is unknown or not set.
+            indicate that the price is unknown or not set. Prices are
+            stored as floats in `Asset.price_book`. If tick recording is
+            enabled, the price is also appended to `ticks` at `as_of`.
+            Inside a `ValuationContext`, only the context is updated
+            and `as_of` and `source` are ignored.
+        as_of : float, datetime or None, optional
+            Time the price was observed at, in seconds since the epoch.
+            Defaults to the current time.
+        source : object, optional
+            Where the price came from, typically a PriceProvider.
+        """
+        context = ValuationContext.current()
+        if context is not None:
+            context.set_price(self, price)
+            return
+        if price is None:
+            Asset.price_book.set(self._id)
+            return
+        if as_of is None:
+            as_of = time.time()
+        elif not isinstance(as_of, (int, float)):
+            as_of = as_of.timestamp()
+        Asset.price_book.set(self._id, price, as_of, source)
+        if self._tick_buffer is not None:
+            self._tick_buffer.append(as_of, price)
+
+    @property
+    def ticks(self) -> TickBuffer:
         """
-        self._price = price
+        Get the tick buffer of the asset.
+
+        Returns
+        -------
+        TickBuffer or None
+            The buffer filled by `set_price` and `record_tick`, or None if tick
+            recording is not enabled.
+        """
+        return self._tick_buffer
+
+    def record_ticks(self, capacity: int = 4096, intervals=(), bar_capacity: int = 1024) -> TickBuffer:
+        """
+        Enable tick recording for this asset.
+
+        Every subsequent `set_price` appends a (time, price) tick to a fixed-size ring
+        buffer, which also builds OHLC/VWAP bars incrementally for the given intervals.
+        Prices written in bulk through `Asset.price_book` are not recorded.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Maximum number of ticks kept.
+        intervals : iterable of float, optional
+            Bar intervals in seconds.
+        bar_capacity : int, optional
+            Maximum number of completed bars kept per interval.
+
+        Returns
+        -------
+        TickBuffer
+            The new buffer. An existing buffer is replaced.
+        """
+        self._tick_buffer = TickBuffer(capacity, intervals, bar_capacity)
+        return self._tick_buffer
+
+    def stop_recording_ticks(self) -> None:
+        """
+        Disable tick recording and drop the recorded ticks.
+        """
+        self._tick_buffer = None
+
+    def record_tick(self, price: float, volume: float = 1.0, timestamp: float = None) -> None:
+        """
+        Set the price of the asset from a trade with a known volume.
+
+        Parameters
+        ----------
+        price : float
+            Traded price.
+        volume : float, optional
+            Traded volume, used for the VWAP of the bars.
+        timestamp : float or None, optional
+            Time of the trade in seconds since the epoch. Defaults to the current time.
+
+        Raises
+        ------
+        ValueError
+            If tick recording is not enabled.
+        """
+        if self._tick_buffer is None:
+            raise ValueError(f"Tick recording is not enabled for {self}. Call 'record_ticks' first.")
+        if timestamp is None:
+            timestamp = time.time()
+        Asset.price_book.set(self._id, price, timestamp)
+        self._tick_buffer.append(timestamp, price, volume)
 
     @abstractmethod
     def price_at_expiration(self, ST):
@@ -167,6 +438,27 @@ class Asset(ABC):
         return (target_price - self.price) / self.price * 100
 
 
+    def derivatives(self, cls=None, transitive: bool = False, **filters) -> list:
+        """
+        Return the registered derivatives written on this asset.
+
+        Parameters
+        ----------
+        cls : type or tuple of types, optional
+            Keep only derivatives of these classes (e.g., Option).
+        transitive : bool, optional
+            Whether to include derivatives of derivatives (e.g., options on futures).
+        **filters
+            Expiry (`start`, `end`) and strike (`min_strike`, `max_strike`) filters,
+            see `DerivativeIndex.derivatives_of`.
+
+        Returns
+        -------
+        list of Derivative
+            The derivatives, found through `Asset.derivative_index` in O(k).
+        """
+        return Asset.derivative_index.derivatives_of(self, cls, transitive, **filters)
+
     def get_true_underlying(self, get_order=False):
         """
         Recursively identifies the ultimate underlying asset. If the asset is a derivative, and its    underlying is also a derivative, the process continues until an asset that is not a derivative is reached.
@@ -201,4 +493,22 @@ class Asset(ABC):
         float
             The price of the true underlying asset.
         """
-        return self.get_true_underlying().price
\ No newline at end of file
+        return self.get_true_underlying().price
+
+
+#################################
+# Pickling
+#################################
+
+def _restore_asset(cls, name, state, price):
+    """Return the registered asset of class `cls` named `name`, registering it from `state` if needed."""
+    instance = Asset._assets.get(Asset._registry_key(cls, name))
+    if instance is not None:
+        return instance
+    instance = object.__new__(cls)
+    instance.__dict__.update(state)
+    instance._name = name
+    instance._initialized = True
+    Asset._register_many([instance])
+    Asset.price_book.set(instance._id, price)
+    return instance
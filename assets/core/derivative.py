@@ -1,6 +1,8 @@
 # Contains the Derivative ABC
 
 from abc import ABC, abstractmethod
+from datetime import datetime
+import numpy as np
 from assets.core.asset import Asset
 from assets.utils.expiration_date import ExpirationDate
 
@@ -45,10 +47,80 @@ class Derivative(Asset, ABC):
         super().__init__(name, price=price)
         self.underlying = underlying
         if expiration is not None:
-            self.expiration = ExpirationDate(expiration)
+            current = getattr(self, "expiration", None)
+            if current is None or current.expiration_date != expiration:  # keep fixed times on re-lookup
+                self.expiration = ExpirationDate(expiration)
         else:
             self.expiration = expiration
-    
+        Asset.expiration_index.add(self)
+        Asset.derivative_index.add(self)
+
+    @classmethod
+    def expiring_within(cls, days: float, now: datetime = None) -> list:
+        """
+        Return the registered derivatives of this class expiring within the given number of days.
+
+        Uses `Asset.expiration_index`, so the cost does not depend on the size of the registry.
+
+        Parameters
+        ----------
+        days : float
+            Length of the look-ahead window in days.
+        now : datetime or None, optional
+            Reference time. Defaults to the current time.
+
+        Returns
+        -------
+        list of Derivative
+            The live derivatives, sorted by expiry.
+        """
+        return [d for d in Asset.expiration_index.expiring_within(days, now) if isinstance(d, cls)]
+
+    @classmethod
+    def settle_expired(cls, now: datetime = None, evict: bool = True) -> dict:
+        """
+        Settle all expired derivatives of this class at the current price of their underlying.
+
+        The final value of each contract is computed with `price_at_expiration`, and its
+        price is set to `settlement_price`, i.e. the quote it settles at: the payoff for
+        options, the underlying's price for futures. Settled contracts are then evicted
+        from the registry, the price book and both indexes, unless `evict` is False.
+        Evicted contracts keep their ID and price, so existing references remain usable,
+        but nothing in the package references them anymore and they are freed once the
+        caller drops them. Contracts whose underlying has no price are left untouched.
+
+        Parameters
+        ----------
+        now : datetime or None, optional
+            Reference time. Defaults to the current time.
+        evict : bool, optional
+            Whether to remove the settled contracts from the working set. Defaults to True.
+
+        Returns
+        -------
+        dict
+            Maps each settled contract to its final value.
+        """
+        expired = [d for d in Asset.expiration_index.expired(now) if isinstance(d, cls)]
+        book = Asset.price_book
+        spots = book.get_prices(book.ids(d.underlying for d in expired))
+        priced = [(d, ST) for d, ST in zip(expired, spots.tolist()) if ST == ST]
+        values = [float(d.price_at_expiration(ST)) for d, ST in priced]
+        settled = [d for d, _ in priced]
+        book.set_prices(book.ids(settled), np.array([d.settlement_price(ST) for d, ST in priced], dtype=float))
+        if evict:
+            Asset._unregister_many(settled)
+        return dict(zip(settled, values))
+
+    def settlement_price(self, ST) -> float:
+        """
+        Return the price the derivative settles at, given the price of its underlying.
+
+        Defaults to `price_at_expiration`. Derivatives whose price is a quote rather
+        than a value (e.g., futures) override it.
+        """
+        return self.price_at_expiration(ST)
+
     @abstractmethod
     def price_at_expiration(self, ST): # Maybe constrain the price to be at price at expiration when the derivative expires?
         pass
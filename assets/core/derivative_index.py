@@ -0,0 +1,143 @@
+# Contains the DerivativeIndex class
+
+import threading
+from datetime import datetime
+from assets.core.expiration_index import expiry_timestamp
+
+#################################
+# DerivativeIndex Class
+#################################
+
+class DerivativeIndex:
+    """
+    Reverse index from each registered asset to the derivatives written on it.
+
+    Only direct relations are stored (e.g., Stock -> Futures, Futures -> Option);
+    transitive lookups walk the index, so every lookup costs O(k) in the number of
+    derivatives visited and never scans the registry.
+
+    Updates and lookups are serialized by a lock, so derivatives can be created and
+    queried from several threads.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty DerivativeIndex.
+        """
+        self._children = {}  # underlying ID -> {derivative ID: derivative}
+        self._parent = {}  # derivative ID -> underlying ID
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of indexed derivatives."""
+        return len(self._parent)
+
+    def __contains__(self, derivative) -> bool:
+        return derivative._id in self._parent
+
+    def add(self, derivative) -> None:
+        """
+        Index a derivative under its underlying, or move it if its underlying changed.
+
+        Parameters
+        ----------
+        derivative : Derivative
+            A registered asset with an `underlying` attribute.
+        """
+        underlying = getattr(derivative, "underlying", None)
+        with self._lock:
+            if underlying is None:
+                self._remove(derivative)
+            else:
+                self._add(derivative, underlying)
+
+    def add_many(self, derivatives) -> None:
+        """Index many derivatives. Assets without an underlying are skipped."""
+        pairs = [(d, getattr(d, "underlying", None)) for d in derivatives]
+        with self._lock:
+            for derivative, underlying in pairs:
+                if underlying is not None:
+                    self._add(derivative, underlying)
+
+    def remove(self, derivative) -> None:
+        """
+        Remove a derivative from the index. Does nothing if it is not indexed.
+
+        Derivatives written on it stay indexed under it.
+        """
+        with self._lock:
+            self._remove(derivative)
+
+    def remove_many(self, derivatives) -> None:
+        """Remove many derivatives from the index."""
+        with self._lock:
+            for derivative in derivatives:
+                self._remove(derivative)
+
+    def derivatives_of(self, underlying, cls=None, transitive: bool = False, start: datetime = None,
+                       end: datetime = None, min_strike: float = None, max_strike: float = None) -> list:
+        """
+        Return the derivatives written on an asset.
+
+        Parameters
+        ----------
+        underlying : Asset
+            The referenced asset.
+        cls : type or tuple of types, optional
+            Keep only derivatives of these classes (e.g., Option).
+        transitive : bool, optional
+            Whether to include derivatives written on derivatives of `underlying`
+            (e.g., options on futures on a stock). Defaults to False.
+        start, end : datetime or None, optional
+            Keep only derivatives expiring in [start, end), where an asset expires at
+            the end of its expiration day. Derivatives without expiration are dropped
+            when a bound is given.
+        min_strike, max_strike : float or None, optional
+            Keep only derivatives with a strike in [min_strike, max_strike]. Derivatives
+            without strike are dropped when a bound is given.
+
+        Returns
+        -------
+        list of Derivative
+            Direct derivatives first, in order of indexing, then (if `transitive`)
+            their own derivatives, breadth first.
+        """
+        with self._lock:
+            found = list(self._children.get(underlying._id, {}).values())
+            if transitive:
+                i = 0
+                while i < len(found):
+                    found.extend(self._children.get(found[i]._id, {}).values())
+                    i += 1
+        if cls is not None:
+            found = [d for d in found if isinstance(d, cls)]
+        if start is not None or end is not None:
+            lo = float("-inf") if start is None else start.timestamp()
+            hi = float("inf") if end is None else end.timestamp()
+            stamps = [expiry_timestamp(d) for d in found]
+            found = [d for d, t in zip(found, stamps) if t is not None and lo <= t < hi]
+        if min_strike is not None or max_strike is not None:
+            lo = float("-inf") if min_strike is None else min_strike
+            hi = float("inf") if max_strike is None else max_strike
+            found = [d for d in found if getattr(d, "strike", None) is not None and lo <= d.strike <= hi]
+        return found
+
+    # The methods below are called with the lock held.
+
+    def _add(self, derivative, underlying):
+        old = self._parent.get(derivative._id)
+        if old == underlying._id:
+            return
+        if old is not None:
+            self._remove(derivative)
+        self._children.setdefault(underlying._id, {})[derivative._id] = derivative
+        self._parent[derivative._id] = underlying._id
+
+    def _remove(self, derivative):
+        parent = self._parent.pop(derivative._id, None)
+        if parent is None:
+            return
+        children = self._children[parent]
+        del children[derivative._id]
+        if not children:
+            del self._children[parent]
@@ -0,0 +1,200 @@
+# Contains the ExpirationIndex class
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+#################################
+# ExpirationIndex Class
+#################################
+
+class ExpirationIndex:
+    """
+    Registered derivatives sorted by the moment they expire.
+
+    An asset expires at the end of its expiration day, i.e. when `ExpirationDate.T`
+    reaches zero. Expiry moments are stored as POSIX timestamps in a sorted list, so
+    range queries take O(log n + k) and never evaluate `ExpirationDate.T`. Times fixed
+    with `ExpirationDate.fix_time` are ignored: the index only uses calendar dates.
+
+    Added assets are buffered and merged into the sorted list in one pass on the next
+    query, so indexing n contracts one at a time (as every `Derivative.__init__` does)
+    costs O(n log n) rather than O(n) per insertion.
+
+    Updates and the merge of the buffer are serialized by a lock, so derivatives can
+    be created and queried from several threads.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty ExpirationIndex.
+        """
+        self._keys = []  # sorted expiry timestamps
+        self._entries = []  # assets, aligned with _keys
+        self._key_of = {}  # asset ID -> expiry timestamp
+        self._pending = {}  # asset ID -> (expiry timestamp, asset) not merged yet
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of indexed assets."""
+        return len(self._key_of)
+
+    def __contains__(self, asset) -> bool:
+        return asset._id in self._key_of
+
+    def add(self, asset) -> None:
+        """
+        Index an asset, or move it if its expiration date changed.
+
+        Parameters
+        ----------
+        asset : Derivative
+            A registered asset. Assets without expiration date are removed from the index.
+        """
+        key = expiry_timestamp(asset)
+        with self._lock:
+            self._add(asset, key)
+
+    def add_many(self, assets) -> None:
+        """
+        Index many assets at once. They are merged into the index with the next query.
+
+        Parameters
+        ----------
+        assets : iterable of Derivative
+            Registered assets. Assets without expiration date, or already indexed
+            under the same date, are skipped.
+        """
+        keyed = [(asset, expiry_timestamp(asset)) for asset in assets]
+        with self._lock:
+            for asset, key in keyed:
+                self._add(asset, key)
+
+    def remove(self, asset) -> None:
+        """
+        Remove an asset from the index. Does nothing if it is not indexed.
+        """
+        with self._lock:
+            self._remove(asset)
+
+    def remove_many(self, assets) -> None:
+        """
+        Remove many assets from the index with a single pass over it.
+        """
+        with self._lock:
+            removed = {a._id for a in assets if self._key_of.pop(a._id, None) is not None
+                       and self._pending.pop(a._id, None) is None}
+            if not removed:
+                return
+            kept = [(key, a) for key, a in zip(self._keys, self._entries) if a._id not in removed]
+            self._keys = [key for key, _ in kept]
+            self._entries = [a for _, a in kept]
+
+    def expiring(self, start: datetime = None, end: datetime = None) -> list:
+        """
+        Return the assets expiring in the interval [start, end).
+
+        Parameters
+        ----------
+        start, end : datetime or None, optional
+            Bounds of the interval. None leaves the interval open on that side.
+
+        Returns
+        -------
+        list of Derivative
+            The assets, sorted by expiry.
+        """
+        with self._lock:
+            self._merge_pending()
+            lo = 0 if start is None else bisect_left(self._keys, start.timestamp())
+            hi = len(self._keys) if end is None else bisect_left(self._keys, end.timestamp())
+            return self._entries[lo:hi]
+
+    def expiring_within(self, days: float, now: datetime = None) -> list:
+        """
+        Return the live assets expiring within the given number of days.
+
+        Parameters
+        ----------
+        days : float
+            Length of the look-ahead window in days.
+        now : datetime or None, optional
+            Reference time. Defaults to the current time.
+
+        Returns
+        -------
+        list of Derivative
+            The assets, sorted by expiry.
+        """
+        now = time.time() if now is None else now.timestamp()
+        with self._lock:
+            self._merge_pending()
+            return self._entries[bisect_right(self._keys, now):bisect_left(self._keys, now + days * _DAY)]
+
+    def expired(self, now: datetime = None) -> list:
+        """
+        Return the indexed assets that have expired.
+
+        Parameters
+        ----------
+        now : datetime or None, optional
+            Reference time. Defaults to the current time.
+
+        Returns
+        -------
+        list of Derivative
+            The expired assets, sorted by expiry.
+        """
+        now = time.time() if now is None else now.timestamp()
+        with self._lock:
+            self._merge_pending()
+            return self._entries[:bisect_right(self._keys, now)]
+
+    # The methods below are called with the lock held.
+
+    def _add(self, asset, key):
+        old = self._key_of.get(asset._id)
+        if old == key:
+            return
+        if old is not None:
+            self._remove(asset)
+        if key is None:
+            return
+        self._pending[asset._id] = (key, asset)
+        self._key_of[asset._id] = key
+
+    def _remove(self, asset):
+        key = self._key_of.pop(asset._id, None)
+        if key is None or self._pending.pop(asset._id, None) is not None:
+            return
+        for i in range(bisect_left(self._keys, key), bisect_right(self._keys, key)):
+            if self._entries[i] is asset:
+                del self._keys[i], self._entries[i]
+                return
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+        merged = list(zip(self._keys, self._entries))
+        merged.extend(sorted(self._pending.values(), key=lambda pair: pair[0]))
+        merged.sort(key=lambda pair: pair[0])  # two sorted runs: merged in linear time
+        self._keys = [key for key, _ in merged]
+        self._entries = [asset for _, asset in merged]
+        self._pending.clear()
+
+
+#################################
+# Helpers
+#################################
+
+_DAY = 24 * 3600
+
+def expiry_timestamp(asset) -> float:
+    """
+    POSIX timestamp of the end of the asset's expiration day, or None if it does not expire.
+    """
+    expiration = getattr(asset, "expiration", None)
+    if expiration is None:
+        return None
+    return expiration.expiration_time.timestamp() + _DAY
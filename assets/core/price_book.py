@@ -0,0 +1,257 @@
+# Contains the PriceBook class
+
+import threading
+import time
+import numpy as np
+
+#################################
+# PriceBook Class
+#################################
+
+class PriceBook:
+    """
+    Central, array-backed storage for the prices of all registered assets.
+
+    Every registered asset receives a stable small-integer ID, which is its position
+    in the underlying NumPy array. Reading or writing the prices of many assets is
+    then a single indexing operation on that array. Unset prices are stored as NaN.
+
+    Each price can carry the time it was observed at and the provider it came from,
+    stored in parallel arrays, so that the stale prices of many assets can be selected
+    with a single vectorized comparison.
+
+    Handing out IDs, growing the storage and writing prices are serialized by a lock,
+    so assets can be constructed and priced from several threads at once.
+
+    Attributes
+    ----------
+    prices : numpy.ndarray
+        View of the stored prices, indexed by asset ID. NaN marks unset prices.
+    timestamps : numpy.ndarray
+        View of the as-of times of the prices in seconds since the epoch, indexed by
+        asset ID. NaN marks unknown times.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty PriceBook.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of slots. The storage grows automatically.
+        """
+        capacity = max(int(capacity), 1)
+        self._prices = np.full(capacity, np.nan)
+        self._timestamps = np.full(capacity, np.nan)
+        self._sources = np.full(capacity, None, dtype=object)
+        self._assets = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of IDs handed out so far."""
+        return len(self._assets)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:len(self._assets)]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:len(self._assets)]
+
+    def register(self, asset) -> int:
+        """
+        Assign the next free ID to an asset.
+
+        Parameters
+        ----------
+        asset : Asset
+            The asset to register.
+
+        Returns
+        -------
+        int
+            The asset's ID.
+        """
+        with self._lock:
+            asset_id = len(self._assets)
+            self._reserve(asset_id + 1)
+            self._assets.append(asset)
+        return asset_id
+
+    def register_many(self, assets) -> np.ndarray:
+        """
+        Assign consecutive IDs to many assets at once.
+
+        Parameters
+        ----------
+        assets : list of Asset
+            The assets to register.
+
+        Returns
+        -------
+        numpy.ndarray
+            The assigned IDs, aligned with `assets`.
+        """
+        with self._lock:
+            start = len(self._assets)
+            self._reserve(start + len(assets))
+            self._assets.extend(assets)
+        return np.arange(start, start + len(assets))
+
+    def asset(self, asset_id: int):
+        """Return the asset registered under the given ID, or None if it was released."""
+        return self._assets[asset_id]
+
+    def release(self, ids) -> None:
+        """
+        Drop the references the PriceBook holds to the assets under the given IDs.
+
+        The IDs are not reused and the stored prices are kept, so the assets remain
+        usable by whoever still references them.
+
+        Parameters
+        ----------
+        ids : iterable of int
+            Asset IDs.
+        """
+        with self._lock:
+            for asset_id in ids:
+                self._assets[asset_id] = None
+
+    def ids(self, assets) -> np.ndarray:
+        """
+        Return the IDs of the given assets as an integer array.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            Registered assets.
+
+        Returns
+        -------
+        numpy.ndarray
+            The IDs, aligned with `assets`.
+        """
+        return np.fromiter((a._id for a in assets), dtype=np.int64)
+
+    def get(self, asset_id: int) -> float:
+        """
+        Return the price stored under an ID, or None if it is unset.
+        """
+        price = self._prices[asset_id]
+        return None if price != price else float(price)
+
+    def set(self, asset_id: int, price: float = None, timestamp: float = None, source=None) -> None:
+        """
+        Store the price of a single asset. None unsets the price.
+
+        Parameters
+        ----------
+        asset_id : int
+            Asset ID.
+        price : float or None, optional
+            The new price.
+        timestamp : float or None, optional
+            Time the price was observed at, in seconds since the epoch. None marks it unknown.
+        source : object, optional
+            Where the price came from, typically a PriceProvider.
+        """
+        with self._lock:
+            self._prices[asset_id] = np.nan if price is None else price
+            self._timestamps[asset_id] = np.nan if timestamp is None else timestamp
+            self._sources[asset_id] = source
+
+    def get_timestamp(self, asset_id: int) -> float:
+        """
+        Return the as-of time of the price stored under an ID, or None if it is unknown.
+        """
+        timestamp = self._timestamps[asset_id]
+        return None if timestamp != timestamp else float(timestamp)
+
+    def get_source(self, asset_id: int):
+        """
+        Return the source of the price stored under an ID, or None if it is unknown.
+        """
+        return self._sources[asset_id]
+
+    def get_prices(self, ids) -> np.ndarray:
+        """
+        Return the prices stored under many IDs at once.
+
+        Parameters
+        ----------
+        ids : array-like of int
+            Asset IDs.
+
+        Returns
+        -------
+        numpy.ndarray
+            The prices, aligned with `ids`. Unset prices are NaN.
+        """
+        return self.prices[np.asarray(ids, dtype=np.int64)]
+
+    def set_prices(self, ids, prices, timestamps=None, source=None) -> None:
+        """
+        Store the prices of many assets at once.
+
+        Parameters
+        ----------
+        ids : array-like of int
+            Asset IDs.
+        prices : float or array-like of float
+            The new prices, aligned with `ids`. NaN unsets a price.
+        timestamps : float, array-like of float or None, optional
+            Times the prices were observed at, in seconds since the epoch. None (or NaN)
+            marks them unknown.
+        source : object, optional
+            Where the prices came from, typically a PriceProvider.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            self.prices[ids] = prices
+            self.timestamps[ids] = np.nan if timestamps is None else timestamps
+            self._sources[:len(self._assets)][ids] = source
+
+    def stale(self, ids, max_age: float, now: float = None) -> np.ndarray:
+        """
+        Flag the prices older than a threshold.
+
+        Parameters
+        ----------
+        ids : array-like of int
+            Asset IDs.
+        max_age : float
+            Maximum age in seconds of a fresh price.
+        now : float or None, optional
+            Current time in seconds since the epoch. Defaults to `time.time()`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask aligned with `ids`, True where the price is unset, has an
+            unknown time or is older than `max_age`.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if now is None:
+            now = time.time()
+        fresh = (now - self.timestamps[ids] <= max_age) & ~np.isnan(self.prices[ids])
+        return ~fresh
+
+    def _reserve(self, size):
+        # Called with the lock held: writers must not store into the arrays being replaced.
+        capacity = len(self._prices)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grown = np.full(capacity, np.nan)
+        grown[:len(self._prices)] = self._prices
+        self._prices = grown
+        grown = np.full(capacity, np.nan)
+        grown[:len(self._timestamps)] = self._timestamps
+        self._timestamps = grown
+        grown = np.full(capacity, None, dtype=object)
+        grown[:len(self._sources)] = self._sources
+        self._sources = grown
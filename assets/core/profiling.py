@@ -0,0 +1,231 @@
+# Contains the Profiler class
+
+import sys
+import time
+from collections import defaultdict
+from assets.core.asset import Asset
+
+#################################
+# Profiler Class
+#################################
+
+class Profiler:
+    """
+    Opt-in instrumentation of instrument construction and registry hot paths.
+
+    While enabled, the profiler counts, per asset class, the constructor calls that
+    created a new instance versus those that returned a registered one (registry hits)
+    and the instances registered in bulk (e.g., by `create_options`). It also times
+    `Asset.__new__`, the `_make_name` name generation of every class, the parsing of
+    expiration dates in `ExpirationDate.__init__` and the calls to `validate_type`
+    (counting its recursive per-item checks), and reports the growth of the registry.
+
+    Instrumentation works by swapping the profiled functions for timed wrappers in
+    `enable` and putting the original functions back in `disable`, so a disabled
+    profiler leaves no trace in the hot paths. Classes defined while the profiler is
+    enabled are only profiled through `Asset.__new__`.
+
+    Use the shared instance `profiler`, either with `enable`/`disable` or as a
+    context manager (``with profiler: ...``). Counters are not synchronized; totals
+    from concurrent threads are approximate.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the instrumentation is installed.
+    """
+
+    def __init__(self):
+        """
+        Initialize a disabled Profiler.
+        """
+        self.enabled = False
+        self._patches = []  # (owner, attribute, original) to restore
+        self.reset()
+
+    def __enter__(self) -> "Profiler":
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.disable()
+
+    def reset(self) -> None:
+        """Clear all counters and timers, and restart the registry growth measurement."""
+        # Cleared in place: the installed wrappers hold references to these dictionaries.
+        if not hasattr(self, "_classes"):
+            self._classes = defaultdict(_class_stats)
+            self._parsing = {}
+            self._validation = {}
+        self._classes.clear()
+        self._parsing.update(calls=0, seconds=0.0)
+        self._validation.update(calls=0, items=0, seconds=0.0)
+        self._validation_depth = 0
+        self._start = time.perf_counter()
+        self._start_size = len(Asset._assets)
+        self._start_ids = len(Asset.price_book)
+
+    def enable(self) -> None:
+        """Install the instrumentation and reset the counters. Does nothing if already enabled."""
+        if self.enabled:
+            return
+        from assets.utils import expiration_date, validation
+
+        self.reset()
+        self._patch(Asset, "__new__", staticmethod(self._profiled_new(Asset.__dict__["__new__"])))
+        self._patch(Asset, "_register_many", classmethod(self._profiled_register_many(Asset._register_many.__func__)))
+        for cls in _subclasses(Asset):
+            method = cls.__dict__.get("_make_name")
+            if method is not None and not getattr(method, "__isabstractmethod__", False):
+                self._patch(cls, "_make_name", classmethod(self._profiled_make_name(method.__func__)))
+        ExpirationDate = expiration_date.ExpirationDate
+        self._patch(ExpirationDate, "__init__", self._profiled_parse(ExpirationDate.__dict__["__init__"]))
+        original = validation.validate_type
+        profiled = self._profiled_validate(original)
+        for module in list(sys.modules.values()):
+            if getattr(module, "validate_type", None) is original and module.__name__.startswith("assets"):
+                self._patch(module, "validate_type", profiled)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Restore the original functions. Counters are kept until the next `enable` or `reset`."""
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches = []
+        self.enabled = False
+
+    def snapshot(self) -> dict:
+        """
+        Return the counters and timers collected so far.
+
+        Returns
+        -------
+        dict
+            A plain dictionary (safe to serialize to JSON) with the keys:
+
+            - ``enabled``: whether the profiler is enabled;
+            - ``seconds``: time elapsed since the last reset;
+            - ``classes``: per class name, the number of instances ``constructed`` by
+              constructor calls, of registry ``hits``, of instances ``bulk_registered``,
+              the time spent in ``Asset.__new__`` (``new_seconds``, name generation
+              included) and the calls and time of ``_make_name``;
+            - ``expiration_parsing``: calls and time of `ExpirationDate.__init__`;
+            - ``validate_type``: top-level ``calls``, per-item checks (``items``) and time;
+            - ``registry``: current ``size``, ``growth`` since the last reset, number of
+              IDs handed out by `Asset.price_book` (``ids``) and size per class (``by_class``).
+        """
+        by_class = defaultdict(int)
+        for asset in Asset._assets.values():
+            by_class[type(asset).__name__] += 1
+        size = len(Asset._assets)
+        return {
+            "enabled": self.enabled,
+            "seconds": time.perf_counter() - self._start,
+            "classes": {name: dict(stats) for name, stats in self._classes.items()},
+            "expiration_parsing": dict(self._parsing),
+            "validate_type": dict(self._validation),
+            "registry": {
+                "size": size,
+                "growth": size - self._start_size,
+                "ids": len(Asset.price_book),
+                "ids_growth": len(Asset.price_book) - self._start_ids,
+                "by_class": dict(by_class),
+            },
+        }
+
+    #################################
+    # Wrappers
+    #################################
+
+    def _patch(self, owner, attribute, replacement):
+        self._patches.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, replacement)
+
+    def _profiled_new(self, original):
+        new = original.__func__ if isinstance(original, staticmethod) else original
+        registry = Asset._assets
+        classes = self._classes
+
+        def __new__(cls, *args, **kwargs):
+            size = len(registry)
+            start = time.perf_counter()
+            instance = new(cls, *args, **kwargs)
+            stats = classes[cls.__name__]
+            stats["new_seconds"] += time.perf_counter() - start
+            stats["constructed" if len(registry) > size else "hits"] += 1
+            return instance
+        return __new__
+
+    def _profiled_register_many(self, original):
+        classes = self._classes
+
+        def _register_many(cls, instances):
+            instances = list(instances)
+            original(cls, instances)
+            for instance in instances:
+                classes[type(instance).__name__]["bulk_registered"] += 1
+        return _register_many
+
+    def _profiled_make_name(self, original):
+        classes = self._classes
+
+        def _make_name(cls, *args, **kwargs):
+            start = time.perf_counter()
+            name = original(cls, *args, **kwargs)
+            stats = classes[cls.__name__]
+            stats["make_name_seconds"] += time.perf_counter() - start
+            stats["make_name_calls"] += 1
+            return name
+        return _make_name
+
+    def _profiled_parse(self, original):
+        parsing = self._parsing
+
+        def __init__(self, *args, **kwargs):
+            start = time.perf_counter()
+            original(self, *args, **kwargs)
+            parsing["seconds"] += time.perf_counter() - start
+            parsing["calls"] += 1
+        return __init__
+
+    def _profiled_validate(self, original):
+        profiler = self
+        validation = self._validation
+
+        def validate_type(obj, expected_type):
+            validation["items"] += 1
+            if profiler._validation_depth:
+                return original(obj, expected_type)
+            profiler._validation_depth += 1
+            start = time.perf_counter()
+            try:
+                return original(obj, expected_type)
+            finally:
+                validation["seconds"] += time.perf_counter() - start
+                validation["calls"] += 1
+                profiler._validation_depth -= 1
+        return validate_type
+
+
+#################################
+# Helpers
+#################################
+
+def _class_stats():
+    return {"constructed": 0, "hits": 0, "bulk_registered": 0, "new_seconds": 0.0,
+            "make_name_calls": 0, "make_name_seconds": 0.0}
+
+
+def _subclasses(cls):
+    found = []
+    stack = [cls]
+    while stack:
+        for subclass in stack.pop().__subclasses__():
+            if subclass not in found:
+                found.append(subclass)
+                stack.append(subclass)
+    return found
+
+
+# Shared instance
+profiler = Profiler()
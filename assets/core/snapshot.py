@@ -0,0 +1,342 @@
+# Contains functions to save and restore the asset registry
+
+import importlib
+import pickle
+import numpy as np
+from assets.core.asset import Asset, _LOCAL_ATTRS
+from assets.utils.expiration_date import ExpirationDate
+
+#################################
+# Registry snapshots
+#################################
+
+SNAPSHOT_VERSION = 2
+_READABLE_VERSIONS = (2,)
+
+# Attributes stored in dedicated columns, or not at all, rather than through the generic state columns.
+_RESERVED_ATTRS = _LOCAL_ATTRS
+
+
+def save_registry(file) -> None:
+    """
+    Save every asset of the registry to a compact binary snapshot.
+
+    The snapshot stores assets column-wise per class: names, prices, links to
+    underlyings (as indices) and expiration dates with their fixed times, plus any
+    other instance attribute.
+
+    Entries left behind by constructor calls that raised are not initialized and
+    are skipped.
+
+    Parameters
+    ----------
+    file : str, path-like or binary file object
+        Destination of the snapshot.
+    """
+    instances = sorted((inst for inst in Asset._assets.values() if hasattr(inst, "_initialized")),
+                       key=lambda inst: inst._id)
+    _dump(encode_assets(instances), file)
+
+
+def load_registry(file) -> list:
+    """
+    Load a snapshot written by `save_registry` into the registry.
+
+    Assets that are already registered keep their identity: their state is
+    overwritten with the snapshot's, so existing references stay valid. Other
+    assets are created without running their constructors and registered in one
+    batch. Underlying links are restored to the registered instances.
+
+    Parameters
+    ----------
+    file : str, path-like or binary file object
+        Source of the snapshot.
+
+    Returns
+    -------
+    list of Asset
+        The restored assets, in snapshot order.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot of a supported version.
+    """
+    if hasattr(file, "read"):
+        payload = pickle.load(file)
+    else:
+        with open(file, "rb") as f:
+            payload = pickle.load(f)
+    return decode_assets(payload)
+
+
+def encode_assets(instances) -> dict:
+    """
+    Encode assets and the underlyings they reference into a column-wise payload.
+
+    Parameters
+    ----------
+    instances : iterable of Asset
+        The assets to encode. Underlyings are included automatically.
+
+    Returns
+    -------
+    dict
+        A picklable payload made of NumPy arrays and lists, to be restored with `decode_assets`.
+    """
+    order = _with_references(instances)
+    index = {id(inst): i for i, inst in enumerate(order)}
+    groups = {}
+    for i, inst in enumerate(order):
+        groups.setdefault(type(inst), []).append(i)
+
+    encoded_groups = []
+    for cls, positions in groups.items():
+        rows = [order[i] for i in positions]
+        prices = [inst.price for inst in rows]
+        attrs = []
+        for inst in rows:
+            for attr in vars(inst):
+                if attr not in _RESERVED_ATTRS and attr not in attrs:
+                    attrs.append(attr)
+        encoded_groups.append({
+            "cls": f"{cls.__module__}:{cls.__qualname__}",
+            "positions": np.asarray(positions, dtype=np.min_scalar_type(len(order))),
+            "names": [inst._name for inst in rows],
+            "prices": np.array([np.nan if p is None else p for p in prices], dtype=float),
+            "columns": {attr: _encode_column([vars(inst).get(attr, _MISSING) for inst in rows], index)
+                        for attr in attrs},
+        })
+    return {"version": SNAPSHOT_VERSION, "size": len(order), "groups": encoded_groups}
+
+
+def decode_assets(payload, overwrite: bool = True) -> list:
+    """
+    Restore assets from a payload produced by `encode_assets`.
+
+    See `load_registry` for the identity guarantees.
+
+    Parameters
+    ----------
+    payload : dict
+        The encoded assets.
+    overwrite : bool, optional
+        Whether assets that are already registered take the payload's state and price.
+        If False, they are reused as is and only new assets are restored.
+
+    Returns
+    -------
+    list of Asset
+        The restored assets, in payload order.
+
+    Raises
+    ------
+    ValueError
+        If the payload has an unsupported version.
+    """
+    if not isinstance(payload, dict) or payload.get("version") not in _READABLE_VERSIONS:
+        raise ValueError("Unsupported asset snapshot. It was not written by this version of the package.")
+    registry = Asset._assets
+    instances = [None] * payload["size"]
+    created = []  # positions of the instances that are not registered yet
+    restored = np.full(payload["size"], overwrite)
+
+    # First pass: look up or allocate every instance, so that references can be resolved.
+    for group in payload["groups"]:
+        cls = _import_class(group["cls"])
+        for position, name in zip(group["positions"].tolist(), group["names"]):
+            inst = registry.get(Asset._registry_key(cls, name))
+            if inst is None:
+                inst = object.__new__(cls)
+                created.append(position)
+                restored[position] = True
+            instances[position] = inst
+
+    # Second pass: restore the state.
+    for group in payload["groups"]:
+        rows = [instances[p] for p in group["positions"].tolist()]
+        columns = [(attr, _decode_column(column, instances)) for attr, column in group["columns"].items()]
+        for i, (inst, name) in enumerate(zip(rows, group["names"])):
+            if not restored[group["positions"][i]]:
+                continue
+            state = inst.__dict__
+            state["_name"] = name
+            state["_initialized"] = True
+            for attr, values in columns:
+                value = values[i]
+                if value is not _MISSING:
+                    state[attr] = value
+
+    # Register in snapshot order, so that a fresh process assigns the same IDs as the saving one.
+    Asset._register_many(instances[p] for p in sorted(created))
+    for group in payload["groups"]:
+        mask = restored[group["positions"]]
+        rows = [instances[p] for p in group["positions"][mask].tolist()]
+        Asset.price_book.set_prices(Asset.price_book.ids(rows), group["prices"][mask])
+    return instances
+
+
+#################################
+# AssetBatch Class
+#################################
+
+class AssetBatch:
+    """
+    A list of assets that pickles as one column-wise payload.
+
+    Pickling assets one by one stores a state dictionary per object. Wrapping them
+    in an AssetBatch (e.g., before sending them to `ProcessPoolExecutor` workers)
+    pickles the whole object graph, underlyings included, as the compact arrays of
+    `encode_assets`. On load, the assets are re-interned into the registry of the
+    receiving process: registered assets are reused as is, the others are created.
+
+    Attributes
+    ----------
+    assets : list of Asset
+        The batched assets.
+    """
+
+    def __init__(self, assets):
+        """
+        Initialize an AssetBatch.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            The assets to batch.
+        """
+        self.assets = list(assets)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __iter__(self):
+        return iter(self.assets)
+
+    def __getitem__(self, i):
+        return self.assets[i]
+
+    def __reduce__(self):
+        order = _with_references(self.assets)
+        index = {id(inst): i for i, inst in enumerate(order)}
+        positions = np.array([index[id(a)] for a in self.assets], dtype=np.int64)
+        return _load_batch, (encode_assets(order), positions)
+
+
+#################################
+# Helpers
+#################################
+
+class _Missing:
+    """Marker for attributes absent from some instances of a class."""
+
+    def __reduce__(self):
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def _load_batch(payload, positions):
+    instances = decode_assets(payload, overwrite=False)
+    return AssetBatch(instances[p] for p in positions.tolist())
+
+
+def _dump(payload, file):
+    if hasattr(file, "write"):
+        pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(file, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _with_references(instances):
+    """Return the instances plus every asset they reference, referenced assets first."""
+    order = []
+    seen = set()
+
+    def visit(inst):
+        if id(inst) in seen:
+            return
+        seen.add(id(inst))
+        for value in vars(inst).values():
+            if isinstance(value, Asset):
+                visit(value)
+        order.append(inst)
+
+    for inst in instances:
+        visit(inst)
+    return order
+
+
+def _encode_column(values, index):
+    present = [v for v in values if v is not _MISSING]
+    if len(present) == len(values):
+        if all(isinstance(v, Asset) for v in values):
+            return ("asset", _compress(np.array([index[id(v)] for v in values], dtype=np.int64)))
+        if all(isinstance(v, ExpirationDate) for v in values):
+            return ("expiration",
+                    _compress(np.array([v.expiration_date for v in values])),
+                    _compress(np.array([v._fixed_time if v.isTimeFixed else np.nan for v in values], dtype=float)))
+        if all(type(v) is float for v in values):
+            return _compress(np.array(values, dtype=float))
+        if all(type(v) is int for v in values):
+            return _compress(np.array(values, dtype=np.int64))
+        if all(type(v) is str for v in values):
+            return _compress(np.array(values, dtype=str))
+    asset_rows = [i for i, v in enumerate(values) if isinstance(v, Asset)]
+    values = list(values)
+    for i in asset_rows:
+        values[i] = index[id(values[i])]
+    return ("list", values, asset_rows)
+
+
+def _compress(array):
+    """Store low-cardinality arrays as their unique values plus small integer codes."""
+    if len(array) < 2:
+        return ("array", array)
+    uniques, codes = np.unique(array, return_inverse=True)
+    if len(uniques) == 1:
+        return ("constant", uniques, len(array))
+    if 2 * len(uniques) > len(array):
+        return ("array", array)
+    return ("category", uniques, codes.reshape(-1).astype(np.min_scalar_type(len(uniques) - 1)))
+
+
+def _expand(column):
+    kind = column[0]
+    if kind == "constant":
+        return np.repeat(column[1], column[2])
+    if kind == "category":
+        return column[1][column[2]]
+    return column[1]
+
+
+def _decode_column(column, instances):
+    kind = column[0]
+    if kind == "asset":
+        return [instances[i] for i in _expand(column[1]).tolist()]
+    if kind == "expiration":
+        dates, fixed_times = _expand(column[1]), _expand(column[2])
+        templates = {date: ExpirationDate(date) for date in np.unique(dates).tolist()}
+        expirations = []
+        for date, fixed in zip(dates.tolist(), fixed_times.tolist()):
+            expiration = templates[date].copy()
+            if fixed == fixed:
+                expiration.fix_time(fixed)
+            expirations.append(expiration)
+        return expirations
+    if kind in ("array", "constant", "category"):
+        return _expand(column).tolist()
+    values = list(column[1])
+    for i in column[2]:
+        values[i] = instances[values[i]]
+    return values
+
+
+def _import_class(path):
+    module, qualname = path.split(":")
+    obj = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
@@ -0,0 +1,292 @@
+# Contains the TickBuffer class
+
+from typing import NamedTuple
+import numpy as np
+
+#################################
+# Bars
+#################################
+
+class Bars(NamedTuple):
+    """
+    OHLC/VWAP bars, as arrays aligned by bar and sorted by time.
+
+    Attributes
+    ----------
+    start : numpy.ndarray
+        Start time of each bar (a multiple of the bar interval).
+    open, high, low, close : numpy.ndarray
+        First, highest, lowest and last price of each bar.
+    vwap : numpy.ndarray
+        Volume-weighted average price of each bar.
+    volume : numpy.ndarray
+        Total volume of each bar.
+    count : numpy.ndarray
+        Number of ticks in each bar.
+    """
+    start: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    vwap: np.ndarray
+    volume: np.ndarray
+    count: np.ndarray
+
+
+#################################
+# TickBuffer Class
+#################################
+
+class TickBuffer:
+    """
+    Fixed-memory ring buffer of (timestamp, price, volume) ticks with incremental bars.
+
+    Ticks are written into preallocated NumPy arrays; once `capacity` ticks have been
+    recorded, the oldest ones are overwritten. For every registered bar interval, the
+    current bar is updated with each tick in O(1) and written to a ring of completed
+    bars when a tick falls into a later interval, so bars never require rescanning
+    the ticks. Intervals without ticks produce no bar.
+
+    Timestamps are expected in non-decreasing order; a late tick is folded into the
+    current bar of each interval.
+
+    Attributes
+    ----------
+    capacity : int
+        Maximum number of ticks kept.
+    count : int
+        Total number of ticks recorded since creation.
+    """
+
+    def __init__(self, capacity: int = 4096, intervals=(), bar_capacity: int = 1024):
+        """
+        Initialize an empty TickBuffer.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Maximum number of ticks kept.
+        intervals : iterable of float, optional
+            Bar intervals, in the unit of the timestamps (seconds for `time.time()`).
+        bar_capacity : int, optional
+            Maximum number of completed bars kept per interval.
+        """
+        if capacity < 1 or bar_capacity < 1:
+            raise ValueError("Capacities must be at least 1.")
+        self.capacity = capacity
+        self.bar_capacity = bar_capacity
+        self.count = 0
+        self._times = np.empty(capacity)
+        self._prices = np.empty(capacity)
+        self._volumes = np.empty(capacity)
+        self._bars = {}
+        for interval in intervals:
+            self.add_interval(interval)
+
+    def __len__(self) -> int:
+        """Number of ticks currently kept."""
+        return min(self.count, self.capacity)
+
+    @property
+    def intervals(self) -> list:
+        """Registered bar intervals."""
+        return list(self._bars)
+
+    def add_interval(self, interval: float) -> None:
+        """
+        Start building bars for an interval.
+
+        The ticks currently in the buffer are aggregated once; later ticks update the
+        bars incrementally.
+
+        Parameters
+        ----------
+        interval : float
+            Bar interval, in the unit of the timestamps.
+        """
+        if interval <= 0:
+            raise ValueError("Bar intervals must be positive.")
+        if interval in self._bars:
+            return
+        builder = _BarBuilder(interval, self.bar_capacity)
+        if self.count:
+            builder.extend(*self.ticks())
+        self._bars[interval] = builder
+
+    def remove_interval(self, interval: float) -> None:
+        """Stop building bars for an interval and drop them."""
+        del self._bars[interval]
+
+    def append(self, timestamp: float, price: float, volume: float = 1.0) -> None:
+        """
+        Record one tick.
+
+        Parameters
+        ----------
+        timestamp : float
+            Time of the tick.
+        price : float
+            Traded or quoted price.
+        volume : float, optional
+            Traded volume. Defaults to 1, which makes the VWAP a tick-weighted average.
+        """
+        i = self.count % self.capacity
+        self._times[i] = timestamp
+        self._prices[i] = price
+        self._volumes[i] = volume
+        self.count += 1
+        for builder in self._bars.values():
+            builder.append(timestamp, price, volume)
+
+    def extend(self, timestamps, prices, volumes=1.0) -> None:
+        """
+        Record many ticks at once, oldest first.
+
+        Parameters
+        ----------
+        timestamps : array-like of float
+            Times of the ticks, in non-decreasing order.
+        prices : array-like of float
+            Prices, aligned with `timestamps`.
+        volumes : float or array-like of float, optional
+            Volumes, aligned with `timestamps`.
+        """
+        timestamps = np.asarray(timestamps, dtype=float).reshape(-1)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), timestamps.shape)
+        volumes = np.broadcast_to(np.asarray(volumes, dtype=float), timestamps.shape)
+        n = len(timestamps)
+        if not n:
+            return
+        kept = slice(max(n - self.capacity, 0), n)
+        slots = (self.count + np.arange(n)[kept]) % self.capacity
+        self._times[slots] = timestamps[kept]
+        self._prices[slots] = prices[kept]
+        self._volumes[slots] = volumes[kept]
+        self.count += n
+        for builder in self._bars.values():
+            builder.extend(timestamps, prices, volumes)
+
+    def ticks(self) -> tuple:
+        """
+        Return the kept ticks in chronological order.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Copies of (timestamps, prices, volumes).
+        """
+        order = self._order()
+        return self._times[order], self._prices[order], self._volumes[order]
+
+    def last_price(self) -> float:
+        """Price of the most recent tick, or None if no tick was recorded."""
+        if not self.count:
+            return None
+        return float(self._prices[(self.count - 1) % self.capacity])
+
+    def bars(self, interval: float, include_current: bool = True) -> Bars:
+        """
+        Return the bars of a registered interval.
+
+        Parameters
+        ----------
+        interval : float
+            A registered bar interval.
+        include_current : bool, optional
+            Whether to include the bar still being built. Defaults to True.
+
+        Returns
+        -------
+        Bars
+            The kept bars, oldest first.
+
+        Raises
+        ------
+        KeyError
+            If the interval is not registered.
+        """
+        return self._bars[interval].bars(include_current)
+
+    def _order(self):
+        if self.count <= self.capacity:
+            return np.arange(self.count)
+        return (self.count + np.arange(self.capacity)) % self.capacity
+
+
+#################################
+# Helpers
+#################################
+
+class _BarBuilder:
+    """Current bar of one interval and a ring of completed bars."""
+
+    _FIELDS = 8  # start, open, high, low, close, price * volume, volume, count
+
+    def __init__(self, interval, capacity):
+        self.interval = interval
+        self.capacity = capacity
+        self.completed = 0
+        self._ring = np.empty((capacity, self._FIELDS))
+        self._current = None  # [start, open, high, low, close, pv, volume, count]
+
+    def append(self, timestamp, price, volume):
+        current = self._current
+        start = (timestamp // self.interval) * self.interval
+        if current is None or start > current[0]:
+            if current is not None:
+                self._close(current)
+            self._current = [start, price, price, price, price, price * volume, volume, 1]
+            return
+        if price > current[2]:
+            current[2] = price
+        elif price < current[3]:
+            current[3] = price
+        current[4] = price
+        current[5] += price * volume
+        current[6] += volume
+        current[7] += 1
+
+    def extend(self, timestamps, prices, volumes):
+        starts = (timestamps // self.interval) * self.interval
+        if self._current is not None:
+            starts = np.maximum(starts, self._current[0])  # late ticks join the current bar
+        edges = np.flatnonzero(np.diff(starts)) + 1
+        firsts = np.concatenate(([0], edges))
+        lasts = np.concatenate((edges, [len(starts)])) - 1
+        pv = prices * volumes
+        bars = np.column_stack((
+            starts[firsts], prices[firsts],
+            np.maximum.reduceat(prices, firsts), np.minimum.reduceat(prices, firsts), prices[lasts],
+            np.add.reduceat(pv, firsts), np.add.reduceat(volumes, firsts), lasts - firsts + 1,
+        ))
+        current = self._current
+        if current is not None and bars[0, 0] == current[0]:
+            first = bars[0]
+            bars[0] = (current[0], current[1], max(current[2], first[2]), min(current[3], first[3]), first[4],
+                       current[5] + first[5], current[6] + first[6], current[7] + first[7])
+        elif current is not None:
+            self._close(current)
+        self._close_many(bars[:-1])
+        self._current = bars[-1].tolist()
+
+    def bars(self, include_current):
+        n = min(self.completed, self.capacity)
+        order = (self.completed - n + np.arange(n)) % self.capacity
+        rows = self._ring[order]
+        if include_current and self._current is not None:
+            rows = np.vstack((rows, self._current))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = rows[:, 5] / rows[:, 6]
+        return Bars(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3], rows[:, 4], vwap, rows[:, 6],
+                    rows[:, 7].astype(np.int64))
+
+    def _close(self, bar):
+        self._ring[self.completed % self.capacity] = bar
+        self.completed += 1
+
+    def _close_many(self, rows):
+        n = len(rows)
+        kept = rows[max(n - self.capacity, 0):]
+        self._ring[(self.completed + n - len(kept) + np.arange(len(kept))) % self.capacity] = kept
+        self.completed += n
@@ -0,0 +1,192 @@
+# Contains the ValuationContext class
+
+import threading
+from contextvars import ContextVar
+import numpy as np
+
+_active = ContextVar("valuation_context", default=None)
+
+#################################
+# ValuationContext Class
+#################################
+
+class ValuationContext:
+    """
+    Copy-on-write overlay of prices and fixed times on top of the live registry.
+
+    While a context is active (``with context: ...``), `Asset.price` and
+    `ExpirationDate.T` read through it, and `Asset.set_price` and
+    `ValuationContext.fix_time` write into it, leaving the live registry and every
+    other context untouched. Values that were not overridden fall through to the
+    parent context, then to the live registry, so creating a context copies nothing.
+
+    The active context is stored in a `contextvars.ContextVar`, hence it is local to
+    the current thread (and asyncio task). Many scenarios can therefore be valued in
+    parallel threads, each inside its own context, without locks.
+
+    Attributes
+    ----------
+    parent : ValuationContext or None
+        Context whose values are visible where this one has no override. None for the
+        live registry.
+    """
+
+    def __init__(self, prices=None, times=None, parent: "ValuationContext" = None):
+        """
+        Initialize a ValuationContext.
+
+        Parameters
+        ----------
+        prices : dict or None, optional
+            Price overrides keyed by asset. None values mark prices as unset.
+        times : dict or None, optional
+            Times to expiration (in years) keyed by asset with an expiration date.
+        parent : ValuationContext or None, optional
+            Context to inherit from. Defaults to the live registry.
+        """
+        self.parent = parent
+        self._prices = {}  # asset ID -> price (NaN when unset)
+        self._times = {}  # ExpirationDate -> time to expiration
+        self._local = threading.local()  # per-thread stack of ContextVar tokens
+        for asset, price in (prices or {}).items():
+            self.set_price(asset, price)
+        for asset, T in (times or {}).items():
+            self.fix_time(asset, T)
+
+    def __enter__(self) -> "ValuationContext":
+        tokens = self._local.__dict__.setdefault("tokens", [])
+        tokens.append(_active.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _active.reset(self._local.tokens.pop())
+
+    @staticmethod
+    def current() -> "ValuationContext":
+        """Return the context active in the current thread or task, or None."""
+        return _active.get()
+
+    def child(self, prices=None, times=None) -> "ValuationContext":
+        """Return a new context inheriting from this one."""
+        return self.__class__(prices, times, parent=self)
+
+    #################################
+    # Prices
+    #################################
+
+    def set_price(self, asset, price: float = None) -> None:
+        """
+        Override the price of an asset in this context.
+
+        Parameters
+        ----------
+        asset : Asset
+            The asset.
+        price : float or None, optional
+            The price. None marks it as unset in this context.
+        """
+        self._prices[asset._id] = np.nan if price is None else float(price)
+
+    def set_prices(self, assets, prices) -> None:
+        """
+        Override the prices of many assets in this context.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            The assets.
+        prices : float or array-like of float
+            The prices, aligned with `assets`. NaN marks a price as unset.
+        """
+        assets = list(assets)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), (len(assets),))
+        self._prices.update(zip((a._id for a in assets), prices.tolist()))
+
+    def price(self, asset) -> float:
+        """
+        Return the price of an asset as seen from this context.
+
+        Returns
+        -------
+        float or None
+            The price, or None if it is unset.
+        """
+        context = self
+        while context is not None:
+            price = context._prices.get(asset._id)
+            if price is not None:
+                return None if price != price else price
+            context = context.parent
+        return asset.price_book.get(asset._id)
+
+    def get_prices(self, assets) -> np.ndarray:
+        """
+        Return the prices of many assets as seen from this context.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            The assets.
+
+        Returns
+        -------
+        numpy.ndarray
+            The prices, aligned with `assets`. Unset prices are NaN.
+        """
+        assets = list(assets)
+        if not assets:
+            return np.empty(0)
+        book = assets[0].price_book
+        ids = book.ids(assets)
+        prices = book.get_prices(ids)
+        for context in reversed(self._chain()):
+            if not context._prices:
+                continue
+            keys = np.fromiter(context._prices.keys(), dtype=np.int64, count=len(context._prices))
+            values = np.fromiter(context._prices.values(), dtype=float, count=len(context._prices))
+            order = np.argsort(keys)
+            keys, values = keys[order], values[order]
+            position = np.clip(np.searchsorted(keys, ids), 0, len(keys) - 1)
+            hit = keys[position] == ids
+            prices[hit] = values[position[hit]]
+        return prices
+
+    #################################
+    # Times
+    #################################
+
+    def fix_time(self, asset, T: float) -> None:
+        """
+        Fix the time to expiration of an asset in this context.
+
+        Parameters
+        ----------
+        asset : Derivative or ExpirationDate
+            An asset with an expiration date, or the expiration date itself.
+        T : float
+            Time to expiration in years.
+        """
+        expiration = getattr(asset, "expiration", asset)
+        if expiration is None:
+            raise ValueError(f"{asset} has no expiration date.")
+        self._times[expiration] = float(T)
+
+    def fixed_time(self, expiration) -> float:
+        """
+        Return the time to expiration fixed for an expiration date in this context, or None.
+        """
+        context = self
+        while context is not None:
+            T = context._times.get(expiration)
+            if T is not None:
+                return T
+            context = context.parent
+        return None
+
+    def _chain(self):
+        chain = []
+        context = self
+        while context is not None:
+            chain.append(context)
+            context = context.parent
+        return chain
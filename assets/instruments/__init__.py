@@ -6,10 +6,16 @@ from .stock import Stock
 from .currency import Currency
 from .futures import Futures
 from .option import Option
+from .factory import create_options, create_futures, options_from_symbols, options_from_csv, futures_from_csv
 
 __all__ = [
     "Stock",
     "Currency",
     "Futures",
     "Option",
+    "create_options",
+    "create_futures",
+    "options_from_symbols",
+    "options_from_csv",
+    "futures_from_csv",
 ]
@@ -0,0 +1,328 @@
+# Contains functions for creating instruments in bulk
+
+import csv
+import time
+import numpy as np
+from assets.core.asset import Asset
+from assets.instruments.stock import Stock
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.utils.expiration_date import ExpirationDate
+from assets.utils.symbols import parse_option_symbols
+
+#################################
+# Bulk factories
+#################################
+
+def create_options(underlyings, strikes, expirations, option_types, prices=None, multiplier=100) -> list:
+    """
+    Create many Option instances at once.
+
+    Equivalent to calling `Option(...)` row by row, but validates the inputs as arrays,
+    parses each distinct expiration date only once and inserts the new instances into
+    the registry in a single batch. Rows naming an option that already exists return
+    the existing instance, whose price is updated if one is given.
+
+    Parameters
+    ----------
+    underlyings : Asset, str or array-like of Asset/str
+        The underlying(s). Strings are interpreted as stock tickers.
+    strikes : float or array-like of float
+        Strike prices.
+    expirations : str or array-like of str
+        Expiration dates in the 'YYMMDD' format.
+    option_types : str or array-like of str
+        Option types: 'call', 'put', 'C', or 'P'.
+    prices : float or array-like of float, optional
+        Current market prices. None or NaN entries leave the price unset.
+    multiplier : int or array-like of int, optional
+        Contract multipliers. Defaults to 100.
+
+    Returns
+    -------
+    list of Option
+        The options, aligned with the input rows.
+
+    Raises
+    ------
+    ValueError
+        If an option type, strike or expiration date is invalid.
+    """
+    n = _row_count(underlyings, strikes, expirations, option_types, prices, multiplier)
+    underlyings = _resolve_underlyings(underlyings, n)
+    strikes = _float_column(strikes, n, "strike")
+    expirations = _str_column(expirations, n)
+    multipliers = _column(multiplier, n)
+    prices = _price_column(prices, n)
+
+    option_types = np.char.upper(_str_column(option_types, n))
+    valid = np.isin(option_types, ["C", "CALL", "P", "PUT"])
+    if not valid.all():
+        bad = option_types[~valid][0]
+        raise ValueError(f"Invalid option type: {bad}. Allowed types are 'call' or 'put'.")
+    option_types = [t[0] for t in option_types.tolist()]
+    templates = _expiration_templates(expirations)
+
+    make_name = Option._format_name
+    names = [make_name(u.name, k, e, t)
+             for u, k, e, t in zip(underlyings, strikes.tolist(), expirations.tolist(), option_types)]
+
+    def build(i, name):
+        inst = object.__new__(Option)
+        inst.option_type = option_types[i]
+        inst.strike = strikes[i].item()
+        inst.multiplier = multipliers[i]
+        inst._name = name
+        inst._initialized = True
+        inst.underlying = underlyings[i]
+        inst.expiration = templates[expirations[i]].copy()
+        return inst
+
+    return _intern(Option, names, prices, build)
+
+
+def create_futures(underlyings, expirations, forward_prices, contract_sizes, prices=None) -> list:
+    """
+    Create many Futures instances at once.
+
+    Equivalent to calling `Futures(...)` row by row, with the same batching as
+    `create_options`.
+
+    Parameters
+    ----------
+    underlyings : Asset, str or array-like of Asset/str
+        The underlying(s). Strings are interpreted as stock tickers.
+    expirations : str or array-like of str
+        Expiration dates in the 'YYMMDD' format.
+    forward_prices : float or array-like of float
+        Agreed-upon prices of the underlying at expiration.
+    contract_sizes : float or array-like of float
+        Quantity of the underlying represented by one contract.
+    prices : float or array-like of float, optional
+        Current market prices. None or NaN entries leave the price unset.
+
+    Returns
+    -------
+    list of Futures
+        The futures contracts, aligned with the input rows.
+
+    Raises
+    ------
+    ValueError
+        If an expiration date is invalid.
+    """
+    n = _row_count(underlyings, expirations, forward_prices, contract_sizes, prices)
+    underlyings = _resolve_underlyings(underlyings, n)
+    expirations = _str_column(expirations, n)
+    forward_prices = _float_column(forward_prices, n, "forward_price").tolist()
+    contract_sizes = _float_column(contract_sizes, n, "contract_size").tolist()
+    prices = _price_column(prices, n)
+    templates = _expiration_templates(expirations)
+
+    make_name = Futures._format_name
+    names = [make_name(u.name, e) for u, e in zip(underlyings, expirations.tolist())]
+
+    def build(i, name):
+        inst = object.__new__(Futures)
+        inst.forward_price = forward_prices[i]
+        inst.contract_size = contract_sizes[i]
+        inst._name = name
+        inst._initialized = True
+        inst.underlying = underlyings[i]
+        inst.expiration = templates[expirations[i]].copy()
+        return inst
+
+    return _intern(Futures, names, prices, build)
+
+
+def options_from_symbols(symbols, underlyings=None, prices=None, multiplier=100) -> list:
+    """
+    Create many Option instances from their OCC-like symbols.
+
+    Parameters
+    ----------
+    symbols : array-like of str
+        Option symbols as produced by `Option._make_name`.
+    underlyings : Asset or array-like of Asset, optional
+        The underlying assets. By default, the decoded underlying names are
+        interpreted as stock tickers.
+    prices : float or array-like of float, optional
+        Current market prices.
+    multiplier : int or array-like of int, optional
+        Contract multipliers. Defaults to 100.
+
+    Returns
+    -------
+    list of Option
+        The options, aligned with `symbols`.
+    """
+    names, expirations, option_types, strikes = parse_option_symbols(symbols)
+    return create_options(names if underlyings is None else underlyings, strikes, expirations, option_types,
+                          prices=prices, multiplier=multiplier)
+
+
+def options_from_csv(path, underlying="underlying", strike="strike", expiration="expiration",
+                     option_type="option_type", price=None, multiplier=None, symbol=None) -> list:
+    """
+    Create Option instances from the columns of a CSV file with a header row.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path to the CSV file.
+    underlying, strike, expiration, option_type : str, optional
+        Names of the columns holding the corresponding constructor arguments.
+        Ignored if `symbol` is given.
+    price : str or None, optional
+        Name of the column holding prices. Empty cells leave the price unset.
+    multiplier : str or None, optional
+        Name of the column holding contract multipliers. Defaults to 100 for all rows.
+    symbol : str or None, optional
+        Name of a column holding OCC-like option symbols to decode instead.
+
+    Returns
+    -------
+    list of Option
+        The options, in file order.
+    """
+    wanted = [symbol] if symbol is not None else [underlying, strike, expiration, option_type]
+    columns = _read_columns(path, wanted + [c for c in (price, multiplier) if c is not None])
+    prices = _parse_prices(columns[price]) if price is not None else None
+    multipliers = [int(m) for m in columns[multiplier]] if multiplier is not None else 100
+    if symbol is not None:
+        return options_from_symbols(columns[symbol], prices=prices, multiplier=multipliers)
+    return create_options(columns[underlying], columns[strike], columns[expiration], columns[option_type],
+                          prices=prices, multiplier=multipliers)
+
+
+def futures_from_csv(path, underlying="underlying", expiration="expiration", forward_price="forward_price",
+                     contract_size="contract_size", price=None) -> list:
+    """
+    Create Futures instances from the columns of a CSV file with a header row.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path to the CSV file.
+    underlying, expiration, forward_price, contract_size : str, optional
+        Names of the columns holding the corresponding constructor arguments.
+    price : str or None, optional
+        Name of the column holding prices. Empty cells leave the price unset.
+
+    Returns
+    -------
+    list of Futures
+        The futures contracts, in file order.
+    """
+    columns = _read_columns(path, [underlying, expiration, forward_price, contract_size]
+                            + ([price] if price is not None else []))
+    prices = _parse_prices(columns[price]) if price is not None else None
+    return create_futures(columns[underlying], columns[expiration], columns[forward_price],
+                          columns[contract_size], prices=prices)
+
+
+#################################
+# Helpers
+#################################
+
+def _is_scalar(values):
+    return isinstance(values, (str, bytes, Asset)) or np.ndim(values) == 0
+
+
+def _row_count(*columns):
+    lengths = {len(c) for c in columns if c is not None and not _is_scalar(c)}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length, got lengths {sorted(lengths)}.")
+    return lengths.pop() if lengths else 1
+
+
+def _column(values, n):
+    if _is_scalar(values):
+        return [values] * n
+    return list(values)
+
+
+def _str_column(values, n):
+    return np.asarray(_column(values, n), dtype=str)
+
+
+def _float_column(values, n, label):
+    try:
+        column = np.asarray(_column(values, n), dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"Column '{label}' must contain numbers only.")
+    if not np.isfinite(column).all():
+        raise ValueError(f"Column '{label}' contains non-finite values at rows {np.flatnonzero(~np.isfinite(column)).tolist()[:10]}.")
+    return column
+
+
+def _price_column(values, n):
+    if values is None:
+        return np.full(n, np.nan)
+    return np.asarray([np.nan if v is None else v for v in _column(values, n)], dtype=float)
+
+
+def _parse_prices(cells):
+    return [float(c) if c.strip() else None for c in cells]
+
+
+def _resolve_underlyings(underlyings, n):
+    """Map each row to an underlying asset, looking each distinct ticker up only once."""
+    if isinstance(underlyings, Asset):
+        return [underlyings] * n
+    resolved = {}
+    column = []
+    for u in _column(underlyings, n):
+        if isinstance(u, Asset):
+            column.append(u)
+            continue
+        asset = resolved.get(u)
+        if asset is None:
+            ticker = Stock._make_name(u)
+            asset = Asset._assets.get(Asset._registry_key(Stock, ticker))
+            if asset is None:
+                asset = Stock(ticker)
+            resolved[u] = asset
+        column.append(asset)
+    return column
+
+
+def _expiration_templates(expirations):
+    """Parse each distinct expiration date once; rows then receive copies of the template."""
+    return {e: ExpirationDate(e) for e in np.unique(expirations).tolist()}
+
+
+def _intern(cls, names, prices, build):
+    """Return registered instances for existing names, build and register the others in one batch, then set prices."""
+    registry = Asset._assets
+    created = {}
+    result = []
+    for i, name in enumerate(names):
+        inst = created.get(name)
+        if inst is None:
+            inst = registry.get(Asset._registry_key(cls, name))
+            if inst is None:
+                inst = created[name] = build(i, name)
+        result.append(inst)
+    Asset._register_many(created.values())
+    priced = ~np.isnan(prices)
+    if priced.any():
+        ids = Asset.price_book.ids(result)
+        Asset.price_book.set_prices(ids[priced], prices[priced], time.time())
+    return result
+
+
+def _read_columns(path, names):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        try:
+            indices = [header.index(name) for name in names]
+        except ValueError as e:
+            raise ValueError(f"Missing column in '{path}': {e}")
+        columns = {name: [] for name in names}
+        appends = [columns[name].append for name in names]
+        for row in reader:
+            for append, i in zip(appends, indices):
+                append(row[i])
+    return columns
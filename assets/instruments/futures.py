@@ -71,8 +71,23 @@ class Futures(Derivative):
     def _make_name(cls, underlying, expiration, *args, **kwargs):
         if not expiration:
             raise TypeError("Futures contract must have an expiration date. 'expiration' cannot be None.")
+        return cls._format_name(underlying.name, expiration)
+
+    @classmethod
+    def _format_name(cls, underlying_name: str, expiration: str) -> str:
+        """
+        Format a futures name: underlying + month code + 2-digit day (e.g., 'ESZ20').
+
+        The single definition of the format, shared by `_make_name` and the bulk
+        factories, since names are the registry keys of the contracts.
+
+        Raises
+        ------
+        ValueError
+            If the month of `expiration` is invalid.
+        """
         try:
-            return underlying.name + cls.futures_month_codes[expiration[2:4]] + str(expiration[4:6])
+            return underlying_name + cls.futures_month_codes[expiration[2:4]] + str(expiration[4:6])
         except KeyError:
             raise ValueError(f"Invalid month in expiration: '{expiration[2:4]}'. Must be 01–12.")
 
@@ -91,4 +106,14 @@ class Futures(Derivative):
             Settlement price of the futures contract.
         """
         price_at_expr = self.contract_size * (ST - self.forward_price)
-        return price_at_expr
\ No newline at end of file
+        return price_at_expr
+
+    def settlement_price(self, ST: float) -> float:
+        """
+        Return the final settlement quote of the futures contract, i.e. the price of
+        the underlying at expiration.
+
+        Unlike `price_at_expiration`, which gives the value of a position, this is a
+        futures quote, consistent with how `price` is used everywhere else.
+        """
+        return ST
\ No newline at end of file
@@ -28,11 +28,19 @@ class Option(Derivative):
     name : str
         Name of the option contract, automatically generated based on the underlying asset, 
         expiration date, option type, and strike price.
-
-
-
+    bid, ask : float or None
+        Latest bid and ask quotes, if set by an option-chain provider.
+    open_interest : int or None
+        Number of open contracts, if set by an option-chain provider.
+    implied_volatility : float or None
+        Implied volatility quoted by the data source, if set by an option-chain provider.
     """
 
+    bid = None
+    ask = None
+    open_interest = None
+    implied_volatility = None
+
     def __init__(self, underlying, strike, expiration, option_type, price = None, multiplier = 100):
         """
         Initialize an Option instance.
@@ -77,8 +85,18 @@ class Option(Derivative):
 
     @classmethod
     def _make_name(cls, underlying, strike, expiration, option_type, *args, **kwargs):
+        return cls._format_name(underlying.name, strike, expiration, option_type)
+
+    @classmethod
+    def _format_name(cls, underlying_name: str, strike: float, expiration: str, option_type: str) -> str:
+        """
+        Format an option name: underlying + YYMMDD + C/P + strike in thousandths on 8 digits.
+
+        The single definition of the format, shared by `_make_name` and the bulk
+        factories, since names are the registry keys of the options.
+        """
         return (
-            underlying.name
+            underlying_name
             + expiration
             + option_type[0].upper()
             + str(int(strike * 1e3)).zfill(8)  # Strike price as an 8-digit integer (padded)
@@ -16,9 +16,11 @@ class Stock(Underlying):
         The stock ticker symbol (e.g., 'AAPL', 'TSLA').
     price : float
         The current price of the stock.
+    currency : Currency or None
+        The currency the stock is traded in. None means USD.
     """
 
-    def __init__(self, ticker: str, price: float = None):
+    def __init__(self, ticker: str, price: float = None, currency=None):
         """
         Initialize a Stock instance.
 
@@ -28,9 +30,14 @@ class Stock(Underlying):
             The stock ticker symbol (e.g., 'AAPL', 'TSLA').
         price : float
             The current price of the stock.
+        currency : Currency, str or None, optional
+            The currency the stock is traded in (see `Asset.set_currency`). When an
+            existing stock is looked up again, None keeps its current currency.
         """
         name = self._make_name(ticker)
         super().__init__(name, price=price)
+        if currency is not None:
+            self.set_currency(currency)
 
     @classmethod
     def _make_name(cls, ticker: str, *args, **kwargs):
@@ -10,21 +10,64 @@ Public API
 ----------
 - Base classes:
     PriceProvider
+    AsyncPriceProvider
+
+- Adapters:
+    SyncPriceProviderAdapter
+
+- Routing mixed asset lists:
+    CompositePriceProvider
+    RoutedPrices
 
 - Example implementations:
     YFinanceStockPriceProvider
     YFinanceCurrencyPriceProvider
+    YFinanceOptionChainProvider
+    LocalPriceProvider
+    AsyncLocalPriceProvider
+
+- Scheduling:
+    RefreshScheduler
+
+- Sharing prices across processes:
+    SharedPricePublisher
+    SharedPriceReader
 """
 
-# Base ABC
+# Base ABCs
 from assets.price_providers.price_provider import PriceProvider
+from assets.price_providers.async_price_provider import AsyncPriceProvider
+
+# Adapters
+from assets.price_providers.async_price_provider import SyncPriceProviderAdapter
+
+# Routing
+from assets.price_providers.composite_price_provider import CompositePriceProvider, RoutedPrices
 
 # Example concrete implementations
 from assets.price_providers.stock_price_providers.yfinance_stock_price_provider import YFinanceStockPriceProvider
 from assets.price_providers.currency_price_providers.yfinance_currency_price_provider import YFinanceCurrencyPriceProvider
+from assets.price_providers.option_price_providers.yfinance_option_chain_provider import YFinanceOptionChainProvider
+from assets.price_providers.local_price_provider import LocalPriceProvider, AsyncLocalPriceProvider
+
+# Scheduling
+from assets.price_providers.refresh_scheduler import RefreshScheduler
+
+# Sharing prices across processes
+from assets.price_providers.shared_price_table import SharedPricePublisher, SharedPriceReader
 
 __all__ = [
     "PriceProvider",
+    "AsyncPriceProvider",
+    "SyncPriceProviderAdapter",
+    "CompositePriceProvider",
+    "RoutedPrices",
     "YFinanceStockPriceProvider",
     "YFinanceCurrencyPriceProvider",
+    "YFinanceOptionChainProvider",
+    "LocalPriceProvider",
+    "AsyncLocalPriceProvider",
+    "RefreshScheduler",
+    "SharedPricePublisher",
+    "SharedPriceReader",
 ]
@@ -0,0 +1,205 @@
+# Contains the AsyncPriceProvider and SyncPriceProviderAdapter classes
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from assets.price_providers.price_provider import stale_assets
+from assets.utils.validation import validate_type
+
+#################################
+# AsyncPriceProvider Abstract Base Class
+#################################
+
+class AsyncPriceProvider(ABC):
+    """
+    Abstract base class for price providers used from asyncio code.
+
+    Counterpart of `PriceProvider` whose fetch methods are coroutines. Batch fetches
+    run concurrently, bounded by a semaphore, and every single fetch is subject to a
+    timeout. Cancelling a batch cancels all of its pending fetches.
+
+    Attributes
+    ----------
+    asset_class : type
+        The class of asset that the provider supports (e.g., Stock, Currency).
+    max_concurrency : int
+        Maximum number of fetches running at the same time (per event loop).
+    timeout : float or None
+        Maximum time in seconds allowed for a single fetch. None disables the timeout.
+    """
+
+    max_concurrency = 10
+    timeout = None
+
+    def __init__(self, max_concurrency: int = None, timeout: float = None):
+        """
+        Initialize the provider.
+
+        Parameters
+        ----------
+        max_concurrency : int or None, optional
+            Maximum number of concurrent fetches. Defaults to the class attribute.
+        timeout : float or None, optional
+            Per-fetch timeout in seconds. Defaults to the class attribute.
+        """
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError("'max_concurrency' must be at least 1.")
+            self.max_concurrency = max_concurrency
+        if timeout is not None:
+            self.timeout = timeout
+
+    @property
+    @abstractmethod
+    def asset_class(self):
+        """The class of asset supported by this provider (e.g., Stock, Currency)."""
+        pass
+
+    @abstractmethod
+    async def get_price(self, asset) -> float:
+        """
+        Fetch the current market price for the given asset.
+
+        Parameters
+        ----------
+        asset : Asset
+            The asset whose price should be fetched.
+
+        Returns
+        -------
+        float
+            The latest available price for the asset.
+        """
+        pass
+
+    @abstractmethod
+    async def get_previous_close_price(self, asset) -> float:
+        """Fetch the previous close price for the given asset."""
+        pass
+
+    async def get_prices(self, assets) -> list:
+        """
+        Fetch the current market prices of many assets concurrently.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            The assets whose prices should be fetched.
+
+        Returns
+        -------
+        list of float
+            The prices, aligned with `assets`.
+
+        Raises
+        ------
+        TypeError
+            If an asset is not of the provider's asset class.
+        ValueError
+            If a price could not be fetched. The remaining fetches are cancelled.
+        asyncio.TimeoutError
+            If a fetch exceeded the timeout. The remaining fetches are cancelled.
+        """
+        assets = list(assets)
+        validate_type(assets, self.asset_class)
+        tasks = [asyncio.ensure_future(self._fetch(asset)) for asset in assets]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def update_price(self, asset, max_age: float = None) -> None:
+        """
+        Fetch and update the price of one or many assets in-place.
+
+        Updated prices are stamped with the current time and this provider as source.
+
+        Parameters
+        ----------
+        asset : Asset or iterable of Asset
+            A single Asset instance or an iterable of Asset instances.
+        max_age : float or None, optional
+            If given, only fetch the prices that are unset or older than `max_age`
+            seconds. Defaults to fetching every price.
+
+        Raises
+        ------
+        TypeError
+            If `asset` is not an Asset or iterable of Assets.
+        ValueError
+            If a price could not be fetched. No price is updated in that case.
+        """
+        if isinstance(asset, Iterable) and not isinstance(asset, (str, bytes)):
+            assets = list(asset)
+        else:
+            assets = [asset]
+        if max_age is not None:
+            validate_type(assets, self.asset_class)
+            assets = stale_assets(assets, max_age)
+        prices = await self.get_prices(assets)
+        for a, price in zip(assets, prices):
+            a.set_price(price, source=self)
+
+    async def _fetch(self, asset):
+        async with self._semaphore():
+            price = await asyncio.wait_for(self.get_price(asset), self.timeout)
+        if price is None:
+            raise ValueError(f"Failed to fetch price for {asset}.")
+        return price
+
+    def _semaphore(self):
+        # Semaphores are bound to an event loop, so keep one per running loop.
+        loop = asyncio.get_running_loop()
+        semaphore = getattr(self, "_semaphore_by_loop", (None, None))
+        if semaphore[0] is not loop:
+            semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+            self._semaphore_by_loop = semaphore
+        return semaphore[1]
+
+
+#################################
+# SyncPriceProviderAdapter Class
+#################################
+
+class SyncPriceProviderAdapter(AsyncPriceProvider):
+    """
+    Exposes a synchronous `PriceProvider` through the `AsyncPriceProvider` interface.
+
+    The blocking calls run in an executor so that they do not stall the event loop.
+    On timeout or cancellation the awaiting coroutine returns immediately, but the
+    blocking call itself keeps running in its worker thread until it finishes.
+    """
+
+    def __init__(self, provider, executor=None, max_concurrency: int = None, timeout: float = None):
+        """
+        Wrap a synchronous provider.
+
+        Parameters
+        ----------
+        provider : PriceProvider
+            The provider to wrap.
+        executor : concurrent.futures.Executor or None, optional
+            Executor running the blocking calls. Defaults to the event loop's default executor.
+        max_concurrency : int or None, optional
+            Maximum number of concurrent fetches.
+        timeout : float or None, optional
+            Per-fetch timeout in seconds.
+        """
+        super().__init__(max_concurrency=max_concurrency, timeout=timeout)
+        self.provider = provider
+        self.executor = executor
+
+    @property
+    def asset_class(self):
+        return self.provider.asset_class
+
+    async def get_price(self, asset) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.provider.get_price, asset)
+
+    async def get_previous_close_price(self, asset) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.provider.get_previous_close_price, asset)
@@ -0,0 +1,301 @@
+# Contains the CompositePriceProvider class
+
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from assets.price_providers.price_provider import PriceProvider, stale_assets
+from assets.price_providers.async_price_provider import AsyncPriceProvider
+
+#################################
+# RoutedPrices
+#################################
+
+class RoutedPrices(NamedTuple):
+    """
+    Result of a routed batch fetch.
+
+    Attributes
+    ----------
+    prices : dict
+        Fetched price of each asset that succeeded, keyed by asset.
+    errors : dict
+        Last exception raised for each asset that failed with every provider, keyed by asset.
+    """
+    prices: dict
+    errors: dict
+
+
+#################################
+# CompositePriceProvider Class
+#################################
+
+class CompositePriceProvider(PriceProvider):
+    """
+    Routes assets of different classes to the provider registered for their class.
+
+    Each asset class has a chain of providers: a primary one followed by optional
+    fallbacks, tried in order for the assets the previous providers failed to price.
+    An asset is routed to the chain of its most specific registered class (following
+    the method resolution order). Batches are partitioned by chain in one pass, and
+    the partitions are fetched concurrently, one worker thread per partition. Each
+    provider receives its whole partition at once through `fetch_prices`, so batching
+    providers (e.g., option chains) issue as few requests as they can.
+    `AsyncPriceProvider` instances can be registered as well; they fetch their whole
+    partition concurrently on their own event loop, which runs on a worker thread
+    when the caller is itself inside a running event loop.
+
+    Attributes
+    ----------
+    providers : dict
+        Chain of providers (list) registered for each asset class.
+    """
+
+    def __init__(self, providers=None, fallbacks=None, executor=None):
+        """
+        Initialize a CompositePriceProvider.
+
+        Parameters
+        ----------
+        providers : dict or None, optional
+            Primary provider for each asset class, e.g. {Stock: stock_provider}.
+        fallbacks : dict or None, optional
+            Provider or list of fallback providers for each asset class.
+        executor : concurrent.futures.Executor or None, optional
+            Executor running the partitions. Defaults to a thread pool created per batch.
+        """
+        self.providers = {}
+        self.executor = executor
+        self._routes = {}  # concrete class -> provider chain, cached
+        fallbacks = fallbacks or {}
+        for asset_class, provider in (providers or {}).items():
+            self.register(asset_class, provider, fallbacks.get(asset_class, ()))
+
+    @property
+    def asset_class(self):
+        return tuple(self.providers)
+
+    def register(self, asset_class, provider, fallbacks=()) -> None:
+        """
+        Register the provider chain for an asset class, replacing any previous one.
+
+        Parameters
+        ----------
+        asset_class : type
+            The asset class routed to the chain (subclasses included).
+        provider : PriceProvider or AsyncPriceProvider
+            The primary provider.
+        fallbacks : provider or iterable of providers, optional
+            Providers tried in order for assets the previous ones failed to price.
+        """
+        if isinstance(fallbacks, (PriceProvider, AsyncPriceProvider)):
+            fallbacks = [fallbacks]
+        self.providers[asset_class] = [provider, *fallbacks]
+        self._routes.clear()
+
+    def unregister(self, asset_class) -> None:
+        """Remove the provider chain of an asset class."""
+        del self.providers[asset_class]
+        self._routes.clear()
+
+    def route(self, asset) -> list:
+        """
+        Return the provider chain used for an asset.
+
+        Raises
+        ------
+        TypeError
+            If no provider is registered for the asset's class.
+        """
+        cls = type(asset)
+        chain = self._routes.get(cls)
+        if chain is None:
+            chain = next((self.providers[c] for c in cls.__mro__ if c in self.providers), None)
+            if chain is None:
+                raise TypeError(f"No price provider registered for {cls.__name__}.")
+            self._routes[cls] = chain
+        return chain
+
+    def partition(self, assets) -> tuple:
+        """
+        Split assets by provider chain in one pass.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            Assets of any registered class.
+
+        Returns
+        -------
+        tuple
+            (partitions, unroutable): a list of (chain, assets) pairs in order of first
+            appearance, and a dict of TypeError keyed by the assets without provider.
+        """
+        partitions = {}
+        unroutable = {}
+        for asset in assets:
+            try:
+                chain = self.route(asset)
+            except TypeError as e:
+                unroutable[asset] = e
+                continue
+            partitions.setdefault(id(chain), (chain, []))[1].append(asset)
+        return list(partitions.values()), unroutable
+
+    def get_price(self, asset) -> float:
+        """Fetch the price of an asset, falling back along its chain on failure."""
+        return self._single(asset, "get_price")
+
+    def get_previous_close_price(self, asset) -> float:
+        """Fetch the previous close price of an asset, falling back along its chain on failure."""
+        return self._single(asset, "get_previous_close_price")
+
+    def get_prices(self, assets) -> RoutedPrices:
+        """
+        Fetch the prices of a mixed batch of assets.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            Assets of any registered class.
+
+        Returns
+        -------
+        RoutedPrices
+            The fetched prices and the per-asset errors. Failures never interrupt the batch.
+        """
+        return RoutedPrices(*self._get_prices(assets)[:2])
+
+    def _get_prices(self, assets):
+        partitions, errors = self.partition(assets)
+        prices, sources = {}, {}
+        if len(partitions) == 1:
+            results = [self._fetch_chain(*partitions[0])]
+        elif partitions:
+            if self.executor is not None:
+                results = list(self.executor.map(lambda p: self._fetch_chain(*p), partitions))
+            else:
+                with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+                    results = list(executor.map(lambda p: self._fetch_chain(*p), partitions))
+        else:
+            results = []
+        for fetched, failed, served in results:
+            prices.update(fetched)
+            errors.update(failed)
+            sources.update(served)
+        return prices, errors, sources
+
+    def update_price(self, asset, max_age: float = None) -> None:
+        """
+        Fetch and update the price of one or many assets of any registered class in-place.
+
+        Every asset that could be priced is updated, even if others failed.
+
+        Parameters
+        ----------
+        asset : Asset or iterable of Asset
+            A single Asset instance or an iterable of Asset instances.
+        max_age : float or None, optional
+            If given, only fetch the prices that are unset or older than `max_age`
+            seconds. Defaults to fetching every price.
+
+        Raises
+        ------
+        TypeError
+            If no provider is registered for a (single) asset's class.
+        ValueError
+            If some prices could not be fetched. Use `refresh` to get per-asset errors.
+        """
+        if not isinstance(asset, Iterable) or isinstance(asset, (str, bytes)):
+            if max_age is None or stale_assets(asset, max_age):
+                asset.set_price(self.get_price(asset), source=self)
+            return
+        errors = self.refresh(asset, max_age)
+        if errors:
+            first, error = next(iter(errors.items()))
+            raise ValueError(f"Failed to fetch {len(errors)} price(s), e.g. for {first}: {error}")
+
+    def refresh(self, assets, max_age: float = None) -> dict:
+        """
+        Fetch and update the prices of a mixed batch of assets in-place.
+
+        Each updated price records the provider that served it as its source.
+
+        Parameters
+        ----------
+        assets : iterable of Asset
+            Assets of any registered class.
+        max_age : float or None, optional
+            If given, only fetch the prices that are unset or older than `max_age`
+            seconds. Defaults to fetching every price.
+
+        Returns
+        -------
+        dict
+            Exception raised for each asset that could not be priced, keyed by asset.
+        """
+        if max_age is not None:
+            assets = stale_assets(assets, max_age)
+        prices, errors, sources = self._get_prices(assets)
+        for a, price in prices.items():
+            a.set_price(price, source=sources[a])
+        return errors
+
+    def _single(self, asset, method):
+        error = None
+        for provider in self.route(asset):
+            try:
+                if isinstance(provider, AsyncPriceProvider):
+                    price = _run(getattr(provider, method)(asset))
+                else:
+                    price = getattr(provider, method)(asset)
+            except Exception as e:
+                error = e
+                continue
+            if price is not None:
+                return price
+            error = ValueError(f"Failed to fetch price for {asset}.")
+        raise error
+
+    def _fetch_chain(self, chain, assets):
+        prices, errors, sources = {}, {}, {}
+        pending = assets
+        for provider in chain:
+            if not pending:
+                break
+            if isinstance(provider, AsyncPriceProvider):
+                results = _run(_gather(provider, pending))
+            else:
+                try:
+                    results = provider.fetch_prices(pending)
+                except Exception as e:
+                    results = [e] * len(pending)
+            failed = []
+            for a, result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    errors[a] = result
+                    failed.append(a)
+                else:
+                    prices[a] = result
+                    sources[a] = provider
+                    errors.pop(a, None)
+            pending = failed
+        return prices, errors, sources
+
+
+#################################
+# Helpers
+#################################
+
+def _run(coroutine):
+    """Run a coroutine to completion, on a worker thread if the caller is inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+async def _gather(provider, assets):
+    return await asyncio.gather(*(provider._fetch(a) for a in assets), return_exceptions=True)
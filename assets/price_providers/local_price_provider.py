@@ -0,0 +1,125 @@
+# Contains the LocalPriceProvider and AsyncLocalPriceProvider classes
+
+import asyncio
+import time
+from assets.core.asset import Asset
+from assets.price_providers.price_provider import PriceProvider
+from assets.price_providers.async_price_provider import AsyncPriceProvider
+
+#################################
+# Local quotes
+#################################
+
+class _LocalQuotes:
+    """Quote storage shared by the local providers."""
+
+    def _init_quotes(self, asset_class, prices, previous_close, latency):
+        self._asset_class = asset_class
+        self.prices = dict(prices or {})
+        self.previous_close = dict(previous_close or {})
+        self.latency = latency
+
+    @property
+    def asset_class(self):
+        return self._asset_class
+
+    def set_quote(self, asset, price: float, previous_close: float = None) -> None:
+        """
+        Set the price served for an asset.
+
+        Parameters
+        ----------
+        asset : Asset or str
+            The asset, or its name.
+        price : float
+            The price served by `get_price`.
+        previous_close : float or None, optional
+            The price served by `get_previous_close_price`.
+        """
+        self.prices[asset] = price
+        if previous_close is not None:
+            self.previous_close[asset] = previous_close
+
+    def _lookup(self, table, asset, label):
+        for key in (asset, asset.name):
+            if key in table:
+                return table[key]
+        raise ValueError(f"Failed to fetch {label} for {asset}: no local quote.")
+
+
+#################################
+# LocalPriceProvider Class
+#################################
+
+class LocalPriceProvider(_LocalQuotes, PriceProvider):
+    """
+    An in-process price provider serving prices from dictionaries.
+
+    Useful for tests, offline use and as a stand-in for network providers.
+    Quotes are keyed by asset or by asset name.
+    """
+
+    def __init__(self, prices=None, previous_close=None, asset_class=Asset, latency: float = 0.0):
+        """
+        Initialize a LocalPriceProvider.
+
+        Parameters
+        ----------
+        prices : dict or None, optional
+            Current prices keyed by asset or asset name.
+        previous_close : dict or None, optional
+            Previous close prices keyed by asset or asset name.
+        asset_class : type or tuple of types, optional
+            The class(es) of asset served. Defaults to every Asset.
+        latency : float, optional
+            Simulated delay in seconds for every fetch.
+        """
+        self._init_quotes(asset_class, prices, previous_close, latency)
+
+    def get_price(self, asset) -> float:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._lookup(self.prices, asset, "price")
+
+    def get_previous_close_price(self, asset) -> float:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._lookup(self.previous_close, asset, "previous close price")
+
+
+#################################
+# AsyncLocalPriceProvider Class
+#################################
+
+class AsyncLocalPriceProvider(_LocalQuotes, AsyncPriceProvider):
+    """
+    Asynchronous counterpart of `LocalPriceProvider`, whose simulated latency
+    does not block the event loop.
+    """
+
+    def __init__(self, prices=None, previous_close=None, asset_class=Asset, latency: float = 0.0,
+                 max_concurrency: int = None, timeout: float = None):
+        """
+        Initialize an AsyncLocalPriceProvider.
+
+        Parameters
+        ----------
+        prices, previous_close, asset_class, latency
+            See `LocalPriceProvider`.
+        max_concurrency : int or None, optional
+            Maximum number of concurrent fetches.
+        timeout : float or None, optional
+            Per-fetch timeout in seconds.
+        """
+        AsyncPriceProvider.__init__(self, max_concurrency=max_concurrency, timeout=timeout)
+        self._init_quotes(asset_class, prices, previous_close, latency)
+
+    async def get_price(self, asset) -> float:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._lookup(self.prices, asset, "price")
+
+    async def get_previous_close_price(self, asset) -> float:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._lookup(self.previous_close, asset, "previous close price")
@@ -0,0 +1,18 @@
+"""
+Option price providers.
+
+This submodule collects implementations of price providers that
+fetch option prices from external data sources (e.g. Yahoo Finance).
+"""
+
+from assets.price_providers.option_price_providers.yfinance_option_chain_provider import (
+    YFinanceOptionChainProvider,
+    YFinanceChainSource,
+    RecordedChainSource,
+)
+
+__all__ = [
+    "YFinanceOptionChainProvider",
+    "YFinanceChainSource",
+    "RecordedChainSource",
+]
@@ -0,0 +1,270 @@
+# Contains the YFinanceOptionChainProvider class and the chain sources it reads from
+
+import json
+import os
+import time
+from collections.abc import Iterable
+from datetime import datetime
+import numpy as np
+import yfinance as yf
+from assets.core.asset import Asset
+from assets.price_providers.price_provider import PriceProvider, stale_assets
+from assets.instruments.option import Option
+from assets.instruments.factory import create_options
+from assets.utils.validation import validate_type
+
+#################################
+# Chain sources
+#################################
+
+class YFinanceChainSource:
+    """
+    Fetches option chains from Yahoo Finance, one request per underlying and expiry.
+    """
+
+    def fetch(self, ticker: str, expiration: str) -> dict:
+        """
+        Fetch the option chain of a ticker for one expiration date.
+
+        Parameters
+        ----------
+        ticker : str
+            Ticker of the underlying.
+        expiration : str
+            Expiration date in the 'YYYY-MM-DD' format.
+
+        Returns
+        -------
+        dict
+            {'calls': columns, 'puts': columns}, where columns maps Yahoo's column
+            names (strike, lastPrice, bid, ask, change, openInterest, impliedVolatility, ...)
+            to lists of values.
+        """
+        chain = yf.Ticker(ticker).option_chain(expiration)
+        return {"calls": chain.calls.to_dict("list"), "puts": chain.puts.to_dict("list")}
+
+
+class RecordedChainSource:
+    """
+    Serves option chains recorded as JSON files, for tests and offline use.
+
+    Each file is named '<TICKER>_<YYYY-MM-DD>.json' and holds the dictionary returned
+    by `YFinanceChainSource.fetch`.
+    """
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+        directory : str or path-like
+            Directory containing the recorded chains.
+        """
+        self.directory = directory
+
+    def fetch(self, ticker: str, expiration: str) -> dict:
+        path = os.path.join(self.directory, f"{ticker}_{expiration}.json")
+        if not os.path.exists(path):
+            raise ValueError(f"No recorded option chain for {ticker} expiring {expiration}.")
+        with open(path) as f:
+            return json.load(f)
+
+    def record(self, ticker: str, expiration: str, chain: dict) -> None:
+        """Save a chain (e.g., fetched with `YFinanceChainSource`) for later replay."""
+        path = os.path.join(self.directory, f"{ticker}_{expiration}.json")
+        with open(path, "w") as f:
+            json.dump(chain, f, default=str)
+
+
+#################################
+# YFinanceOptionChainProvider Class
+#################################
+
+class YFinanceOptionChainProvider(PriceProvider):
+    """
+    An option price provider that fetches whole option chains from Yahoo Finance.
+
+    A single request returns every call and put of an underlying for one expiry.
+    `get_chain` turns it into `Option` singletons in bulk (creating the missing ones
+    and refreshing the existing ones) and sets their prices, bid/ask quotes, open
+    interest and implied volatilities. Updating many options issues one request per
+    (underlying, expiry) pair.
+    """
+
+    _COLUMNS = ("strike", "lastPrice", "bid", "ask", "openInterest", "impliedVolatility")
+
+    def __init__(self, source=None):
+        """
+        Initialize the provider.
+
+        Parameters
+        ----------
+        source : object or None, optional
+            Object with a `fetch(ticker, expiration)` method returning a chain.
+            Defaults to `YFinanceChainSource`; use `RecordedChainSource` to replay
+            recorded chains.
+        """
+        self.source = YFinanceChainSource() if source is None else source
+
+    @property
+    def asset_class(self):
+        return Option
+
+    def get_chain(self, underlying, expiration: str, multiplier: int = 100) -> list:
+        """
+        Fetch a full option chain and intern its contracts.
+
+        Parameters
+        ----------
+        underlying : Asset
+            The underlying. Its name is used as the Yahoo ticker.
+        expiration : str
+            Expiration date in the 'YYMMDD' format.
+        multiplier : int, optional
+            Contract multiplier of the options. Defaults to 100.
+
+        Returns
+        -------
+        list of Option
+            The calls followed by the puts, sorted by strike as returned by the source.
+
+        Raises
+        ------
+        ValueError
+            If the chain could not be fetched.
+        """
+        return self._fetch_chain(underlying, expiration, multiplier)[0]
+
+    def _fetch_chain(self, underlying, expiration, multiplier):
+        """Fetch and intern a chain; return its options and the prices set (NaN where not traded)."""
+        try:
+            chain = self.source.fetch(underlying.name, _iso_date(expiration))
+        except Exception as e:
+            raise ValueError(f"Failed to fetch option chain for {underlying} expiring {expiration}: {e}")
+
+        columns = {name: [] for name in self._COLUMNS}
+        option_types = []
+        for side, option_type in (("calls", "C"), ("puts", "P")):
+            rows = chain.get(side, {})
+            n = len(rows.get("strike", []))
+            for name in self._COLUMNS:
+                columns[name].extend(rows.get(name, [None] * n))
+            option_types.extend([option_type] * n)
+        if not option_types:
+            return [], np.empty(0)
+
+        values = {name: np.array([np.nan if v is None else v for v in columns[name]], dtype=float)
+                  for name in self._COLUMNS}
+        prices = np.where(values["lastPrice"] > 0, values["lastPrice"], np.nan)
+        options = create_options(underlying, values["strike"], expiration, option_types,
+                                 multiplier=multiplier)
+        priced = ~np.isnan(prices)
+        Asset.price_book.set_prices(Asset.price_book.ids(options)[priced], prices[priced] * multiplier,
+                                    time.time(), source=self)
+        quotes = zip(options, (values["bid"] * multiplier).tolist(), (values["ask"] * multiplier).tolist(),
+                     values["openInterest"].tolist(), values["impliedVolatility"].tolist())
+        for option, bid, ask, open_interest, vol in quotes:
+            option.bid = None if bid != bid else bid
+            option.ask = None if ask != ask else ask
+            option.open_interest = None if open_interest != open_interest else int(open_interest)
+            option.implied_volatility = None if vol != vol else vol
+        return options, prices * multiplier
+
+    def update_price(self, asset, max_age: float = None) -> None:
+        """
+        Fetch and update the prices of one or many options in-place.
+
+        Options are grouped by (underlying, expiry) and each group is refreshed with
+        a single chain request, which also refreshes the other contracts of the chain.
+
+        Parameters
+        ----------
+        asset : Option or iterable of Option
+            A single Option instance or an iterable of Option instances.
+        max_age : float or None, optional
+            If given, only fetch the chains of the options whose price is unset or
+            older than `max_age` seconds. Defaults to fetching every chain.
+
+        Raises
+        ------
+        TypeError
+            If an asset is not an Option.
+        ValueError
+            If a chain could not be fetched or does not quote one of the options.
+        """
+        validate_type(asset, self.asset_class)
+        options = list(asset) if isinstance(asset, Iterable) else [asset]
+        if max_age is not None:
+            options = stale_assets(options, max_age)
+        for result in self.fetch_prices(options):
+            if isinstance(result, Exception):
+                raise result
+
+    def fetch_prices(self, assets) -> list:
+        """
+        Fetch the prices of many options with one chain request per (underlying, expiry).
+
+        The fetched chains are interned and priced as with `get_chain`. Only contracts
+        priced by the chain just fetched (i.e. with a positive last price) succeed;
+        an older price left in place is not reported as fetched.
+
+        Parameters
+        ----------
+        assets : list of Option
+            The options whose prices should be fetched.
+
+        Returns
+        -------
+        list
+            Aligned with `assets`: the price of each option (multiplier included), or
+            the ValueError explaining why it could not be priced.
+        """
+        groups = {}
+        for i, option in enumerate(assets):
+            key = (id(option.underlying), option.expiration.expiration_date, option.multiplier)
+            groups.setdefault(key, []).append(i)
+        results = [None] * len(assets)
+        for rows in groups.values():
+            first = assets[rows[0]]
+            try:
+                options, prices = self._fetch_chain(first.underlying, first.expiration.expiration_date,
+                                                    first.multiplier)
+            except ValueError as e:
+                for i in rows:
+                    results[i] = e
+                continue
+            fetched = {id(o): p for o, p in zip(options, prices.tolist()) if p == p}
+            for i in rows:
+                price = fetched.get(id(assets[i]))
+                results[i] = price if price is not None else \
+                    ValueError(f"Failed to fetch price for {assets[i]}: not traded in the option chain.")
+        return results
+
+    def get_price(self, asset) -> float:
+        """
+        Fetch the latest price of one option contract (multiplier included).
+
+        The whole chain of the option is fetched and refreshed.
+        """
+        self.update_price(asset)
+        return asset.price
+
+    def get_previous_close_price(self, asset) -> float:
+        """
+        Fetch the previous close price of one option contract (multiplier included),
+        computed from Yahoo's last price and daily change.
+        """
+        try:
+            chain = self.source.fetch(asset.underlying.name, _iso_date(asset.expiration.expiration_date))
+            rows = chain["calls" if asset.option_type == "C" else "puts"]
+            i = [float(k) for k in rows["strike"]].index(float(asset.strike))
+            return (rows["lastPrice"][i] - rows["change"][i]) * asset.multiplier
+        except Exception as e:
+            raise ValueError(f"Failed to fetch previous close price for {asset}: {e}")
+
+
+#################################
+# Helpers
+#################################
+
+def _iso_date(expiration):
+    return datetime.strptime(expiration, "%y%m%d").strftime("%Y-%m-%d")
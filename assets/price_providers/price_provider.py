@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
+import numpy as np
 from assets.core.asset import Asset
 from assets.utils.validation import validate_type
 
@@ -26,10 +27,12 @@ class PriceProvider(ABC):
 
     Methods
     -------
-    update_price(asset)
+    update_price(asset, max_age=None)
         Fetch the latest price and update the asset's stored price.
     get_price(asset)
         Fetch and return the current market price for the given asset.
+    fetch_prices(assets)
+        Fetch the prices of many assets, returning per-asset prices or errors.
     get_previous_close_price(asset)
         Fetch the previous close price for the given asset.
     """
@@ -40,14 +43,19 @@ class PriceProvider(ABC):
         """The class of asset supported by this provider (e.g., Stock, Currency)."""
         pass
 
-    def update_price(self, asset) -> None:
+    def update_price(self, asset, max_age: float = None) -> None:
         """
         Fetch and update the price of one or many assets in-place.
 
+        Updated prices are stamped with the current time and this provider as source.
+
         Parameters
         ----------
         asset : Asset or iterable of Asset
             A single Asset instance or an iterable of Asset instances.
+        max_age : float or None, optional
+            If given, only fetch the prices that are unset or older than `max_age`
+            seconds (see `stale_assets`). Defaults to fetching every price.
 
         Raises
         ------
@@ -55,6 +63,8 @@ class PriceProvider(ABC):
             If `asset` is not an Asset or iterable of Assets.
         """
         validate_type(asset, self.asset_class)
+        if max_age is not None:
+            asset = stale_assets(asset, max_age)
 
         if isinstance(asset, Iterable) and not isinstance(asset, (str, bytes)):
             for a in asset:
@@ -63,7 +73,7 @@ class PriceProvider(ABC):
             price = self.get_price(asset)
             if price is None:
                 raise ValueError(f"Failed to fetch price for {asset}.")
-            asset.set_price(price)
+            asset.set_price(price, source=self)
 
     @abstractmethod
     def get_price(self, asset) -> float:
@@ -86,4 +96,69 @@ class PriceProvider(ABC):
     def get_previous_close_price(self, asset) -> float:
         """Fetch the previous close price for the given asset."""
         pass
-        
\ No newline at end of file
+
+    def fetch_prices(self, assets) -> list:
+        """
+        Fetch the current market prices of many assets without stopping at failures.
+
+        The default fetches the assets one at a time with `get_price`. Providers able
+        to price many assets with fewer requests (e.g., a whole option chain at once)
+        override it.
+
+        Parameters
+        ----------
+        assets : list of Asset
+            The assets whose prices should be fetched.
+
+        Returns
+        -------
+        list
+            Aligned with `assets`: the price of each asset, or the exception raised
+            while fetching it.
+        """
+        return [_price_or_error(self.get_price, a) for a in assets]
+        
+
+#################################
+# Helpers
+#################################
+
+def _price_or_error(fetch, asset):
+    try:
+        price = fetch(asset)
+    except Exception as e:
+        return e
+    return ValueError(f"Failed to fetch price for {asset}.") if price is None else price
+
+
+def stale_assets(asset, max_age: float, now: float = None) -> list:
+    """
+    Select the assets whose live price is unset or older than a threshold.
+
+    The check is a single vectorized comparison on `Asset.price_book`, so fresh
+    entries of large lists are skipped at negligible cost.
+
+    Parameters
+    ----------
+    asset : Asset or iterable of Asset
+        A single Asset instance or an iterable of Asset instances.
+    max_age : float
+        Maximum age in seconds of a fresh price. Prices without a known time are stale.
+    now : float or None, optional
+        Current time in seconds since the epoch. Defaults to `time.time()`.
+
+    Returns
+    -------
+    list of Asset
+        The stale assets, in input order.
+    """
+    if isinstance(asset, Iterable) and not isinstance(asset, (str, bytes)):
+        assets = list(asset)
+    else:
+        assets = [asset]
+    if not assets:
+        return assets
+    stale = Asset.price_book.stale(Asset.price_book.ids(assets), max_age, now)
+    if stale.all():
+        return assets
+    return [assets[i] for i in np.flatnonzero(stale).tolist()]
@@ -0,0 +1,337 @@
+# Contains the RefreshScheduler class
+
+import heapq
+import itertools
+import threading
+import time
+from assets.core.derivative import Derivative
+from assets.utils.validation import validate_type
+
+#################################
+# RefreshScheduler Class
+#################################
+
+class RefreshScheduler:
+    """
+    Background scheduler that keeps the prices of a watchlist of assets up to date
+    using a single PriceProvider.
+
+    Every asset in the watchlist is refreshed on its own interval. Derivatives that
+    are close to expiration and assets with large positions are polled more often.
+    Assets that are due at the same time are coalesced into batches, so that the
+    provider receives one `update_price` call per batch instead of one per asset.
+    Expired derivatives are dropped from the watchlist instead of being refreshed.
+
+    Attributes
+    ----------
+    provider : PriceProvider
+        The provider used to refresh prices.
+    default_interval : float
+        Refresh interval in seconds for assets added without an explicit interval.
+    near_expiry_days : float
+        Derivatives with fewer days to expiration than this are considered near expiry.
+    near_expiry_factor : float
+        Factor applied to the interval of derivatives near expiry.
+    large_position : float or None
+        Absolute position size from which an asset is considered a large position.
+        If None, position sizes do not affect the interval.
+    large_position_factor : float
+        Factor applied to the interval of assets with large positions.
+    batch_size : int
+        Maximum number of assets passed to the provider in one call.
+    errors : dict
+        Last exception raised while refreshing each asset, keyed by asset.
+    """
+
+    def __init__(self, provider, default_interval: float = 60.0, near_expiry_days: float = 7.0,
+                 near_expiry_factor: float = 0.25, large_position: float = None,
+                 large_position_factor: float = 0.5, batch_size: int = 50, clock=time.monotonic):
+        """
+        Initialize a RefreshScheduler.
+
+        Parameters
+        ----------
+        provider : PriceProvider
+            The provider used to refresh prices.
+        default_interval : float, optional
+            Refresh interval in seconds for assets added without an explicit interval.
+        near_expiry_days : float, optional
+            Days to expiration below which a derivative is polled more often.
+        near_expiry_factor : float, optional
+            Factor (between 0 and 1) applied to the interval of derivatives near expiry.
+        large_position : float or None, optional
+            Absolute position size from which an asset is polled more often.
+        large_position_factor : float, optional
+            Factor (between 0 and 1) applied to the interval of large positions.
+        batch_size : int, optional
+            Maximum number of assets passed to the provider in one call.
+        clock : callable, optional
+            Function returning the current time in seconds. Defaults to `time.monotonic`.
+
+        Raises
+        ------
+        ValueError
+            If an interval, a factor or the batch size is not positive.
+        """
+        if default_interval <= 0:
+            raise ValueError("'default_interval' must be positive.")
+        if not 0 < near_expiry_factor <= 1 or not 0 < large_position_factor <= 1:
+            raise ValueError("Interval factors must lie in (0, 1].")
+        if batch_size < 1:
+            raise ValueError("'batch_size' must be at least 1.")
+        self.provider = provider
+        self.default_interval = default_interval
+        self.near_expiry_days = near_expiry_days
+        self.near_expiry_factor = near_expiry_factor
+        self.large_position = large_position
+        self.large_position_factor = large_position_factor
+        self.batch_size = batch_size
+        self.errors = {}
+        self._clock = clock
+        self._entries = {}  # asset -> [interval, position, due, version]
+        self._heap = []  # (due, seq, version, asset)
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, asset) -> bool:
+        return asset in self._entries
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def watchlist(self) -> list:
+        """List of the assets currently watched by the scheduler."""
+        with self._lock:
+            return list(self._entries)
+
+    def add(self, asset, interval: float = None, position: float = 0.0) -> None:
+        """
+        Add an asset to the watchlist, or update its settings if already watched.
+
+        The asset is due for a refresh immediately.
+
+        Parameters
+        ----------
+        asset : Asset
+            The asset to watch. Must be supported by the provider.
+        interval : float or None, optional
+            Base refresh interval in seconds. Defaults to `default_interval`.
+        position : float, optional
+            Position size held in the asset, used for prioritization.
+
+        Raises
+        ------
+        TypeError
+            If the asset is not of the provider's asset class.
+        ValueError
+            If the interval is not positive.
+        """
+        validate_type(asset, self.provider.asset_class)
+        if interval is None:
+            interval = self.default_interval
+        if interval <= 0:
+            raise ValueError("'interval' must be positive.")
+        with self._lock:
+            self._schedule(asset, interval, position, self._clock())
+
+    def remove(self, asset) -> None:
+        """
+        Remove an asset from the watchlist. Does nothing if the asset is not watched.
+        """
+        with self._lock:
+            self._entries.pop(asset, None)  # stale heap entries are skipped lazily
+
+    def set_position(self, asset, position: float) -> None:
+        """
+        Update the position size held in a watched asset.
+
+        Parameters
+        ----------
+        asset : Asset
+            A watched asset.
+        position : float
+            The new position size.
+
+        Raises
+        ------
+        KeyError
+            If the asset is not in the watchlist.
+        """
+        with self._lock:
+            entry = self._entries[asset]
+            entry[1] = position
+
+    def effective_interval(self, asset) -> float:
+        """
+        Compute the refresh interval of a watched asset after prioritization.
+
+        Parameters
+        ----------
+        asset : Asset
+            A watched asset.
+
+        Returns
+        -------
+        float
+            The base interval, shortened for derivatives near expiry and for large positions.
+        """
+        interval, position = self._entries[asset][:2]
+        expiration = getattr(asset, "expiration", None)
+        if expiration is not None and expiration.days_to_expiration() <= self.near_expiry_days:
+            interval *= self.near_expiry_factor
+        if self.large_position is not None and abs(position) >= self.large_position:
+            interval *= self.large_position_factor
+        return interval
+
+    def due(self, now: float = None) -> list:
+        """
+        Return the watched assets whose refresh is due, without refreshing them.
+
+        Parameters
+        ----------
+        now : float or None, optional
+            Current time as given by the scheduler's clock. Defaults to the clock's time.
+
+        Returns
+        -------
+        list of Asset
+            The due assets, ordered by due time.
+        """
+        if now is None:
+            now = self._clock()
+        with self._lock:
+            return [asset for due, _, version, asset in sorted(self._heap)
+                    if due <= now and self._is_current(asset, version)]
+
+    def run_pending(self, now: float = None) -> int:
+        """
+        Refresh all due assets in batches and reschedule them.
+
+        Expired derivatives are removed from the watchlist instead of being refreshed.
+        If a batch fails, the exception is recorded in `errors` for each of its assets
+        and the assets are rescheduled as usual.
+
+        Parameters
+        ----------
+        now : float or None, optional
+            Current time as given by the scheduler's clock. Defaults to the clock's time.
+
+        Returns
+        -------
+        int
+            Number of assets that were successfully refreshed.
+        """
+        if now is None:
+            now = self._clock()
+        due_assets = self._pop_due(now)
+        refreshed = 0
+        for start in range(0, len(due_assets), self.batch_size):
+            batch = due_assets[start:start + self.batch_size]
+            try:
+                self.provider.update_price(batch)
+            except Exception as e:
+                for asset in batch:
+                    self.errors[asset] = e
+            else:
+                refreshed += len(batch)
+                for asset in batch:
+                    self.errors.pop(asset, None)
+        with self._lock:
+            for asset in due_assets:
+                entry = self._entries.get(asset)
+                if entry is not None:
+                    self._schedule(asset, entry[0], entry[1], now + self.effective_interval(asset))
+        return refreshed
+
+    def next_due_time(self) -> float:
+        """
+        Return the time at which the next asset becomes due, or None if the watchlist is empty.
+        """
+        with self._lock:
+            while self._heap:
+                due, _, version, asset = self._heap[0]
+                if self._is_current(asset, version):
+                    return due
+                heapq.heappop(self._heap)
+            return None
+
+    def start(self, poll_interval: float = 1.0) -> None:
+        """
+        Start refreshing in a background daemon thread.
+
+        Parameters
+        ----------
+        poll_interval : float, optional
+            Maximum time in seconds the thread sleeps between two checks for due assets.
+
+        Raises
+        ------
+        RuntimeError
+            If the scheduler is already running.
+        """
+        if self.is_running():
+            raise RuntimeError("RefreshScheduler is already running.")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(poll_interval,),
+                                        name="RefreshScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stop the background thread and wait for the batch in progress to finish.
+
+        Parameters
+        ----------
+        timeout : float or None, optional
+            Maximum time in seconds to wait for the thread to terminate.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, poll_interval):
+        while not self._stop_event.is_set():
+            self.run_pending()
+            next_due = self.next_due_time()
+            wait = poll_interval if next_due is None else min(poll_interval, max(next_due - self._clock(), 0.0))
+            self._stop_event.wait(wait)
+
+    def _schedule(self, asset, interval, position, due):
+        # Versions come from the scheduler-wide counter, so an asset removed and added
+        # again never matches the heap entries left over from before its removal.
+        version = next(self._seq)
+        self._entries[asset] = [interval, position, due, version]
+        heapq.heappush(self._heap, (due, version, version, asset))
+
+    def _is_current(self, asset, version):
+        entry = self._entries.get(asset)
+        return entry is not None and entry[3] == version
+
+    def _pop_due(self, now):
+        due_assets = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, version, asset = heapq.heappop(self._heap)
+                if not self._is_current(asset, version):
+                    continue
+                if isinstance(asset, Derivative) and asset.expiration is not None and asset.expiration.is_expired():
+                    del self._entries[asset]
+                    self.errors.pop(asset, None)
+                    continue
+                due_assets.append(asset)
+        return due_assets
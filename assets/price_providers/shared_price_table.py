@@ -0,0 +1,283 @@
+# Contains the SharedPricePublisher and SharedPriceReader classes
+
+import time
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from assets.core.asset import Asset
+
+#################################
+# Shared memory layout
+#################################
+
+# Header of int64 slots followed by the price and timestamp columns (float64, indexed by asset ID).
+_MAGIC = 0x41535354  # "ASST"
+_HEADER_SLOTS = 4
+_MAGIC_SLOT, _CAPACITY_SLOT, _SEQUENCE_SLOT, _COUNT_SLOT = range(_HEADER_SLOTS)
+
+# Names of the segments created in this process, which readers in the same process must not untrack.
+_published_names = set()
+
+
+def _views(buffer, capacity):
+    header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=buffer)
+    offset = header.nbytes
+    prices = np.ndarray((capacity,), dtype=np.float64, buffer=buffer, offset=offset)
+    timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=buffer, offset=offset + prices.nbytes)
+    return header, prices, timestamps
+
+
+#################################
+# SharedPricePublisher Class
+#################################
+
+class SharedPricePublisher:
+    """
+    Publishes the prices of `Asset.price_book` into a shared memory table.
+
+    One process refreshes prices (e.g., through a PriceProvider) and publishes them;
+    any number of `SharedPriceReader`s in other processes read them without copying
+    and without issuing their own provider calls. The table is laid out by asset ID,
+    so readers must have the same IDs for the same assets, for instance by loading
+    the same registry snapshot (see `load_registry`) in fresh processes.
+
+    Writes are guarded by a sequence lock: the sequence number is odd while a write
+    is in progress and is incremented again once it is done, so that readers can
+    detect torn reads without taking a lock. There must be a single publisher per table.
+
+    Attributes
+    ----------
+    name : str
+        Name of the shared memory segment, to be passed to readers.
+    capacity : int
+        Number of asset IDs the table can hold.
+    """
+
+    def __init__(self, capacity: int = None, name: str = None):
+        """
+        Create the shared memory table.
+
+        Parameters
+        ----------
+        capacity : int or None, optional
+            Number of asset IDs the table can hold. Defaults to the number of IDs
+            currently handed out by `Asset.price_book`.
+        name : str or None, optional
+            Name of the shared memory segment. A unique name is generated by default.
+        """
+        if capacity is None:
+            capacity = len(Asset.price_book)
+        capacity = max(int(capacity), 1)
+        size = (_HEADER_SLOTS + 2 * capacity) * 8
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _published_names.add(self._shm.name)
+        self.capacity = capacity
+        self._header, self._prices, self._timestamps = _views(self._shm.buf, capacity)
+        self._prices[:] = np.nan
+        self._timestamps[:] = np.nan
+        self._header[_CAPACITY_SLOT] = capacity
+        self._header[_SEQUENCE_SLOT] = 0
+        self._header[_COUNT_SLOT] = 0
+        self._header[_MAGIC_SLOT] = _MAGIC
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        self.unlink()
+
+    def publish(self, ids=None, timestamp: float = None) -> int:
+        """
+        Copy prices from `Asset.price_book` into the shared table.
+
+        Parameters
+        ----------
+        ids : array-like of int or None, optional
+            IDs of the assets to publish. Defaults to every ID that fits in the table.
+        timestamp : float or None, optional
+            Time of the prices in seconds since the epoch. Defaults to the current time.
+
+        Returns
+        -------
+        int
+            The new version of the table.
+
+        Raises
+        ------
+        ValueError
+            If an ID does not fit in the table.
+        """
+        book = Asset.price_book
+        if timestamp is None:
+            timestamp = time.time()
+        if ids is None:
+            count = min(len(book), self.capacity)
+            ids = slice(0, count)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            count = int(ids.max()) + 1 if ids.size else 0
+            if count > self.capacity:
+                raise ValueError(f"Asset ID {count - 1} does not fit in a table of capacity {self.capacity}.")
+        prices = book.prices[ids]
+
+        header = self._header
+        header[_SEQUENCE_SLOT] += 1  # odd: write in progress
+        self._prices[ids] = prices
+        self._timestamps[ids] = timestamp
+        header[_COUNT_SLOT] = max(int(header[_COUNT_SLOT]), count)
+        header[_SEQUENCE_SLOT] += 1  # even: consistent
+        return int(header[_SEQUENCE_SLOT]) // 2
+
+    def publish_assets(self, assets, timestamp: float = None) -> int:
+        """
+        Publish the prices of the given assets. See `publish`.
+        """
+        return self.publish(Asset.price_book.ids(assets), timestamp=timestamp)
+
+    def refresh(self, provider, assets) -> int:
+        """
+        Update the prices of the given assets with a provider and publish them.
+
+        Parameters
+        ----------
+        provider : PriceProvider
+            The provider used to fetch the prices.
+        assets : iterable of Asset
+            The assets to refresh.
+
+        Returns
+        -------
+        int
+            The new version of the table.
+        """
+        assets = list(assets)
+        provider.update_price(assets)
+        return self.publish_assets(assets)
+
+    def close(self) -> None:
+        """Release this process' mapping of the table."""
+        self._header = self._prices = self._timestamps = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment. Readers should be closed first."""
+        _published_names.discard(self._shm.name)
+        self._shm.unlink()
+
+
+#################################
+# SharedPriceReader Class
+#################################
+
+class SharedPriceReader:
+    """
+    Attaches to a table created by a `SharedPricePublisher` and reads prices from it.
+
+    `prices` and `timestamps` are zero-copy views of the shared table and may be
+    observed mid-update. `read` and `price` return consistent values by retrying
+    whenever the sequence lock reports a concurrent write.
+    """
+
+    def __init__(self, name: str):
+        """
+        Attach to an existing table.
+
+        Parameters
+        ----------
+        name : str
+            Name of the shared memory segment (see `SharedPricePublisher.name`).
+
+        Raises
+        ------
+        ValueError
+            If the segment does not hold a price table.
+        """
+        self._shm = shared_memory.SharedMemory(name=name)
+        if name not in _published_names:
+            # Attaching registers the segment with this process' resource tracker, which
+            # would destroy it when the reader exits. Only the publisher owns it.
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=self._shm.buf)
+        if header[_MAGIC_SLOT] != _MAGIC:
+            del header
+            self._shm.close()
+            raise ValueError(f"Shared memory segment '{name}' does not hold a price table.")
+        self._header, self._prices, self._timestamps = _views(self._shm.buf, int(header[_CAPACITY_SLOT]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Zero-copy view of the published prices, indexed by asset ID. NaN marks unset prices."""
+        return self._prices[:int(self._header[_COUNT_SLOT])]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Zero-copy view of the publication times, indexed by asset ID."""
+        return self._timestamps[:int(self._header[_COUNT_SLOT])]
+
+    @property
+    def version(self) -> int:
+        """Number of completed publications. Changes whenever the table is updated."""
+        return int(self._header[_SEQUENCE_SLOT]) // 2
+
+    def read(self, ids=None, max_retries: int = 1000) -> tuple:
+        """
+        Return a consistent copy of the published prices and timestamps.
+
+        Parameters
+        ----------
+        ids : array-like of int or None, optional
+            Asset IDs to read. Defaults to every published ID.
+        max_retries : int, optional
+            Maximum number of attempts while the publisher keeps writing.
+
+        Returns
+        -------
+        tuple
+            (prices, timestamps, version), where prices and timestamps are arrays
+            aligned with `ids`.
+
+        Raises
+        ------
+        TimeoutError
+            If no consistent read succeeded within `max_retries` attempts.
+        """
+        header = self._header
+        if ids is not None:
+            ids = np.asarray(ids, dtype=np.int64)
+        for _ in range(max_retries):
+            start = int(header[_SEQUENCE_SLOT])
+            if start % 2:
+                time.sleep(0)
+                continue
+            if ids is None:
+                count = int(header[_COUNT_SLOT])
+                prices, timestamps = self._prices[:count].copy(), self._timestamps[:count].copy()
+            else:
+                prices, timestamps = self._prices[ids], self._timestamps[ids]
+            if int(header[_SEQUENCE_SLOT]) == start:
+                return prices, timestamps, start // 2
+        raise TimeoutError("Could not obtain a consistent read of the shared price table.")
+
+    def price(self, asset) -> float:
+        """
+        Return the published price of an asset or asset ID, or None if it is unset.
+        """
+        asset_id = asset if isinstance(asset, (int, np.integer)) else asset.id
+        prices, _, _ = self.read([asset_id])
+        price = prices[0]
+        return None if price != price else float(price)
+
+    def close(self) -> None:
+        """Detach from the table."""
+        self._header = self._prices = self._timestamps = None
+        self._shm.close()
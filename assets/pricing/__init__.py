@@ -0,0 +1,30 @@
+"""
+Pricing models for the instruments of the package.
+
+Provides vectorized closed-form models operating on NumPy arrays, and
+functions applying them to collections of instruments.
+"""
+
+from .curve import RateCurve, FuturesFairValue, futures_fair_value, rates_for
+from .black76 import (Black76Greeks, OptionValuation, black76_price, black76_greeks, carry_factor,
+                      value_options, aggregate_by_underlying)
+from .vol_surface import VolSurface
+from .fx import FXSnapshot, PortfolioValuation, value_portfolio
+
+__all__ = [
+    "RateCurve",
+    "FuturesFairValue",
+    "futures_fair_value",
+    "rates_for",
+    "Black76Greeks",
+    "OptionValuation",
+    "black76_price",
+    "black76_greeks",
+    "carry_factor",
+    "value_options",
+    "aggregate_by_underlying",
+    "VolSurface",
+    "FXSnapshot",
+    "PortfolioValuation",
+    "value_portfolio",
+]
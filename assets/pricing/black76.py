@@ -0,0 +1,274 @@
+# Contains the Black-76 model and its application to Option instances
+
+from typing import NamedTuple
+import numpy as np
+from scipy.special import ndtr
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.pricing.curve import rates_for
+
+#################################
+# Black-76 formulas
+#################################
+
+class Black76Greeks(NamedTuple):
+    """
+    Black-76 price and sensitivities per unit of the underlying forward.
+
+    Attributes
+    ----------
+    price : numpy.ndarray
+        Option price.
+    delta : numpy.ndarray
+        Derivative of the price with respect to the forward price F.
+    gamma : numpy.ndarray
+        Second derivative of the price with respect to F.
+    vega : numpy.ndarray
+        Derivative of the price with respect to the volatility.
+    theta : numpy.ndarray
+        Derivative of the price with respect to calendar time (per year), i.e. -dP/dT.
+    """
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+
+
+def black76_price(F, K, T, sigma, r=0.0, option_type="C") -> np.ndarray:
+    """
+    Black-76 price of European options on a forward or futures price.
+
+    All parameters broadcast against each other.
+
+    Parameters
+    ----------
+    F : float or array-like
+        Forward (futures) price.
+    K : float or array-like
+        Strike price.
+    T : float or array-like
+        Time to expiration in years. Non-positive times give the intrinsic value.
+    sigma : float or array-like
+        Volatility of the forward price. Non-positive volatilities give the discounted intrinsic value.
+    r : float or array-like, optional
+        Continuously compounded risk-free rate used for discounting.
+    option_type : str or array-like of str, optional
+        'C' for calls and 'P' for puts.
+
+    Returns
+    -------
+    numpy.ndarray
+        The option prices.
+    """
+    return black76_greeks(F, K, T, sigma, r, option_type).price
+
+
+def black76_greeks(F, K, T, sigma, r=0.0, option_type="C") -> Black76Greeks:
+    """
+    Black-76 price, delta, gamma, vega and theta of European options on a forward price.
+
+    See `black76_price` for the parameters.
+
+    Returns
+    -------
+    Black76Greeks
+        Arrays of price and sensitivities.
+    """
+    F, K, T, sigma, r = (np.asarray(x, dtype=float) for x in (F, K, T, sigma, r))
+    is_call = np.char.upper(np.asarray(option_type, dtype=str)) == "C"
+    sign = np.where(is_call, 1.0, -1.0)
+    T_pos = np.maximum(T, 0.0)
+    discount = np.exp(-r * T_pos)
+    vol_sqrt_t = sigma * np.sqrt(T_pos)
+    live = vol_sqrt_t > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_vol = np.where(live, vol_sqrt_t, 1.0)
+        d1 = (np.log(F / K) + 0.5 * vol_sqrt_t ** 2) / safe_vol
+        d2 = d1 - vol_sqrt_t
+        pdf = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+        cdf1, cdf2 = ndtr(sign * d1), ndtr(sign * d2)
+
+        price = np.where(live, discount * sign * (F * cdf1 - K * cdf2), discount * np.maximum(sign * (F - K), 0.0))
+        delta = np.where(live, discount * sign * cdf1, discount * sign * (sign * (F - K) > 0))
+        gamma = np.where(live, discount * pdf / (F * safe_vol), 0.0)
+        vega = np.where(live, discount * F * pdf * np.sqrt(T_pos), 0.0)
+        theta = np.where(live, r * price - discount * F * pdf * sigma / (2 * np.sqrt(np.where(T_pos > 0, T_pos, 1.0))),
+                         r * price)
+    return Black76Greeks(price, delta, gamma, vega, theta)
+
+
+#################################
+# Option valuation
+#################################
+
+class OptionValuation(NamedTuple):
+    """
+    Values and risk of Option instances, aligned with the valued options.
+
+    Attributes
+    ----------
+    price : numpy.ndarray
+        Value of one option contract (multiplier included).
+    forward : numpy.ndarray
+        Forward price used in Black-76: the futures price for options on futures,
+        the carried spot price otherwise.
+    underlying_delta : numpy.ndarray
+        Derivative of the contract value with respect to the price of the option's
+        direct underlying.
+    futures_equivalent : numpy.ndarray
+        For options on futures, `underlying_delta` expressed in futures contracts
+        (divided by the futures' contract size). NaN for options on spot.
+    delta : numpy.ndarray
+        Derivative of the contract value with respect to the price of the true underlying.
+    gamma : numpy.ndarray
+        Second derivative of the contract value with respect to the price of the true underlying.
+    true_underlyings : list of Asset
+        True underlying of each option.
+    """
+    price: np.ndarray
+    forward: np.ndarray
+    underlying_delta: np.ndarray
+    futures_equivalent: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    true_underlyings: list
+
+
+def carry_factor(asset, carry=0.0) -> float:
+    """
+    Derivative of the asset's price with respect to the price of its true underlying.
+
+    Futures prices follow the cost-of-carry relation F = S * exp(carry * T), so each
+    futures contract in the chain contributes a factor exp(carry * T). Spot assets
+    contribute a factor 1.
+
+    Parameters
+    ----------
+    asset : Asset
+        A spot asset or a (chain of) futures contract(s).
+    carry : float or RateCurve, optional
+        Cost-of-carry rate (risk-free rate minus yield) of the futures chain. A curve
+        is read at each contract's time to expiration.
+
+    Returns
+    -------
+    float
+        The chain-rule factor dPrice/dS.
+
+    Raises
+    ------
+    TypeError
+        If the chain contains a derivative other than Futures.
+    """
+    factor = 1.0
+    while hasattr(asset, "underlying"):
+        if not isinstance(asset, Futures):
+            raise TypeError(f"Cannot carry {asset.asset_type()} prices to the true underlying; only Futures chains are supported.")
+        T = max(asset.expiration.T, 0.0)
+        factor *= float(np.exp(rates_for(carry, T) * T))
+        asset = asset.underlying
+    return factor
+
+
+def value_options(options, sigma, r=0.0, carry=None) -> OptionValuation:
+    """
+    Value options and compute their risk with respect to the true underlying.
+
+    Options whose underlying is a `Futures` contract are valued with Black-76 on the
+    futures price. Options on spot assets are valued with Black-76 on the carried
+    spot S * exp(carry * T), which is the Black-Scholes price. Delta and gamma are
+    then rolled back to the true underlying through the chain rule, using
+    cost-of-carry for every futures contract in the chain.
+
+    Parameters
+    ----------
+    options : iterable of Option
+        The options to value. Their direct underlyings must have a price.
+    sigma : float or array-like
+        Volatility of each option's direct underlying.
+    r : float or RateCurve, optional
+        Risk-free rate used for discounting. A curve is read at each option's time to expiration.
+    carry : float, RateCurve or None, optional
+        Cost-of-carry rate used to carry spot prices forward. Defaults to `r`.
+
+    Returns
+    -------
+    OptionValuation
+        Values and risk arrays aligned with `options`.
+
+    Raises
+    ------
+    TypeError
+        If an element is not an Option or an underlying chain contains derivatives other than Futures.
+    ValueError
+        If the price of a direct underlying is not set.
+    """
+    options = list(options)
+    if carry is None:
+        carry = r
+    for option in options:
+        if not isinstance(option, Option):
+            raise TypeError(f"Expected Option, got {type(option).__name__} instead.")
+    missing = [o.underlying for o in options if o.underlying.price is None]
+    if missing:
+        raise ValueError(f"Underlying price is not set for {missing[0]}. Cannot value {len(missing)} option(s).")
+
+    on_futures = np.array([isinstance(o.underlying, Futures) for o in options], dtype=bool)
+    S = np.array([o.underlying.price for o in options], dtype=float)
+    K = np.array([o.strike for o in options], dtype=float)
+    T = np.array([o.expiration.T for o in options], dtype=float)
+    m = np.array([o.multiplier for o in options], dtype=float)
+    option_types = [o.option_type for o in options]
+    contract_size = np.array([o.underlying.contract_size if f else np.nan for o, f in zip(options, on_futures)])
+    chain = np.array([carry_factor(o.underlying, carry) for o in options], dtype=float)
+
+    # Spot underlyings are carried to the option's expiration; futures prices are forwards already.
+    T_pos = np.maximum(T, 0.0)
+    spot_to_forward = np.where(on_futures, 1.0, np.exp(rates_for(carry, T_pos) * T_pos))
+    F = S * spot_to_forward
+    greeks = black76_greeks(F, K, T, sigma, rates_for(r, T_pos), option_types)
+
+    underlying_delta = m * greeks.delta * spot_to_forward
+    underlying_gamma = m * greeks.gamma * spot_to_forward ** 2
+    return OptionValuation(
+        price=m * greeks.price,
+        forward=F,
+        underlying_delta=underlying_delta,
+        futures_equivalent=np.where(on_futures, underlying_delta / contract_size, np.nan),
+        delta=underlying_delta * chain,
+        gamma=underlying_gamma * chain ** 2,
+        true_underlyings=[o.get_true_underlying() for o in options],
+    )
+
+
+def aggregate_by_underlying(true_underlyings, delta, gamma, quantities=None) -> dict:
+    """
+    Sum position deltas and gammas per true underlying.
+
+    Parameters
+    ----------
+    true_underlyings : list of Asset
+        True underlying of each position (e.g., `OptionValuation.true_underlyings`).
+    delta, gamma : array-like
+        Per-contract delta and gamma with respect to the true underlying.
+    quantities : array-like or None, optional
+        Number of contracts held in each position. Defaults to one contract each.
+
+    Returns
+    -------
+    dict
+        Maps each true underlying to a tuple (delta, gamma) of the aggregated position.
+    """
+    delta, gamma = np.asarray(delta, dtype=float), np.asarray(gamma, dtype=float)
+    if quantities is not None:
+        quantities = np.asarray(quantities, dtype=float)
+        delta, gamma = delta * quantities, gamma * quantities
+    keys = {}
+    codes = np.fromiter((keys.setdefault(id(u), len(keys)) for u in true_underlyings), dtype=np.int64,
+                        count=len(true_underlyings))
+    by_code = {code: u for u, code in zip(true_underlyings, codes.tolist())}
+    total_delta = np.bincount(codes, weights=delta, minlength=len(keys))
+    total_gamma = np.bincount(codes, weights=gamma, minlength=len(keys))
+    return {by_code[i]: (float(total_delta[i]), float(total_gamma[i])) for i in range(len(keys))}
@@ -0,0 +1,251 @@
+# Contains the RateCurve class and futures fair-value functions
+
+from typing import NamedTuple
+import numpy as np
+from assets.instruments.futures import Futures
+
+#################################
+# RateCurve Class
+#################################
+
+class RateCurve:
+    """
+    Term structure of continuously compounded zero rates.
+
+    Can be used as a discount curve (risk-free rates) or as a carry curve
+    (e.g., dividend yields or convenience yields). All methods are vectorized
+    over arrays of times.
+
+    Attributes
+    ----------
+    tenors : numpy.ndarray
+        Pillar times in years, sorted in increasing order.
+    zero_rates : numpy.ndarray
+        Zero rates at the pillars.
+    interpolation : str
+        'linear' interpolates zero rates linearly between pillars. 'log_linear'
+        interpolates log discount factors linearly, i.e. uses piecewise-constant
+        forward rates. Zero rates are held flat outside the pillars in both cases.
+    """
+
+    def __init__(self, tenors, zero_rates=None, discount_factors=None, interpolation: str = "linear"):
+        """
+        Initialize a RateCurve from zero rates or discount factors.
+
+        Parameters
+        ----------
+        tenors : array-like of float
+            Positive pillar times in years.
+        zero_rates : array-like of float, optional
+            Zero rates at the pillars.
+        discount_factors : array-like of float, optional
+            Discount factors at the pillars. Exactly one of `zero_rates` and
+            `discount_factors` must be given.
+        interpolation : str, optional
+            'linear' (default) or 'log_linear'.
+
+        Raises
+        ------
+        ValueError
+            If the inputs are inconsistent or the tenors are not positive.
+        """
+        if (zero_rates is None) == (discount_factors is None):
+            raise ValueError("Exactly one of 'zero_rates' and 'discount_factors' must be given.")
+        if interpolation not in ("linear", "log_linear"):
+            raise ValueError(f"Invalid interpolation: {interpolation}. Allowed values are 'linear' or 'log_linear'.")
+        tenors = np.atleast_1d(np.asarray(tenors, dtype=float))
+        if zero_rates is None:
+            zero_rates = -np.log(np.atleast_1d(np.asarray(discount_factors, dtype=float))) / tenors
+        zero_rates = np.atleast_1d(np.asarray(zero_rates, dtype=float))
+        if tenors.shape != zero_rates.shape or tenors.ndim != 1 or not len(tenors):
+            raise ValueError("Tenors and rates must be one-dimensional arrays of the same, non-zero length.")
+        if (tenors <= 0).any():
+            raise ValueError("Tenors must be positive.")
+        order = np.argsort(tenors)
+        self.tenors = tenors[order]
+        self.zero_rates = zero_rates[order]
+        self.interpolation = interpolation
+        self._log_dfs = np.concatenate(([0.0], -self.zero_rates * self.tenors))
+        self._log_df_tenors = np.concatenate(([0.0], self.tenors))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(tenors={self.tenors.tolist()}, zero_rates={self.zero_rates.tolist()})"
+
+    @classmethod
+    def flat(cls, rate: float) -> "RateCurve":
+        """
+        Create a curve with the same zero rate for every tenor.
+        """
+        return cls([1.0], [rate])
+
+    def zero_rate(self, T) -> np.ndarray:
+        """
+        Interpolate zero rates.
+
+        Parameters
+        ----------
+        T : float or array-like
+            Times in years.
+
+        Returns
+        -------
+        numpy.ndarray
+            Continuously compounded zero rates.
+        """
+        T = np.asarray(T, dtype=float)
+        if self.interpolation == "linear":
+            return np.interp(T, self.tenors, self.zero_rates)
+        inside = (T > 0) & (T < self.tenors[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_linear = -np.interp(T, self._log_df_tenors, self._log_dfs) / T
+        flat = np.where(T <= 0, self.zero_rates[0], self.zero_rates[-1])
+        return np.where(inside, log_linear, flat)
+
+    def discount_factor(self, T) -> np.ndarray:
+        """
+        Discount factors exp(-z(T) * T) for times `T` in years.
+        """
+        T = np.asarray(T, dtype=float)
+        return np.exp(-self.zero_rate(T) * T)
+
+    def forward_rate(self, T1, T2) -> np.ndarray:
+        """
+        Continuously compounded forward rates between times `T1` and `T2` (T2 > T1).
+        """
+        T1, T2 = np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        return (self.zero_rate(T2) * T2 - self.zero_rate(T1) * T1) / (T2 - T1)
+
+    def discount(self, values, T) -> np.ndarray:
+        """
+        Discount values paid at times `T` to today.
+
+        Parameters
+        ----------
+        values : float or array-like
+            Values paid at the given times (e.g., expected option payoffs).
+        T : float or array-like
+            Payment times in years.
+
+        Returns
+        -------
+        numpy.ndarray
+            Present values.
+        """
+        return np.asarray(values, dtype=float) * self.discount_factor(T)
+
+    def forward_price(self, spot, T, yield_curve: "RateCurve" = None) -> np.ndarray:
+        """
+        Cost-of-carry forward prices S * exp((r(T) - q(T)) * T).
+
+        Parameters
+        ----------
+        spot : float or array-like
+            Spot prices.
+        T : float or array-like
+            Times to delivery in years.
+        yield_curve : RateCurve or None, optional
+            Curve of yields earned by holding the spot asset (dividends, convenience yield,
+            foreign rates). Defaults to no yield.
+
+        Returns
+        -------
+        numpy.ndarray
+            Fair forward prices.
+        """
+        spot = np.asarray(spot, dtype=float)
+        carry = self.discount_factor(T) if yield_curve is None else self.discount_factor(T) / yield_curve.discount_factor(T)
+        return spot / carry
+
+
+def rates_for(rate, T) -> np.ndarray:
+    """
+    Return the rate for each time in `T`, reading zero rates from a curve if needed.
+
+    Parameters
+    ----------
+    rate : float, array-like or RateCurve
+        A constant rate, rates aligned with `T`, or a curve.
+    T : float or array-like
+        Times in years.
+
+    Returns
+    -------
+    numpy.ndarray
+        Rates broadcast to the shape of `T`.
+    """
+    T = np.asarray(T, dtype=float)
+    if isinstance(rate, RateCurve):
+        return rate.zero_rate(T)
+    return np.broadcast_to(np.asarray(rate, dtype=float), T.shape)
+
+
+#################################
+# Futures fair values
+#################################
+
+class FuturesFairValue(NamedTuple):
+    """
+    Cost-of-carry fair values of futures contracts, aligned with the contracts.
+
+    Attributes
+    ----------
+    T : numpy.ndarray
+        Times to expiration in years.
+    spot : numpy.ndarray
+        Prices of the underlyings.
+    fair_forward : numpy.ndarray
+        Fair futures prices.
+    market : numpy.ndarray
+        Market prices of the contracts (NaN where not set).
+    basis : numpy.ndarray
+        Market price minus fair futures price.
+    value : numpy.ndarray
+        Fair value of one contract: contract_size * (fair_forward - forward_price).
+    """
+    T: np.ndarray
+    spot: np.ndarray
+    fair_forward: np.ndarray
+    market: np.ndarray
+    basis: np.ndarray
+    value: np.ndarray
+
+
+def futures_fair_value(futures, rate_curve: RateCurve, yield_curve: RateCurve = None) -> FuturesFairValue:
+    """
+    Compute fair futures prices, basis and contract values for a strip of futures.
+
+    Parameters
+    ----------
+    futures : iterable of Futures
+        The contracts. Their underlyings must have a price.
+    rate_curve : RateCurve
+        Risk-free curve used to carry the spot prices.
+    yield_curve : RateCurve or None, optional
+        Yield earned on the underlyings. Defaults to no yield.
+
+    Returns
+    -------
+    FuturesFairValue
+        Arrays aligned with `futures`.
+
+    Raises
+    ------
+    TypeError
+        If an element is not a Futures contract.
+    ValueError
+        If the price of an underlying is not set.
+    """
+    futures = list(futures)
+    for f in futures:
+        if not isinstance(f, Futures):
+            raise TypeError(f"Expected Futures, got {type(f).__name__} instead.")
+    missing = [f.underlying for f in futures if f.underlying.price is None]
+    if missing:
+        raise ValueError(f"Underlying price is not set for {missing[0]}. Cannot compute fair values.")
+    T = np.maximum(np.array([f.expiration.T for f in futures], dtype=float), 0.0)
+    spot = np.array([f.underlying.price for f in futures], dtype=float)
+    market = np.array([np.nan if f.price is None else f.price for f in futures], dtype=float)
+    forward_price = np.array([f.forward_price for f in futures], dtype=float)
+    contract_size = np.array([f.contract_size for f in futures], dtype=float)
+    fair = rate_curve.forward_price(spot, T, yield_curve)
+    return FuturesFairValue(T, spot, fair, market, market - fair, contract_size * (fair - forward_price))
@@ -0,0 +1,221 @@
+# Contains the FXSnapshot class and multi-currency portfolio valuation
+
+from typing import NamedTuple
+import numpy as np
+from assets.core.asset import Asset
+from assets.core.valuation_context import ValuationContext
+from assets.instruments.currency import Currency
+from assets.instruments.futures import Futures
+
+#################################
+# FXSnapshot Class
+#################################
+
+class FXSnapshot:
+    """
+    Exchange rates frozen at a point in time, for consistent conversions within a run.
+
+    Rates are read once, from the prices of registered `Currency` assets (USD per unit
+    of the currency), and never change afterwards, so every position converted with
+    the same snapshot uses the same rates even if prices are updated meanwhile.
+
+    Attributes
+    ----------
+    codes : list of str
+        Codes of the currencies in the snapshot, USD included.
+    usd_rates : numpy.ndarray
+        USD per unit of each currency, aligned with `codes`. NaN marks missing rates.
+    """
+
+    def __init__(self, currencies=None, rates=None):
+        """
+        Take a snapshot of exchange rates.
+
+        Parameters
+        ----------
+        currencies : iterable of Currency or str, optional
+            Currencies to read the rates of. Defaults to every registered Currency.
+            Codes are looked up in the registry, never created. Rates are read
+            through `Asset.price`, hence from the active `ValuationContext` if any.
+        rates : dict or None, optional
+            Rates (USD per unit) keyed by currency code, overriding the registry.
+
+        Raises
+        ------
+        ValueError
+            If a code is neither USD, a registered Currency nor a key of `rates`.
+        """
+        rates = {code.upper(): float(rate) for code, rate in (rates or {}).items()}
+        if currencies is None:
+            currencies = [a for a in Asset._assets.values() if isinstance(a, Currency)]
+        assets = []
+        for currency in currencies:
+            if not isinstance(currency, str):
+                assets.append(currency)
+                continue
+            code = Currency._make_name(currency)
+            if code == "USD" or code in rates:
+                continue
+            asset = Asset._assets.get(Asset._registry_key(Currency, code))
+            if asset is None:
+                raise ValueError(f"Unknown currency: {code}. No Currency is registered under this code.")
+            assets.append(asset)
+        context = ValuationContext.current()
+        if context is not None:
+            prices = context.get_prices(assets)
+        else:
+            prices = Asset.price_book.get_prices(Asset.price_book.ids(assets))
+        table = dict(zip((a.name for a in assets), prices.tolist()))
+        table.update(rates)
+        table["USD"] = 1.0
+        self.codes = list(table)
+        self.usd_rates = np.array(list(table.values()), dtype=float)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(self.codes)})"
+
+    def __contains__(self, code: str) -> bool:
+        return code.upper() in self._index
+
+    def usd_rate(self, code: str) -> float:
+        """
+        Return the USD value of one unit of a currency.
+
+        Raises
+        ------
+        ValueError
+            If the currency is not in the snapshot or has no rate.
+        """
+        return float(self.factors([code], "USD")[0])
+
+    def rate(self, base: str, quote: str) -> float:
+        """Return the number of units of `quote` worth one unit of `base`."""
+        return float(self.factors([base], quote)[0])
+
+    def factors(self, codes, reporting: str = "USD") -> np.ndarray:
+        """
+        Return the factors converting amounts in the given currencies to `reporting`.
+
+        Parameters
+        ----------
+        codes : array-like of str
+            Currency codes.
+        reporting : str, optional
+            Code of the reporting currency. Defaults to 'USD'.
+
+        Returns
+        -------
+        numpy.ndarray
+            Factors aligned with `codes`.
+
+        Raises
+        ------
+        ValueError
+            If a currency is not in the snapshot or has no rate.
+        """
+        unique, inverse = np.unique(np.asarray(codes, dtype=str), return_inverse=True)
+        positions = [self._position(code) for code in unique.tolist()]
+        factors = self.usd_rates[positions] / self.usd_rates[self._position(reporting)]
+        return factors[inverse.reshape(-1)]
+
+    def _position(self, code):
+        i = self._index.get(code.upper())
+        if i is None or self.usd_rates[i] != self.usd_rates[i]:
+            raise ValueError(f"No exchange rate for {code.upper()} in the FX snapshot.")
+        return i
+
+
+#################################
+# Portfolio valuation
+#################################
+
+class PortfolioValuation(NamedTuple):
+    """
+    Values of positions converted to a reporting currency.
+
+    Attributes
+    ----------
+    reporting : str
+        Code of the reporting currency.
+    values : numpy.ndarray
+        Value of each position in the reporting currency.
+    local_values : numpy.ndarray
+        Value of each position in its own currency (quantity * price, times the
+        contract size for Futures, as in `RiskEngine`).
+    currencies : numpy.ndarray
+        Currency code of each position.
+    by_currency : dict
+        Total value in the reporting currency of the positions of each currency.
+    total : float
+        Total value in the reporting currency.
+    fx : FXSnapshot
+        The rates used for the conversion.
+    """
+    reporting: str
+    values: np.ndarray
+    local_values: np.ndarray
+    currencies: np.ndarray
+    by_currency: dict
+    total: float
+    fx: FXSnapshot
+
+
+def value_portfolio(positions, reporting: str = "USD", fx: FXSnapshot = None) -> PortfolioValuation:
+    """
+    Value positions in many currencies and convert them to a reporting currency.
+
+    Prices are read in one batch from `Asset.price_book` (or from the active
+    `ValuationContext`). Positions are grouped by currency code, and every group is
+    converted with a single factor from one FX snapshot, so the conversion is one
+    vectorized step whatever the number of positions.
+
+    Parameters
+    ----------
+    positions : dict or iterable of (Asset, float)
+        Assets and the quantities held. Each asset is denominated in its `currency`
+        (USD if None).
+    reporting : Currency or str, optional
+        Reporting currency. Defaults to 'USD'.
+    fx : FXSnapshot or None, optional
+        Rates to convert with. Pass the same snapshot to all valuations of a run to
+        keep them consistent. Defaults to a snapshot of the currencies involved.
+
+    Returns
+    -------
+    PortfolioValuation
+        Values aligned with `positions`.
+
+    Raises
+    ------
+    ValueError
+        If a price or an exchange rate is not set.
+    """
+    items = list(positions.items()) if isinstance(positions, dict) else [tuple(p) for p in positions]
+    assets = [asset for asset, _ in items]
+    quantities = np.array([q for _, q in items], dtype=float)
+    reporting = reporting.name if isinstance(reporting, Currency) else reporting.upper()
+
+    context = ValuationContext.current()
+    if context is not None:
+        prices = context.get_prices(assets)
+    else:
+        prices = Asset.price_book.get_prices(Asset.price_book.ids(assets))
+    missing = np.flatnonzero(np.isnan(prices))
+    if len(missing):
+        raise ValueError(f"Price is not set for {assets[missing[0]]}. Cannot value {len(missing)} position(s).")
+
+    currencies = [asset.currency for asset in assets]
+    codes = np.array(["USD" if c is None else c.name for c in currencies], dtype=str)
+    unique, inverse = np.unique(codes, return_inverse=True)
+    if fx is None:
+        involved = {c.name: c for c in currencies if c is not None}
+        fx = FXSnapshot(list(involved.values()) + [reporting])
+    factors = fx.factors(unique, reporting)
+
+    scale = np.array([a.contract_size if isinstance(a, Futures) else 1.0 for a in assets], dtype=float)
+    local_values = quantities * scale * prices
+    values = local_values * factors[inverse]
+    totals = np.bincount(inverse, weights=values, minlength=len(unique))
+    return PortfolioValuation(reporting, values, local_values, codes, dict(zip(unique.tolist(), totals.tolist())),
+                              float(values.sum()), fx)
@@ -0,0 +1,237 @@
+# Contains the VolSurface class
+
+import numpy as np
+from assets.instruments.option import Option
+from assets.utils.expiration_date import ExpirationDate
+
+#################################
+# VolSurface Class
+#################################
+
+class VolSurface:
+    """
+    Implied volatility surface built from options on a single underlying.
+
+    Quotes are grouped into one slice per expiration date. Within a slice, volatility
+    is interpolated linearly in strike (or moneyness) and held flat beyond the outermost
+    quotes. Across expirations, total variance (vol² * T) is interpolated linearly in T
+    and volatility is held flat before the first and after the last expiration.
+
+    Quotes are keyed by strike, which identifies each option. With `by='moneyness'`,
+    lookups are given in moneyness and converted to strikes with the underlying's
+    current price, so quotes stay in place when the spot moves.
+
+    Interpolation coefficients are computed once per slice when the surface is built,
+    and only the slices touched by `update` are recomputed. Lookups are vectorized over
+    arrays of points.
+
+    Attributes
+    ----------
+    underlying : Asset
+        The common underlying of the options.
+    by : str
+        Either 'strike' or 'moneyness' (strike divided by the underlying price).
+    """
+
+    def __init__(self, options, vols, by: str = "strike"):
+        """
+        Build a VolSurface.
+
+        Parameters
+        ----------
+        options : iterable of Option
+            Options on a single underlying.
+        vols : array-like of float
+            Implied volatility of each option.
+        by : str, optional
+            Coordinate of the points passed to `vol`: 'strike' (default) or 'moneyness'.
+            Moneyness is converted with the underlying's price at lookup time.
+
+        Raises
+        ------
+        ValueError
+            If `by` is invalid, if the options have different underlyings, or if
+            `options` and `vols` have different lengths.
+        """
+        if by not in ("strike", "moneyness"):
+            raise ValueError(f"Invalid coordinate: {by}. Allowed values are 'strike' or 'moneyness'.")
+        self.by = by
+        self.underlying = None
+        self._quotes = {}  # expiration date -> {strike: vol}
+        self._times = {}  # expiration date -> time to expiration
+        self._slices = {}  # expiration date -> (strikes, vols, slopes)
+        self._T = np.empty(0)
+        self._order = []
+        self.update(options, vols)
+
+    def __len__(self) -> int:
+        """Number of quotes in the surface."""
+        return sum(len(q) for q in self._quotes.values())
+
+    @property
+    def expirations(self) -> list:
+        """Expiration dates of the slices, sorted by time to expiration."""
+        return list(self._order)
+
+    def update(self, options, vols) -> None:
+        """
+        Add or replace quotes and rebuild the affected slices only.
+
+        Parameters
+        ----------
+        options : iterable of Option
+            Options on the surface's underlying.
+        vols : array-like of float
+            Implied volatility of each option. NaN removes the option's quote.
+
+        Raises
+        ------
+        ValueError
+            If an option has a different underlying, or if the lengths differ.
+        """
+        options = list(options)
+        vols = np.asarray(vols, dtype=float).reshape(-1)
+        if len(options) != len(vols):
+            raise ValueError(f"Got {len(options)} options but {len(vols)} volatilities.")
+        dirty = set()
+        for option, vol in zip(options, vols.tolist()):
+            if not isinstance(option, Option):
+                raise TypeError(f"Expected Option, got {type(option).__name__} instead.")
+            if self.underlying is None:
+                self.underlying = option.underlying
+            elif option.underlying is not self.underlying:
+                raise ValueError(f"{option} is not written on {self.underlying}.")
+            date = option.expiration.expiration_date
+            quotes = self._quotes.setdefault(date, {})
+            self._times.setdefault(date, option.expiration.T)
+            x = float(option.strike)
+            if vol != vol:
+                quotes.pop(x, None)
+            else:
+                quotes[x] = vol
+            dirty.add(date)
+        for date in dirty:
+            self._compile_slice(date)
+        self._compile_times()
+
+    def refresh_times(self, options=None) -> None:
+        """
+        Recompute the time to expiration of every slice.
+
+        Times are read from `ExpirationDate.T` when quotes are added. Call this method
+        when time has passed, or pass options whose (possibly fixed) expiration times
+        should be used for their slices.
+
+        Parameters
+        ----------
+        options : iterable of Option or None, optional
+            Options providing the times of their slices.
+        """
+        if options is not None:
+            for option in options:
+                self._times[option.expiration.expiration_date] = option.expiration.T
+        else:
+            for date in self._times:
+                self._times[date] = ExpirationDate(date).T
+        self._compile_times()
+
+    def vol(self, x, T) -> np.ndarray:
+        """
+        Look up volatilities for arbitrary points of the surface.
+
+        Parameters
+        ----------
+        x : float or array-like
+            Strikes (or moneyness, depending on `by`).
+        T : float or array-like
+            Times to expiration in years. Broadcast against `x`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The interpolated volatilities.
+
+        Raises
+        ------
+        ValueError
+            If the surface has no quotes, or if `by` is 'moneyness' and the
+            underlying's price is not set.
+        """
+        if not self._order:
+            raise ValueError("The volatility surface has no quotes.")
+        if self.by == "moneyness":
+            price = self.underlying.price
+            if price is None:
+                raise ValueError(f"Underlying price is not set for {self.underlying}. Cannot convert moneyness.")
+            x = np.asarray(x, dtype=float) * price
+        return self._vol(x, T)
+
+    def vol_for(self, options) -> np.ndarray:
+        """
+        Look up the volatility of each option from its strike and expiration.
+
+        Parameters
+        ----------
+        options : iterable of Option
+            Options on the surface's underlying.
+
+        Returns
+        -------
+        numpy.ndarray
+            The interpolated volatilities, aligned with `options`.
+        """
+        options = list(options)
+        if not self._order:
+            raise ValueError("The volatility surface has no quotes.")
+        K = np.array([o.strike for o in options], dtype=float)
+        T = np.array([o.expiration.T for o in options], dtype=float)
+        return self._vol(K, T)
+
+    def _vol(self, x, T):
+        x, T = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(T, dtype=float))
+        shape = x.shape
+        x, T = x.reshape(-1), T.reshape(-1)
+        times = self._T
+        upper = np.clip(np.searchsorted(times, T), 0, len(times) - 1)
+        lower = np.clip(upper - 1, 0, len(times) - 1)
+
+        vol_lower = np.empty_like(x)
+        vol_upper = np.empty_like(x)
+        for j, date in enumerate(self._order):
+            for target, rows in ((vol_lower, lower == j), (vol_upper, upper == j)):
+                if rows.any():
+                    target[rows] = self._slice_vol(date, x[rows])
+
+        T_lower, T_upper = times[lower], times[upper]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(T_upper > T_lower, (T - T_lower) / (T_upper - T_lower), 0.0)
+            weight = np.clip(weight, 0.0, 1.0)
+            variance = (1 - weight) * vol_lower ** 2 * T_lower + weight * vol_upper ** 2 * T_upper
+            result = np.sqrt(variance / T)
+        # Flat volatility outside the quoted expirations, and when T is not positive.
+        flat = (T_upper <= T_lower) | (T >= times[-1]) | (T <= 0)
+        result = np.where(flat, np.where(T >= times[-1], vol_upper, vol_lower), result)
+        return result.reshape(shape)
+
+    def _compile_slice(self, date):
+        quotes = self._quotes[date]
+        if not quotes:
+            del self._quotes[date], self._times[date]
+            self._slices.pop(date, None)
+            return
+        xs = np.array(sorted(quotes), dtype=float)
+        vols = np.array([quotes[x] for x in xs.tolist()], dtype=float)
+        slopes = np.diff(vols) / np.diff(xs) if len(xs) > 1 else np.empty(0)
+        self._slices[date] = (xs, vols, slopes)
+
+    def _compile_times(self):
+        self._order = sorted(self._slices, key=lambda date: self._times[date])
+        self._T = np.array([self._times[date] for date in self._order], dtype=float)
+
+    def _slice_vol(self, date, x):
+        xs, vols, slopes = self._slices[date]
+        if len(xs) == 1:
+            return np.full(x.shape, vols[0])
+        x = np.clip(x, xs[0], xs[-1])
+        k = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(xs) - 2)
+        return vols[k] + slopes[k] * (x - xs[k])
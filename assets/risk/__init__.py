@@ -0,0 +1,21 @@
+"""
+Portfolio risk.
+
+Provides a scenario engine computing Value-at-Risk and Expected Shortfall of
+portfolios with full revaluation of their positions, and a bump-and-revalue
+engine computing finite-difference sensitivities.
+"""
+
+from .var import RiskEngine, RiskReport
+from .sensitivities import (BumpEngine, Sensitivities, Black76Pricer, MonteCarloPricer,
+                            ExpirationPricer)
+
+__all__ = [
+    "RiskEngine",
+    "RiskReport",
+    "BumpEngine",
+    "Sensitivities",
+    "Black76Pricer",
+    "MonteCarloPricer",
+    "ExpirationPricer",
+]
@@ -0,0 +1,388 @@
+# Contains the BumpEngine class and the pricers it revalues with
+
+from typing import NamedTuple
+import numpy as np
+from assets.core.derivative import Derivative
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.pricing.black76 import black76_price
+from assets.pricing.curve import rates_for
+from assets.strategies.strategy import Strategy
+
+#################################
+# Sensitivities
+#################################
+
+class Sensitivities(NamedTuple):
+    """
+    Values and finite-difference sensitivities, aligned with the bumped positions.
+
+    Attributes
+    ----------
+    value : numpy.ndarray
+        Value of each position.
+    delta : numpy.ndarray
+        Derivative of the value with respect to the price of the position's underlying.
+    gamma : numpy.ndarray
+        Second derivative of the value with respect to the price of the underlying.
+    vega : numpy.ndarray
+        Derivative of the value with respect to the volatility (per 1.00 of volatility).
+    theta : numpy.ndarray
+        Derivative of the value with respect to calendar time (per year), i.e. -dV/dT.
+    """
+    value: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+
+
+#################################
+# Pricers
+#################################
+
+class ExpirationPricer:
+    """
+    Values assets at expiration through `price_at_expiration`, ignoring volatility and time.
+
+    Underlyings are worth their own price. Vega and theta are zero.
+    """
+
+    def __call__(self, assets, S, sigma, T) -> np.ndarray:
+        """
+        Value assets under stacked scenarios.
+
+        Parameters
+        ----------
+        assets : list of Asset
+            The assets, one per column.
+        S, sigma, T : numpy.ndarray
+            Price of each asset's driver, volatility and time to expiration in years,
+            all of shape (n_scenarios, n_assets). The driver is the direct underlying,
+            except for underlyings and Futures, which are driven by their own price.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of shape (n_scenarios, n_assets).
+        """
+        values = np.empty(S.shape)
+        for j, asset in enumerate(assets):
+            values[:, j] = asset.price_at_expiration(S[:, j])
+        return values
+
+
+class Black76Pricer:
+    """
+    Values Options with Black-76 and Futures on their own quote, vectorized over
+    scenarios and assets.
+
+    Options on Futures use the futures price as the forward; options on spot assets
+    carry the spot to expiration, which gives the Black-Scholes price. Futures are
+    worth contract_size * (F - forward_price), where F is their own quote, i.e. the
+    same forward the options written on them are valued with.
+    """
+
+    def __init__(self, r=0.0, carry=None):
+        """
+        Parameters
+        ----------
+        r : float or RateCurve, optional
+            Risk-free rate used for discounting.
+        carry : float, RateCurve or None, optional
+            Cost-of-carry rate used to carry spot prices forward. Defaults to `r`.
+        """
+        self.r = r
+        self.carry = r if carry is None else carry
+
+    def __call__(self, assets, S, sigma, T) -> np.ndarray:
+        """Value Options and Futures under stacked scenarios. See `ExpirationPricer.__call__`."""
+        T = np.maximum(T, 0.0)
+        on_futures = np.array([isinstance(a.underlying, Futures) for a in assets], dtype=bool)
+        F = np.where(on_futures, S, S * np.exp(rates_for(self.carry, T) * T))
+        is_option = np.array([isinstance(a, Option) for a in assets], dtype=bool)
+        values = np.empty(S.shape)
+        if is_option.any():
+            options = [a for a, o in zip(assets, is_option) if o]
+            K = np.array([o.strike for o in options], dtype=float)
+            m = np.array([o.multiplier for o in options], dtype=float)
+            option_types = np.array([o.option_type for o in options], dtype=str)
+            T_options = T[:, is_option]
+            values[:, is_option] = m * black76_price(F[:, is_option], K, T_options, sigma[:, is_option],
+                                                     rates_for(self.r, T_options), option_types)
+        if not is_option.all():
+            futures = [a for a, o in zip(assets, is_option) if not o]
+            size = np.array([f.contract_size for f in futures], dtype=float)
+            strike = np.array([f.forward_price for f in futures], dtype=float)
+            values[:, ~is_option] = size * (S[:, ~is_option] - strike)
+        return values
+
+
+class MonteCarloPricer:
+    """
+    Values derivatives by simulating their underlying at expiration and averaging
+    `price_at_expiration`, for payoffs without closed form.
+
+    The underlying follows a geometric Brownian motion with the carried forward as
+    mean. The same normal draws are used for every scenario of a call (common random
+    numbers), so the differences between bumped scenarios carry little simulation
+    noise, and a fixed `seed` makes successive calls reproducible. Futures are
+    driven by their own quote, whose expectation is the quote itself, so they are
+    valued with `price_at_expiration` on it without simulation.
+    """
+
+    def __init__(self, n_paths: int = 10000, r=0.0, carry=None, seed=None, antithetic: bool = True):
+        """
+        Parameters
+        ----------
+        n_paths : int, optional
+            Number of simulated paths.
+        r : float or RateCurve, optional
+            Risk-free rate used for discounting.
+        carry : float, RateCurve or None, optional
+            Cost-of-carry rate used to carry spot prices forward. Defaults to `r`.
+            Underlyings that are Futures are not carried.
+        seed : int or None, optional
+            Seed of the normal draws. None draws new numbers on every call.
+        antithetic : bool, optional
+            Whether to pair every draw with its opposite. Defaults to True.
+        """
+        self.n_paths = n_paths
+        self.r = r
+        self.carry = r if carry is None else carry
+        self.seed = seed
+        self.antithetic = antithetic
+
+    def __call__(self, assets, S, sigma, T) -> np.ndarray:
+        """Value derivatives under stacked scenarios. See `ExpirationPricer.__call__`."""
+        rng = np.random.default_rng(self.seed)
+        if self.antithetic:
+            Z = rng.standard_normal((self.n_paths + 1) // 2)
+            Z = np.concatenate((Z, -Z))[:self.n_paths]
+        else:
+            Z = rng.standard_normal(self.n_paths)
+        T = np.maximum(T, 0.0)
+        values = np.empty(S.shape)
+        for j, asset in enumerate(assets):
+            if isinstance(asset, Futures):
+                values[:, j] = asset.price_at_expiration(S[:, j])
+                continue
+            T_j, sigma_j = T[:, j:j + 1], sigma[:, j:j + 1]
+            carry = 0.0 if isinstance(asset.underlying, Futures) else rates_for(self.carry, T_j)
+            F = S[:, j:j + 1] * np.exp(carry * T_j)
+            ST = F * np.exp(-0.5 * sigma_j ** 2 * T_j + sigma_j * np.sqrt(T_j) * Z)
+            payoff = np.asarray(asset.price_at_expiration(ST), dtype=float)
+            values[:, j] = np.exp(-rates_for(self.r, T_j[:, 0]) * T_j[:, 0]) * payoff.mean(axis=1)
+        return values
+
+
+#################################
+# BumpEngine Class
+#################################
+
+class BumpEngine:
+    """
+    Bump-and-revalue engine computing sensitivities by finite differences.
+
+    All the bumped scenarios (spot up and down, vol up and down, time forward) are
+    stacked into one batch and every pricer is called once for all of its positions,
+    so the valuation stays vectorized. Prices are read once at construction, through
+    `Asset.price` (hence inside an active `ValuationContext` if any), and no price is
+    ever written: the live singletons are left untouched.
+
+    Positions are Assets or multi-leg `Strategy` objects, whose legs are revalued
+    individually and summed with their quantities. Spot bumps move the price of each
+    leg's driver: the direct underlying for options and other derivatives, the asset
+    itself for underlyings and Futures. The delta of an option on futures is thus
+    with respect to the futures price, like the delta of the futures themselves, and
+    a futures contract is priced off the same quote as the options written on it.
+    All the legs of a Strategy must share the same driver, so that its delta and
+    gamma are with respect to a single price.
+
+    Attributes
+    ----------
+    positions : list of Asset or Strategy
+        The bumped positions.
+    spot_bump : float
+        Relative bump of the underlying prices.
+    vol_bump : float
+        Absolute bump of the volatilities.
+    time_bump : float
+        Time step in years.
+    """
+
+    def __init__(self, positions, vols=None, pricer=None, r=0.0, carry=None, spot_bump: float = 0.01,
+                 vol_bump: float = 0.01, time_bump: float = 1 / 365):
+        """
+        Initialize a BumpEngine.
+
+        Parameters
+        ----------
+        positions : iterable of Asset or Strategy
+            The positions.
+        vols : float, dict, callable or None, optional
+            Volatility of each derivative's underlying: a single value, a mapping from
+            asset to volatility, or a callable returning an array of volatilities for a
+            list of assets (e.g., `VolSurface.vol_for`).
+        pricer : callable or None, optional
+            Pricer used for every derivative leg, such as a `MonteCarloPricer`. Called
+            as ``pricer(assets, S, sigma, T)`` with arrays of shape (n_scenarios,
+            n_assets). By default, Options and Futures are valued with `Black76Pricer`
+            and the other derivatives with `ExpirationPricer`. Underlying legs are
+            always worth their own price.
+        r : float or RateCurve, optional
+            Risk-free rate of the default `Black76Pricer`.
+        carry : float, RateCurve or None, optional
+            Cost-of-carry rate of the default `Black76Pricer`. Defaults to `r`.
+        spot_bump : float, optional
+            Relative bump of the underlying prices. Defaults to 1%.
+        vol_bump : float, optional
+            Absolute bump of the volatilities. Defaults to 0.01.
+        time_bump : float, optional
+            Time step in years. Defaults to one day.
+
+        Raises
+        ------
+        ValueError
+            If the price of a driver is not set, a volatility is needed but missing (every
+            Option needs one under the default pricer), or the legs of a Strategy have
+            different drivers.
+        """
+        self.positions = list(positions)
+        self.spot_bump = spot_bump
+        self.vol_bump = vol_bump
+        self.time_bump = time_bump
+
+        legs, weights, owners = [], [], []
+        for i, position in enumerate(self.positions):
+            entries = [(a, q) for a, q, _ in position.legs] if isinstance(position, Strategy) else [(position, 1.0)]
+            for asset, quantity in entries:
+                legs.append(asset)
+                weights.append(quantity)
+                owners.append(i)
+        self._legs = legs
+        self._weights = np.array(weights, dtype=float)
+        self._owners = np.array(owners, dtype=np.int64)
+
+        drivers = [_driver(leg) for leg in legs]
+        for position in self.positions:
+            if isinstance(position, Strategy):
+                mixed = {id(_driver(a)): _driver(a) for a, _, _ in position.legs}
+                if len(mixed) > 1:
+                    first, second = list(mixed.values())[:2]
+                    raise ValueError(f"The legs of {position} depend on different prices ({first}, {second}). "
+                                     f"Bump them as separate positions.")
+        self._S = self._prices(drivers)
+        self._T = np.array([leg.expiration.T if getattr(leg, "expiration", None) is not None else 0.0
+                            for leg in legs], dtype=float)
+        self._sigma = _leg_vols(vols, legs)
+        self._spot = np.full(len(self.positions), np.nan)  # underlying price of each position
+        self._spot[self._owners[::-1]] = self._S[::-1]
+
+        default = Black76Pricer(r, carry)
+        expiration = ExpirationPricer()
+        groups = {}
+        for j, leg in enumerate(legs):
+            if not isinstance(leg, Derivative):
+                chosen = expiration
+            elif pricer is not None:
+                chosen = pricer
+            elif isinstance(leg, (Futures, Option)):
+                chosen = default
+            else:
+                chosen = expiration
+            if chosen is not expiration and self._sigma[j] != self._sigma[j]:
+                if not isinstance(leg, Futures):
+                    raise ValueError(f"No volatility for {leg}. Cannot value it with {type(chosen).__name__}.")
+                self._sigma[j] = 0.0  # Futures do not depend on the volatility
+            groups.setdefault(id(chosen), (chosen, []))[1].append(j)
+        self._groups = [(chosen, np.array(columns, dtype=np.int64)) for chosen, columns in groups.values()]
+
+    def revalue(self, spot_shifts=0.0, vol_shifts=0.0, time_shifts=0.0) -> np.ndarray:
+        """
+        Value the positions under stacked scenarios in one batch.
+
+        Parameters
+        ----------
+        spot_shifts : float or array-like, optional
+            Relative shift of every underlying price in each scenario.
+        vol_shifts : float or array-like, optional
+            Absolute shift of every volatility in each scenario.
+        time_shifts : float or array-like, optional
+            Time elapsed in years in each scenario (reduces the times to expiration).
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of shape (n_scenarios, n_positions).
+        """
+        spot, vol, dt = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float))
+                                              for x in (spot_shifts, vol_shifts, time_shifts)))
+        S = self._S * (1 + spot[:, np.newaxis])
+        sigma = self._sigma + vol[:, np.newaxis]
+        T = self._T - dt[:, np.newaxis]
+        legs = np.empty(S.shape)
+        for chosen, columns in self._groups:
+            legs[:, columns] = chosen([self._legs[j] for j in columns.tolist()], S[:, columns],
+                                      sigma[:, columns], T[:, columns])
+        values = np.zeros((len(spot), len(self.positions)))
+        np.add.at(values.T, self._owners, (legs * self._weights).T)
+        return values
+
+    def sensitivities(self) -> Sensitivities:
+        """
+        Value the positions and compute their delta, gamma, vega and theta.
+
+        Delta and gamma use central differences on the underlying price, vega central
+        differences on the volatility and theta a forward step in time. The six
+        scenarios are revalued in a single batch.
+
+        Returns
+        -------
+        Sensitivities
+            Arrays aligned with `positions`.
+        """
+        h, dv, dt = self.spot_bump, self.vol_bump, self.time_bump
+        values = self.revalue([0.0, h, -h, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, dv, -dv, 0.0],
+                              [0.0, 0.0, 0.0, 0.0, 0.0, dt])
+        base, up, down, vol_up, vol_down, later = values
+        dS = h * self._spot
+        return Sensitivities(
+            value=base,
+            delta=(up - down) / (2 * dS),
+            gamma=(up - 2 * base + down) / dS ** 2,
+            vega=(vol_up - vol_down) / (2 * dv),
+            theta=(later - base) / dt,
+        )
+
+    def _prices(self, assets):
+        prices = [a.price for a in assets]
+        for asset, price in zip(assets, prices):
+            if price is None:
+                raise ValueError(f"Price is not set for {asset}. Cannot revalue the positions depending on it.")
+        return np.array(prices, dtype=float)
+
+
+#################################
+# Helpers
+#################################
+
+def _driver(leg):
+    """Asset whose price a leg is bumped with: itself for underlyings and Futures, its underlying otherwise."""
+    return leg.underlying if isinstance(leg, Derivative) and not isinstance(leg, Futures) else leg
+
+
+def _leg_vols(vols, legs):
+    sigma = np.full(len(legs), np.nan)
+    derivatives = [j for j, leg in enumerate(legs) if isinstance(leg, Derivative)]
+    if vols is None or not derivatives:
+        return sigma
+    if isinstance(vols, dict):
+        for j in derivatives:
+            if legs[j] in vols:
+                sigma[j] = vols[legs[j]]
+    elif callable(vols):
+        sigma[derivatives] = np.asarray(vols([legs[j] for j in derivatives]), dtype=float)
+    else:
+        sigma[derivatives] = float(vols)
+    return sigma
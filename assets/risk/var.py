@@ -0,0 +1,397 @@
+# Contains the RiskEngine class for Value-at-Risk and Expected Shortfall
+
+from typing import NamedTuple
+import numpy as np
+from scipy.special import ndtri
+from assets.core.derivative import Derivative
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.pricing.black76 import black76_price
+from assets.pricing.curve import rates_for
+
+#################################
+# RiskReport
+#################################
+
+class RiskReport(NamedTuple):
+    """
+    Value-at-Risk and Expected Shortfall of a portfolio, with their decomposition.
+
+    Losses are reported as positive numbers. Component contributions sum to the
+    portfolio figure; marginal contributions are the components per unit held.
+
+    Attributes
+    ----------
+    alpha : float
+        Confidence level (e.g., 0.99).
+    var : float
+        Value-at-Risk.
+    es : float
+        Expected Shortfall (average loss beyond the VaR).
+    component_var : numpy.ndarray
+        Contribution of each position to the VaR.
+    component_es : numpy.ndarray
+        Contribution of each position to the ES.
+    marginal_var : numpy.ndarray
+        Component VaR per unit of each position (NaN for zero quantities).
+    marginal_es : numpy.ndarray
+        Component ES per unit of each position (NaN for zero quantities).
+    pnl : numpy.ndarray or None
+        Portfolio P&L per scenario, for scenario-based methods.
+    """
+    alpha: float
+    var: float
+    es: float
+    component_var: np.ndarray
+    component_es: np.ndarray
+    marginal_var: np.ndarray
+    marginal_es: np.ndarray
+    pnl: np.ndarray
+
+
+#################################
+# RiskEngine Class
+#################################
+
+class RiskEngine:
+    """
+    Portfolio risk engine revaluing positions under scenarios of their true underlyings.
+
+    Every position is mapped to its true underlying (see `Asset.get_true_underlying`).
+    A scenario is a vector of simple returns of the true underlyings; prices along
+    futures chains move proportionally with their true underlying. Underlyings and
+    futures are linear in these returns and are revalued exactly in matrix form.
+    Options are revalued in full: with Black-76 when a volatility is available and
+    through `price_at_expiration` otherwise. Other derivatives are revalued through
+    `price_at_expiration`.
+
+    Scenarios are processed in chunks of `chunk_size`, so memory is bounded by
+    chunk_size * n_positions regardless of the number of scenarios.
+
+    Attributes
+    ----------
+    positions : list of Asset
+        The assets held.
+    quantities : numpy.ndarray
+        Number of units (shares, contracts) held in each position.
+    underlyings : list of Asset
+        True underlyings, in the column order expected for scenario matrices.
+    chunk_size : int
+        Number of scenarios revalued at once.
+    """
+
+    def __init__(self, positions, vols=None, r=0.0, carry=None, horizon: float = 0.0, chunk_size: int = 10000):
+        """
+        Initialize a RiskEngine.
+
+        Parameters
+        ----------
+        positions : dict or iterable of (Asset, float)
+            Assets and the quantities held.
+        vols : float, dict, callable or None, optional
+            Volatilities for option revaluation: a single value, a mapping from option
+            to volatility, or a callable returning an array of volatilities for a list of
+            options (e.g., `VolSurface.vol_for`). Options without a volatility are
+            revalued through `price_at_expiration`.
+        r : float or RateCurve, optional
+            Risk-free rate used for discounting option values.
+        carry : float, RateCurve or None, optional
+            Cost-of-carry rate used to carry spot prices forward. Defaults to `r`.
+        horizon : float, optional
+            Risk horizon in years. Options are revalued with their time to expiration
+            reduced by the horizon.
+        chunk_size : int, optional
+            Number of scenarios revalued at once.
+
+        Raises
+        ------
+        ValueError
+            If the price needed to revalue a position is not set.
+        """
+        items = list(positions.items()) if isinstance(positions, dict) else [tuple(p) for p in positions]
+        self.positions = [asset for asset, _ in items]
+        self.quantities = np.array([q for _, q in items], dtype=float)
+        self.chunk_size = chunk_size
+        self.horizon = horizon
+        carry = r if carry is None else carry
+
+        self.underlyings = []
+        columns = {}
+        self._column = np.empty(len(items), dtype=np.int64)
+        for i, asset in enumerate(self.positions):
+            true = asset.get_true_underlying()
+            self._column[i] = columns.setdefault(id(true), len(columns))
+            if self._column[i] == len(self.underlyings):
+                self.underlyings.append(true)
+
+        option_vols = self._option_vols(vols)
+        linear, model, payoff = [], [], []
+        for i, asset in enumerate(self.positions):
+            if not isinstance(asset, Derivative) or isinstance(asset, Futures):
+                linear.append(i)
+            elif isinstance(asset, Option) and i in option_vols:
+                model.append(i)
+            else:
+                payoff.append(i)
+
+        # Linear positions: P&L = quantity * scale * price * return.
+        self._linear = np.array(linear, dtype=np.int64)
+        scale = [asset.contract_size if isinstance(asset, Futures) else 1.0 for asset in self._assets(linear)]
+        self._linear_weight = np.array(scale, dtype=float) * self._prices(self._assets(linear))
+
+        # Options revalued with Black-76 on their direct underlying.
+        self._model = np.array(model, dtype=np.int64)
+        options = self._assets(model)
+        self._model_price = self._prices([o.underlying for o in options])
+        self._model_on_futures = np.array([isinstance(o.underlying, Futures) for o in options], dtype=bool)
+        self._model_K = np.array([o.strike for o in options], dtype=float)
+        self._model_m = np.array([o.multiplier for o in options], dtype=float)
+        self._model_type = np.array([o.option_type for o in options], dtype=str)
+        self._model_vol = np.array([option_vols[i] for i in model], dtype=float)
+        T_now = np.maximum(np.array([o.expiration.T for o in options], dtype=float), 0.0)
+        self._model_T = np.maximum(T_now - horizon, 0.0)
+        self._model_r = rates_for(r, self._model_T)
+        self._model_carry = rates_for(carry, self._model_T)
+        self._model_base = self._option_values(self._model_price[np.newaxis], T_now, rates_for(r, T_now),
+                                               rates_for(carry, T_now))[0]
+
+        # Other derivatives revalued at expiration one by one, vectorized over scenarios.
+        self._payoff = np.array(payoff, dtype=np.int64)
+        self._payoff_price = self._prices([self.positions[i].underlying for i in payoff])
+        self._payoff_base = np.array([self.positions[i].price_at_expiration(p)
+                                      for i, p in zip(payoff, self._payoff_price.tolist())], dtype=float)
+
+    #################################
+    # Revaluation
+    #################################
+
+    def position_pnl(self, scenarios) -> np.ndarray:
+        """
+        P&L of every position under every scenario.
+
+        Parameters
+        ----------
+        scenarios : array-like
+            Simple returns of the true underlyings, of shape (n_scenarios, n_underlyings).
+
+        Returns
+        -------
+        numpy.ndarray
+            P&L of shape (n_scenarios, n_positions), quantities included.
+        """
+        returns = self._check(scenarios)
+        pnl = np.empty((len(returns), len(self.positions)))
+        for start in range(0, len(returns), self.chunk_size):
+            chunk = returns[start:start + self.chunk_size]
+            pnl[start:start + len(chunk)] = self._chunk_pnl(chunk)
+        return pnl
+
+    def pnl(self, scenarios) -> np.ndarray:
+        """
+        Portfolio P&L under every scenario, computed chunk by chunk.
+
+        Parameters
+        ----------
+        scenarios : array-like
+            Simple returns of the true underlyings, of shape (n_scenarios, n_underlyings).
+
+        Returns
+        -------
+        numpy.ndarray
+            Portfolio P&L per scenario.
+        """
+        returns = self._check(scenarios)
+        total = np.empty(len(returns))
+        for start in range(0, len(returns), self.chunk_size):
+            chunk = returns[start:start + self.chunk_size]
+            total[start:start + len(chunk)] = self._chunk_pnl(chunk).sum(axis=1)
+        return total
+
+    #################################
+    # Risk measures
+    #################################
+
+    def historical(self, scenarios, alpha: float = 0.99) -> RiskReport:
+        """
+        VaR and ES from historical (or any given) scenarios with full revaluation.
+
+        The VaR is the k-th worst loss and the ES the average of the k worst losses,
+        with k = ceil(n_scenarios * (1 - alpha)). Component contributions are the
+        position P&Ls in the VaR scenario and averaged over the tail scenarios.
+
+        Parameters
+        ----------
+        scenarios : array-like
+            Simple returns of the true underlyings, of shape (n_scenarios, n_underlyings).
+        alpha : float, optional
+            Confidence level. Defaults to 0.99.
+
+        Returns
+        -------
+        RiskReport
+            Portfolio and per-position risk.
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("'alpha' must lie in (0, 1).")
+        returns = self._check(scenarios)
+        pnl = self.pnl(returns)
+        tail = np.argsort(pnl, kind="stable")[:_tail_size(len(pnl), alpha)]
+        return self._tail_report(alpha, returns[tail], pnl)
+
+    def monte_carlo(self, cov, n_scenarios: int = 10000, alpha: float = 0.99, mean=None, seed=None) -> RiskReport:
+        """
+        VaR and ES from simulated scenarios with full revaluation.
+
+        Log returns of the true underlyings are drawn from a multivariate normal
+        distribution and converted to simple returns, then handled as in `historical`.
+        Scenarios are drawn, revalued and discarded `chunk_size` at a time: only the
+        portfolio P&L of every scenario and the returns of the worst scenarios seen so
+        far are kept, so memory does not grow with n_scenarios * n_underlyings. The
+        draws do not depend on `chunk_size`.
+
+        Parameters
+        ----------
+        cov : array-like
+            Covariance matrix of the log returns over the horizon, in `underlyings` order.
+        n_scenarios : int, optional
+            Number of simulated scenarios.
+        alpha : float, optional
+            Confidence level. Defaults to 0.99.
+        mean : array-like or None, optional
+            Mean log returns over the horizon. Defaults to zero.
+        seed : int, numpy.random.Generator or None, optional
+            Seed of the random number generator.
+
+        Returns
+        -------
+        RiskReport
+            Portfolio and per-position risk.
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("'alpha' must lie in (0, 1).")
+        cov = np.asarray(cov, dtype=float)
+        mean = np.zeros(len(cov)) if mean is None else np.asarray(mean, dtype=float)
+        rng = np.random.default_rng(seed)
+        k = _tail_size(n_scenarios, alpha)
+        pnl = np.empty(n_scenarios)
+        tail_returns, tail_pnl = np.empty((0, len(cov))), np.empty(0)
+        for start in range(0, n_scenarios, self.chunk_size):
+            size = min(self.chunk_size, n_scenarios - start)
+            returns = self._check(np.expm1(rng.multivariate_normal(mean, cov, size=size, method="cholesky")))
+            chunk = self._chunk_pnl(returns).sum(axis=1)
+            pnl[start:start + size] = chunk
+            # Candidates stay in (P&L, scenario) order, as with a stable sort of all scenarios.
+            tail_returns = np.concatenate((tail_returns, returns))
+            tail_pnl = np.concatenate((tail_pnl, chunk))
+            keep = np.argsort(tail_pnl, kind="stable")[:k]
+            tail_returns, tail_pnl = tail_returns[keep], tail_pnl[keep]
+        return self._tail_report(alpha, tail_returns, pnl)
+
+    def parametric(self, cov, alpha: float = 0.99, bump: float = 1e-4) -> RiskReport:
+        """
+        Delta-normal VaR and ES.
+
+        Sensitivities to the returns of the true underlyings are obtained by central
+        finite differences of the full revaluation, then combined with the covariance
+        matrix under a normal assumption. Component contributions follow the Euler
+        allocation.
+
+        Parameters
+        ----------
+        cov : array-like
+            Covariance matrix of the returns over the horizon, in `underlyings` order.
+        alpha : float, optional
+            Confidence level. Defaults to 0.99.
+        bump : float, optional
+            Return bump used for the finite differences.
+
+        Returns
+        -------
+        RiskReport
+            Portfolio and per-position risk. `pnl` is None.
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("'alpha' must lie in (0, 1).")
+        cov = np.asarray(cov, dtype=float)
+        n = len(self.underlyings)
+        bumps = np.concatenate((np.eye(n) * bump, -np.eye(n) * bump))
+        pnl = self.position_pnl(bumps)
+        deltas = (pnl[:n] - pnl[n:]) / (2 * bump)  # (n_underlyings, n_positions)
+        exposure = deltas.sum(axis=1)
+        sigma = np.sqrt(exposure @ cov @ exposure)
+        z = ndtri(alpha)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = (deltas.T @ cov @ exposure) / sigma
+        es_factor = np.exp(-0.5 * z ** 2) / np.sqrt(2 * np.pi) / (1 - alpha)
+        return self._report(alpha, z * beta, es_factor * beta, None)
+
+    #################################
+    # Helpers
+    #################################
+
+    def _assets(self, indices):
+        return [self.positions[i] for i in indices]
+
+    def _prices(self, assets):
+        prices = [a.price for a in assets]
+        for asset, price in zip(assets, prices):
+            if price is None:
+                raise ValueError(f"Price is not set for {asset}. Cannot revalue the positions depending on it.")
+        return np.array(prices, dtype=float)
+
+    def _option_vols(self, vols):
+        indices = [i for i, a in enumerate(self.positions) if isinstance(a, Option)]
+        if vols is None or not indices:
+            return {}
+        if isinstance(vols, dict):
+            return {i: vols[self.positions[i]] for i in indices if self.positions[i] in vols}
+        if callable(vols):
+            values = np.asarray(vols([self.positions[i] for i in indices]), dtype=float)
+            return {i: v for i, v in zip(indices, values.tolist()) if v == v}
+        return {i: float(vols) for i in indices}
+
+    def _check(self, scenarios):
+        returns = np.atleast_2d(np.asarray(scenarios, dtype=float))
+        if returns.shape[1] != len(self.underlyings):
+            raise ValueError(f"Scenarios must have one column per true underlying ({len(self.underlyings)}), "
+                             f"got {returns.shape[1]}.")
+        return returns
+
+    def _option_values(self, prices, T, r, carry):
+        F = np.where(self._model_on_futures, prices, prices * np.exp(carry * T))
+        return self._model_m * black76_price(F, self._model_K, T, self._model_vol, r, self._model_type)
+
+    def _chunk_pnl(self, returns):
+        pnl = np.empty((len(returns), len(self.positions)))
+        q = self.quantities
+        if len(self._linear):
+            pnl[:, self._linear] = returns[:, self._column[self._linear]] * (q[self._linear] * self._linear_weight)
+        if len(self._model):
+            prices = self._model_price * (1 + returns[:, self._column[self._model]])
+            values = self._option_values(prices, self._model_T, self._model_r, self._model_carry)
+            pnl[:, self._model] = (values - self._model_base) * q[self._model]
+        for j, i in enumerate(self._payoff.tolist()):
+            prices = self._payoff_price[j] * (1 + returns[:, self._column[i]])
+            pnl[:, i] = (np.asarray(self.positions[i].price_at_expiration(prices)) - self._payoff_base[j]) * q[i]
+        return pnl
+
+    def _tail_report(self, alpha, tail_returns, pnl):
+        # tail_returns: the k worst scenarios, worst first.
+        tail_pnl = self.position_pnl(tail_returns)
+        return self._report(alpha, -tail_pnl[-1], -tail_pnl.mean(axis=0), pnl)
+
+    def _report(self, alpha, component_var, component_es, pnl):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            marginal_var = np.where(self.quantities != 0, component_var / self.quantities, np.nan)
+            marginal_es = np.where(self.quantities != 0, component_es / self.quantities, np.nan)
+        return RiskReport(alpha, float(component_var.sum()), float(component_es.sum()),
+                          component_var, component_es, marginal_var, marginal_es, pnl)
+
+
+#################################
+# Helpers
+#################################
+
+def _tail_size(n_scenarios, alpha):
+    """Number of tail scenarios, k = ceil(n_scenarios * (1 - alpha)), at least 1."""
+    return max(int(np.ceil(n_scenarios * (1 - alpha) - 1e-9)), 1)
@@ -0,0 +1,14 @@
+"""
+Option strategies.
+
+Provides multi-leg strategies compiled into exact piecewise-linear payoffs at
+expiration.
+"""
+
+from .payoff import PiecewiseLinearPayoff
+from .strategy import Strategy
+
+__all__ = [
+    "PiecewiseLinearPayoff",
+    "Strategy",
+]
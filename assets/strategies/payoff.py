@@ -0,0 +1,135 @@
+# Contains the PiecewiseLinearPayoff class
+
+import numpy as np
+
+#################################
+# PiecewiseLinearPayoff Class
+#################################
+
+class PiecewiseLinearPayoff:
+    """
+    Exact representation of a payoff that is piecewise linear in the underlying price ST.
+
+    The payoff is written as intercept + slope * ST + sum_i weights_i * max(ST - kinks_i, 0)
+    and compiled into sorted breakpoints with the value at each breakpoint and the slope
+    of each segment. Evaluation locates the segment by binary search, i.e. costs
+    O(log n) per point, and is vectorized over arrays. Extrema and breakevens are
+    computed from the breakpoints, over the domain ST >= 0.
+
+    Attributes
+    ----------
+    breakpoints : numpy.ndarray
+        Sorted prices where the slope changes.
+    values : numpy.ndarray
+        Payoff at each breakpoint.
+    slopes : numpy.ndarray
+        Slope of each segment: before the first breakpoint, between consecutive
+        breakpoints, and after the last one (length n_breakpoints + 1).
+    """
+
+    def __init__(self, kinks=(), weights=(), intercept: float = 0.0, slope: float = 0.0):
+        """
+        Compile a payoff from its kinks.
+
+        Parameters
+        ----------
+        kinks : array-like of float, optional
+            Prices of the call-like kinks (e.g., strikes).
+        weights : array-like of float, optional
+            Change of slope at each kink, aligned with `kinks`.
+        intercept : float, optional
+            Payoff at ST = 0 of the linear part.
+        slope : float, optional
+            Slope of the payoff below every kink.
+        """
+        kinks = np.atleast_1d(np.asarray(kinks, dtype=float))
+        weights = np.atleast_1d(np.asarray(weights, dtype=float))
+        if kinks.shape != weights.shape:
+            raise ValueError(f"Got {len(kinks)} kinks but {len(weights)} weights.")
+        self.breakpoints, inverse = np.unique(kinks, return_inverse=True)
+        changes = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(self.breakpoints))
+        self.slopes = slope + np.concatenate(([0.0], np.cumsum(changes)))
+        self.values = np.empty(0)
+        if len(self.breakpoints):
+            first = intercept + slope * self.breakpoints[0]
+            steps = self.slopes[1:-1] * np.diff(self.breakpoints)
+            self.values = first + np.concatenate(([0.0], np.cumsum(steps)))
+        self._intercept = float(intercept)
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(breakpoints={self.breakpoints.tolist()}, "
+                f"values={self.values.tolist()}, slopes={self.slopes.tolist()})")
+
+    def __call__(self, ST) -> np.ndarray:
+        """
+        Evaluate the payoff.
+
+        Parameters
+        ----------
+        ST : float or array-like
+            Underlying prices.
+
+        Returns
+        -------
+        numpy.ndarray
+            The payoff at each price.
+        """
+        ST = np.asarray(ST, dtype=float)
+        if not len(self.breakpoints):
+            return self._intercept + self.slopes[0] * ST
+        segment = np.searchsorted(self.breakpoints, ST, side="right")
+        anchor = np.maximum(segment - 1, 0)
+        return self.values[anchor] + self.slopes[segment] * (ST - self.breakpoints[anchor])
+
+    def __add__(self, other: "PiecewiseLinearPayoff") -> "PiecewiseLinearPayoff":
+        if not isinstance(other, PiecewiseLinearPayoff):
+            return NotImplemented
+        kinks = np.concatenate((self.breakpoints, other.breakpoints))
+        weights = np.concatenate((np.diff(self.slopes), np.diff(other.slopes)))
+        return PiecewiseLinearPayoff(kinks, weights, self._intercept + other._intercept, self.slopes[0] + other.slopes[0])
+
+    def __mul__(self, factor: float) -> "PiecewiseLinearPayoff":
+        return PiecewiseLinearPayoff(self.breakpoints, factor * np.diff(self.slopes), factor * self._intercept,
+                                     factor * self.slopes[0])
+
+    __rmul__ = __mul__
+
+    def shift(self, amount: float) -> "PiecewiseLinearPayoff":
+        """Return the payoff plus a constant (e.g., minus the premiums paid)."""
+        return PiecewiseLinearPayoff(self.breakpoints, np.diff(self.slopes), self._intercept + amount, self.slopes[0])
+
+    def maximum(self) -> float:
+        """Supremum of the payoff over ST >= 0 (inf if unbounded)."""
+        if self.slopes[-1] > 0:
+            return np.inf
+        return float(self(self._nodes()).max())
+
+    def minimum(self) -> float:
+        """Infimum of the payoff over ST >= 0 (-inf if unbounded)."""
+        if self.slopes[-1] < 0:
+            return -np.inf
+        return float(self(self._nodes()).min())
+
+    def roots(self) -> np.ndarray:
+        """
+        Prices ST >= 0 where the payoff crosses or touches zero.
+
+        Segments on which the payoff is identically zero contribute their endpoints.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted roots.
+        """
+        nodes = self._nodes()
+        values = self(nodes)
+        slopes = self.slopes[np.searchsorted(self.breakpoints, nodes, side="right")]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = nodes - values / slopes
+        ends = np.append(nodes[1:], np.inf)
+        inside = (slopes != 0) & (crossing >= nodes) & (crossing <= ends)
+        return np.unique(np.concatenate((crossing[inside], nodes[values == 0])))
+
+    def _nodes(self):
+        """ST = 0 followed by the positive breakpoints: the left end of every segment of the domain."""
+        return np.concatenate(([0.0], self.breakpoints[self.breakpoints > 0]))
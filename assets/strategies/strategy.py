@@ -0,0 +1,174 @@
+# Contains the Strategy class
+
+import numpy as np
+from assets.core.derivative import Derivative
+from assets.instruments.futures import Futures
+from assets.instruments.option import Option
+from assets.strategies.payoff import PiecewiseLinearPayoff
+
+#################################
+# Strategy Class
+#################################
+
+class Strategy:
+    """
+    Multi-leg position on a single underlying, evaluated at expiration.
+
+    Legs are the underlying itself, Futures on it and Options on it. Their payoffs at
+    expiration are piecewise linear in the underlying price ST, so the strategy is
+    compiled once into an exact `PiecewiseLinearPayoff`. Breakevens, maximum profit
+    and maximum loss are then computed from the breakpoints rather than from a grid.
+    All legs are assumed to settle at the same price ST.
+
+    Attributes
+    ----------
+    underlying : Asset
+        The common underlying of the legs.
+    legs : list of tuple
+        (asset, quantity, premium) of each leg. The premium is the price paid per unit
+        when entering the leg, in the units of `price_at_expiration`.
+    payoff : PiecewiseLinearPayoff
+        Value of the legs at expiration.
+    profit : PiecewiseLinearPayoff
+        Payoff minus the premiums paid.
+    """
+
+    def __init__(self, legs):
+        """
+        Compile a Strategy.
+
+        Parameters
+        ----------
+        legs : iterable of tuple
+            (asset, quantity) or (asset, quantity, premium) for each leg. Quantities
+            are negative for short legs. Premiums default to the value of the leg at
+            its current price: the option price, the underlying price, or
+            `price_at_expiration` at the current futures price for Futures.
+
+        Raises
+        ------
+        TypeError
+            If a leg is a derivative other than Futures and Option.
+        ValueError
+            If the legs have different underlyings, or if a premium is needed but the
+            price of the leg is not set.
+        """
+        self.legs = []
+        self.underlying = None
+        kinks, weights = [], []
+        intercept = slope = cost = 0.0
+        for leg in legs:
+            asset, quantity = leg[0], float(leg[1])
+            premium = float(leg[2]) if len(leg) > 2 and leg[2] is not None else self._premium(asset)
+            underlying = asset.underlying if isinstance(asset, Derivative) else asset
+            if self.underlying is None:
+                self.underlying = underlying
+            elif underlying is not self.underlying:
+                raise ValueError(f"All legs must settle on {self.underlying}, but {asset} settles on {underlying}.")
+            if isinstance(asset, Option):
+                m = quantity * asset.multiplier
+                kinks.append(asset.strike)
+                weights.append(m)
+                if asset.option_type == "P":  # (K - ST)^+ = (ST - K)^+ - (ST - K)
+                    slope -= m
+                    intercept += m * asset.strike
+            elif isinstance(asset, Futures):
+                slope += quantity * asset.contract_size
+                intercept -= quantity * asset.contract_size * asset.forward_price
+            elif isinstance(asset, Derivative):
+                raise TypeError(f"Cannot compile the payoff of {asset.asset_type()}; only Futures and Option legs are supported.")
+            else:
+                slope += quantity
+            cost += quantity * premium
+            self.legs.append((asset, quantity, premium))
+        self.payoff = PiecewiseLinearPayoff(kinks, weights, intercept, slope)
+        self.profit = self.payoff.shift(-cost)
+
+    def __repr__(self) -> str:
+        legs = ", ".join(f"{quantity:+g} {asset}" for asset, quantity, _ in self.legs)
+        return f"{self.__class__.__name__}({legs})"
+
+    @property
+    def cost(self) -> float:
+        """Net premium paid to enter the strategy (negative for a net credit)."""
+        return sum(quantity * premium for _, quantity, premium in self.legs)
+
+    def profit_at(self, ST) -> np.ndarray:
+        """
+        Profit at expiration, premiums included.
+
+        Parameters
+        ----------
+        ST : float or array-like
+            Underlying prices at expiration.
+
+        Returns
+        -------
+        numpy.ndarray
+            The profit at each price.
+        """
+        return self.profit(ST)
+
+    def breakevens(self) -> np.ndarray:
+        """Sorted underlying prices at which the profit at expiration is zero."""
+        return self.profit.roots()
+
+    def max_profit(self) -> float:
+        """Largest profit at expiration over ST >= 0 (inf if unbounded)."""
+        return self.profit.maximum()
+
+    def max_loss(self) -> float:
+        """Largest loss at expiration over ST >= 0, as a positive number (inf if unbounded)."""
+        return -self.profit.minimum()
+
+    #################################
+    # Common strategies
+    #################################
+
+    @classmethod
+    def vertical_spread(cls, underlying, lower_strike, upper_strike, expiration, option_type="C",
+                        premiums=None, multiplier=100) -> "Strategy":
+        """
+        Long the lower strike and short the upper strike (bull call or bull put spread).
+
+        `premiums` optionally gives the premium of each leg, in leg order. Use a
+        negative quantity through `Strategy` directly for the bear version.
+        """
+        options = [Option(underlying, k, expiration, option_type, multiplier=multiplier)
+                   for k in (lower_strike, upper_strike)]
+        return cls._from_options(options, [1, -1], premiums)
+
+    @classmethod
+    def straddle(cls, underlying, strike, expiration, premiums=None, multiplier=100) -> "Strategy":
+        """Long a call and a put with the same strike."""
+        options = [Option(underlying, strike, expiration, t, multiplier=multiplier) for t in ("C", "P")]
+        return cls._from_options(options, [1, 1], premiums)
+
+    @classmethod
+    def strangle(cls, underlying, put_strike, call_strike, expiration, premiums=None, multiplier=100) -> "Strategy":
+        """Long a put and a call with different strikes."""
+        options = [Option(underlying, put_strike, expiration, "P", multiplier=multiplier),
+                   Option(underlying, call_strike, expiration, "C", multiplier=multiplier)]
+        return cls._from_options(options, [1, 1], premiums)
+
+    @classmethod
+    def butterfly(cls, underlying, lower_strike, middle_strike, upper_strike, expiration, option_type="C",
+                  premiums=None, multiplier=100) -> "Strategy":
+        """Long the wings and short two options at the middle strike."""
+        options = [Option(underlying, k, expiration, option_type, multiplier=multiplier)
+                   for k in (lower_strike, middle_strike, upper_strike)]
+        return cls._from_options(options, [1, -2, 1], premiums)
+
+    @classmethod
+    def _from_options(cls, options, quantities, premiums):
+        premiums = [None] * len(options) if premiums is None else list(premiums)
+        if len(premiums) != len(options):
+            raise ValueError(f"Expected {len(options)} premiums, got {len(premiums)}.")
+        return cls(list(zip(options, quantities, premiums)))
+
+    @staticmethod
+    def _premium(asset):
+        price = asset.price
+        if price is None:
+            raise ValueError(f"Price is not set for {asset}. Pass the premium of the leg explicitly.")
+        return float(asset.price_at_expiration(price)) if isinstance(asset, Futures) else price
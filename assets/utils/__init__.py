@@ -4,7 +4,13 @@ Utility classes and helper functions for asset management.
 
 from .expiration_date import ExpirationDate
 from .validation import validate_type
+from .symbols import OptionSymbol, FuturesSymbol, parse_option_symbol, parse_futures_symbol, parse_option_symbols
 
 __all__ = [
     "ExpirationDate",
+    "OptionSymbol",
+    "FuturesSymbol",
+    "parse_option_symbol",
+    "parse_futures_symbol",
+    "parse_option_symbols",
 ]
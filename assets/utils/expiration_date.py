@@ -1,6 +1,7 @@
 # Contains the ExpirationDate class
 
 from datetime import datetime
+from assets.core.valuation_context import ValuationContext
 
 #################################
 # ExpirationDate Class
@@ -53,6 +54,19 @@ class ExpirationDate:
     def __repr__(self):
         return f"{self.__class__.__name__}({self.expiration_date})"
 
+    def copy(self) -> "ExpirationDate":
+        """
+        Return an independent copy of this expiration date without re-parsing it.
+
+        Returns
+        -------
+        ExpirationDate
+            A new object with the same date and fixed-time state.
+        """
+        clone = object.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
     @property
     def T(self) -> float:
         """
@@ -61,7 +75,9 @@ class ExpirationDate:
         Returns
         -------
         float
-            Time to expiration in years. If `isTimeFixed` is True, returns the fixed time.
+            Time to expiration in years. Inside a `ValuationContext` that fixes the time
+            of this date, returns that time. Otherwise, if `isTimeFixed` is True, returns
+            the fixed time.
 
         Notes
         -----
@@ -69,6 +85,11 @@ class ExpirationDate:
           current date and time.
         - Adds one extra day to include the expiration day itself.
         """
+        context = ValuationContext.current()
+        if context is not None:
+            fixed = context.fixed_time(self)
+            if fixed is not None:
+                return fixed
         if self.isTimeFixed:
             return self._fixed_time
         delta_time = self.expiration_time - datetime.now()
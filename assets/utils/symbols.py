@@ -0,0 +1,150 @@
+# Contains functions for parsing instrument names
+
+import re
+from typing import NamedTuple
+
+#################################
+# Symbol types
+#################################
+
+class OptionSymbol(NamedTuple):
+    """
+    Components of an OCC-like option symbol, as produced by `Option._make_name`.
+
+    Attributes
+    ----------
+    underlying : str
+        Name of the underlying asset.
+    expiration : str
+        Expiration date in the 'YYMMDD' format.
+    option_type : str
+        'C' for calls and 'P' for puts.
+    strike : float
+        Strike price of the option.
+    """
+    underlying: str
+    expiration: str
+    option_type: str
+    strike: float
+
+
+class FuturesSymbol(NamedTuple):
+    """
+    Components of a futures name, as produced by `Futures._make_name`.
+
+    Attributes
+    ----------
+    underlying : str
+        Name of the underlying asset.
+    month : str
+        Expiration month as a two-digit string ('01'–'12').
+    day : str
+        Expiration day as a two-digit string. Futures names do not encode the
+        expiration year, so the full expiration date cannot be recovered.
+    """
+    underlying: str
+    month: str
+    day: str
+
+
+#################################
+# Parsers
+#################################
+
+_OPTION_SYMBOL = re.compile(r"(?P<underlying>.+)(?P<expiration>\d{6})(?P<option_type>[CP])(?P<strike>\d{8,})")
+_FUTURES_SYMBOL = re.compile(r"(?P<underlying>.+)(?P<code>[FGHJKMNQUVXZ])(?P<day>\d{2})")
+_MONTHS_BY_CODE = {"F": "01", "G": "02", "H": "03", "J": "04", "K": "05", "M": "06",
+                   "N": "07", "Q": "08", "U": "09", "V": "10", "X": "11", "Z": "12"}
+
+
+def parse_option_symbol(symbol: str) -> OptionSymbol:
+    """
+    Decode an option symbol of the form underlying + YYMMDD + C/P + 8-digit strike.
+
+    This is the inverse of `Option._make_name`. The strike is encoded in thousandths,
+    so strikes are recovered up to three decimals.
+
+    Parameters
+    ----------
+    symbol : str
+        The option symbol (e.g., 'AAPL250620C00205000').
+
+    Returns
+    -------
+    OptionSymbol
+        The decoded underlying name, expiration, option type and strike.
+
+    Raises
+    ------
+    ValueError
+        If the symbol does not follow the expected format.
+    """
+    match = _OPTION_SYMBOL.fullmatch(symbol)
+    if match is None:
+        raise ValueError(f"Invalid option symbol: '{symbol}'. Expected underlying + YYMMDD + C/P + 8-digit strike.")
+    return OptionSymbol(
+        match["underlying"],
+        match["expiration"],
+        match["option_type"],
+        int(match["strike"]) / 1e3,
+    )
+
+
+def parse_futures_symbol(symbol: str) -> FuturesSymbol:
+    """
+    Decode a futures name of the form underlying + month code + two-digit day.
+
+    This is the inverse of `Futures._make_name`.
+
+    Parameters
+    ----------
+    symbol : str
+        The futures name (e.g., 'CLZ20').
+
+    Returns
+    -------
+    FuturesSymbol
+        The decoded underlying name, expiration month and expiration day.
+
+    Raises
+    ------
+    ValueError
+        If the symbol does not follow the expected format.
+    """
+    match = _FUTURES_SYMBOL.fullmatch(symbol)
+    if match is None:
+        raise ValueError(f"Invalid futures symbol: '{symbol}'. Expected underlying + month code + 2-digit day.")
+    return FuturesSymbol(match["underlying"], _MONTHS_BY_CODE[match["code"]], match["day"])
+
+
+def parse_option_symbols(symbols) -> tuple:
+    """
+    Decode many option symbols at once.
+
+    Parameters
+    ----------
+    symbols : iterable of str
+        Option symbols as produced by `Option._make_name`.
+
+    Returns
+    -------
+    tuple of lists
+        Four lists (underlyings, expirations, option_types, strikes), aligned with `symbols`.
+
+    Raises
+    ------
+    ValueError
+        If any of the symbols does not follow the expected format.
+    """
+    fullmatch = _OPTION_SYMBOL.fullmatch
+    underlyings, expirations, option_types, strikes = [], [], [], []
+    for symbol in symbols:
+        match = fullmatch(symbol)
+        if match is None:
+            raise ValueError(f"Invalid option symbol: '{symbol}'. Expected underlying + YYMMDD + C/P + 8-digit strike.")
+        underlying, expiration, option_type, strike = match.groups()
+        underlyings.append(underlying)
+        expirations.append(expiration)
+        option_types.append(option_type)
+        strikes.append(int(strike) / 1e3)
+    return underlyings, expirations, option_types, strikes
@@ -27,6 +27,10 @@ def validate_type(obj, expected_type):
 
     # Handle single object
     if not isinstance(obj, expected_type):
+        if isinstance(expected_type, tuple):
+            expected = " or ".join(t.__name__ for t in expected_type)
+        else:
+            expected = expected_type.__name__
         raise TypeError(
-            f"Expected {expected_type.__name__}, got {type(obj).__name__} instead."
+            f"Expected {expected}, got {type(obj).__name__} instead."
         )
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from assets.instruments import Stock, Currency
+from assets.price_providers import (AsyncLocalPriceProvider, LocalPriceProvider, SyncPriceProviderAdapter)
+
+
+def test_local_provider_serves_quotes():
+    stock = Stock("ASYA")
+    provider = LocalPriceProvider({"ASYA": 12.5}, previous_close={stock: 12.0}, asset_class=Stock)
+    provider.update_price(stock)
+    assert stock.price == 12.5
+    assert provider.get_previous_close_price(stock) == 12.0
+    with pytest.raises(ValueError):
+        provider.get_price(Stock("ASYB"))
+    with pytest.raises(TypeError):
+        provider.update_price(Currency("ASYC"))
+
+
+def test_async_update_price_runs_concurrently_with_bounded_concurrency():
+    stocks = [Stock(f"ASYD{i}") for i in range(6)]
+    provider = AsyncLocalPriceProvider({s: float(i) for i, s in enumerate(stocks)}, latency=0.05, max_concurrency=3)
+
+    start = time.perf_counter()
+    asyncio.run(provider.update_price(stocks))
+    elapsed = time.perf_counter() - start
+    assert [s.price for s in stocks] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert 0.09 < elapsed < 0.3  # two waves of three fetches
+
+
+def test_async_timeout_and_failure_leave_prices_untouched():
+    stock = Stock("ASYE", price=1.0)
+    slow = AsyncLocalPriceProvider({stock: 2.0}, latency=0.5, timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(slow.update_price(stock))
+    missing = AsyncLocalPriceProvider({stock: 2.0})
+    with pytest.raises(ValueError):
+        asyncio.run(missing.update_price([stock, Stock("ASYF")]))
+    assert stock.price == 1.0
+
+
+def test_cancelling_a_batch_cancels_pending_fetches():
+    stocks = [Stock(f"ASYG{i}") for i in range(3)]
+    provider = AsyncLocalPriceProvider({s: 1.0 for s in stocks}, latency=10)
+
+    async def main():
+        task = asyncio.ensure_future(provider.get_prices(stocks))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
+
+
+def test_sync_adapter_offloads_to_executor():
+    stocks = [Stock(f"ASYH{i}") for i in range(4)]
+    adapter = SyncPriceProviderAdapter(LocalPriceProvider({s: 3.0 for s in stocks}, latency=0.05),
+                                       max_concurrency=4)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        tick_task = asyncio.ensure_future(ticker())
+        await adapter.update_price(stocks)
+        tick_task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > 3  # the event loop kept running while fetching
+    assert all(s.price == 3.0 for s in stocks)
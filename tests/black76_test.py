@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from assets.instruments import Stock, Futures, Option
+from assets.pricing import black76_greeks, black76_price, value_options, aggregate_by_underlying
+
+
+def test_black76_put_call_parity_and_greeks():
+    F, K, T, sigma, r = 100.0, np.array([90.0, 100.0, 110.0]), 0.5, 0.25, 0.03
+    call = black76_price(F, K, T, sigma, r, "C")
+    put = black76_price(F, K, T, sigma, r, "P")
+    np.testing.assert_allclose(call - put, np.exp(-r * T) * (F - K))
+
+    g = black76_greeks(F, K, T, sigma, r, "C")
+    h = 1e-4
+    np.testing.assert_allclose(g.delta, (black76_price(F + h, K, T, sigma, r) - black76_price(F - h, K, T, sigma, r)) / (2 * h), rtol=1e-6)
+    np.testing.assert_allclose(g.gamma, (black76_price(F + h, K, T, sigma, r) - 2 * call + black76_price(F - h, K, T, sigma, r)) / h ** 2, rtol=1e-3)
+    np.testing.assert_allclose(g.vega, (black76_price(F, K, T, sigma + h, r) - black76_price(F, K, T, sigma - h, r)) / (2 * h), rtol=1e-6)
+    np.testing.assert_allclose(g.theta, -(black76_price(F, K, T + h, sigma, r) - black76_price(F, K, T - h, sigma, r)) / (2 * h), rtol=1e-5)
+
+
+def test_black76_expired_options_are_intrinsic():
+    np.testing.assert_allclose(black76_price(100, [90, 110], 0.0, 0.2, 0.05, ["C", "P"]), [10.0, 10.0])
+
+
+def test_options_on_futures_roll_risk_to_true_underlying():
+    stock = Stock("BLKA", price=100)
+    fut = Futures(stock, expiration="451220", forward_price=100, contract_size=50, price=102)
+    fut.expiration.fix_time(1.0)
+    option = Option(fut, strike=100, expiration="451120", option_type="C", multiplier=50)
+    option.expiration.fix_time(0.5)
+    spot_option = Option(stock, strike=100, expiration="451120", option_type="P")
+    spot_option.expiration.fix_time(0.5)
+
+    r = 0.02
+    val = value_options([option, spot_option], sigma=0.3, r=r)
+    np.testing.assert_allclose(val.price[0], 50 * black76_price(102, 100, 0.5, 0.3, r, "C"))
+    np.testing.assert_allclose(val.forward, [102, 100 * np.exp(r * 0.5)])
+    np.testing.assert_allclose(val.futures_equivalent[0], val.underlying_delta[0] / 50)
+    assert np.isnan(val.futures_equivalent[1])
+    np.testing.assert_allclose(val.delta[0], val.underlying_delta[0] * np.exp(r * 1.0))
+    np.testing.assert_allclose(val.gamma[0], 50 * black76_greeks(102, 100, 0.5, 0.3, r).gamma * np.exp(2 * r))
+    assert val.true_underlyings == [stock, stock]
+
+    # Spot options reduce to Black-Scholes: check delta by bumping the stock price.
+    h = 1e-3
+    stock.set_price(100 + h)
+    up = value_options([spot_option], 0.3, r).price[0]
+    stock.set_price(100 - h)
+    down = value_options([spot_option], 0.3, r).price[0]
+    stock.set_price(100)
+    np.testing.assert_allclose(val.delta[1], (up - down) / (2 * h), rtol=1e-6)
+
+    totals = aggregate_by_underlying(val.true_underlyings, val.delta, val.gamma, quantities=[2, -1])
+    np.testing.assert_allclose(totals[stock], (2 * val.delta[0] - val.delta[1], 2 * val.gamma[0] - val.gamma[1]))
+
+
+def test_value_options_requires_underlying_prices():
+    option = Option(Stock("BLKB"), strike=1, expiration="451120", option_type="C")
+    with pytest.raises(ValueError):
+        value_options([option], 0.2)
+    with pytest.raises(TypeError):
+        value_options([Stock("BLKB")], 0.2)
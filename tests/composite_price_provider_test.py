@@ -0,0 +1,83 @@
+import asyncio
+import os
+import threading
+import pytest
+from assets.instruments import Stock, Currency, Futures, Option
+from assets.price_providers import (AsyncLocalPriceProvider, CompositePriceProvider, LocalPriceProvider,
+                                    YFinanceOptionChainProvider)
+from assets.price_providers.option_price_providers import RecordedChainSource
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "option_chains")
+
+
+def test_mixed_batch_is_routed_per_class_with_fallbacks():
+    stocks = [Stock(f"CMPA{i}") for i in range(3)]
+    fx = Currency("CMPEUR")
+    future = Futures(stocks[0], expiration="451220", forward_price=1, contract_size=1)
+    primary = LocalPriceProvider({stocks[0]: 10.0, stocks[1]: 11.0}, asset_class=Stock)
+    fallback = LocalPriceProvider({stocks[2]: 12.0}, asset_class=Stock)
+    fx_provider = AsyncLocalPriceProvider({"CMPEUR": 1.1}, asset_class=Currency)
+    provider = CompositePriceProvider({Stock: primary, Currency: fx_provider}, fallbacks={Stock: fallback})
+
+    errors = provider.refresh([fx, *stocks, future])
+    assert [s.price for s in stocks] == [10.0, 11.0, 12.0]
+    assert fx.price == 1.1
+    assert list(errors) == [future] and isinstance(errors[future], TypeError)
+    with pytest.raises(ValueError):
+        provider.update_price([fx, future])
+    assert provider.get_price(stocks[2]) == 12.0
+    with pytest.raises(ValueError):
+        provider.get_price(Stock("CMPB"))
+
+
+class RendezvousProvider(LocalPriceProvider):
+    """Local provider whose fetches wait until every partition has started fetching."""
+
+    def __init__(self, prices, asset_class, barrier):
+        super().__init__(prices, asset_class=asset_class)
+        self.barrier = barrier
+
+    def get_price(self, asset) -> float:
+        self.barrier.wait()  # raises BrokenBarrierError unless the other partition fetches at the same time
+        return super().get_price(asset)
+
+
+def test_partitions_are_fetched_concurrently():
+    stock, fx = Stock("CMPC"), Currency("CMPGBP")
+    barrier = threading.Barrier(2, timeout=5)
+    provider = CompositePriceProvider({
+        Stock: RendezvousProvider({stock: 5.0}, Stock, barrier),
+        Currency: RendezvousProvider({fx: 1.3}, Currency, barrier),
+    })
+    result = provider.get_prices([stock, fx])
+    assert result.prices == {stock: 5.0, fx: 1.3} and result.errors == {}
+
+
+def test_partitions_use_the_batch_path_of_their_provider():
+    requests = []
+
+    class CountingSource(RecordedChainSource):
+        def fetch(self, ticker, expiration):
+            requests.append((ticker, expiration))
+            return super().fetch(ticker, expiration)
+
+    underlying = Stock("CHNA", price=100)
+    provider = CompositePriceProvider({Option: YFinanceOptionChainProvider(CountingSource(FIXTURES))})
+    options = [Option(underlying, k, "450616", t) for k in (90, 100) for t in ("C", "P")]
+    unquoted = Option(underlying, 95, "450616", "C")
+    errors = provider.refresh(options + [unquoted])
+
+    assert requests == [("CHNA", "2045-06-16")]
+    assert [o.price for o in options] == pytest.approx([1240.0, 85.0, 510.0, 420.0])
+    assert list(errors) == [unquoted]
+
+
+def test_async_providers_can_be_used_from_a_running_event_loop():
+    fx = Currency("CMPCHF")
+    provider = CompositePriceProvider({Currency: AsyncLocalPriceProvider({"CMPCHF": 1.2}, asset_class=Currency)})
+
+    async def fetch():
+        return provider.get_price(fx), provider.get_prices([fx])
+
+    price, result = asyncio.run(fetch())
+    assert price == 1.2 and result.prices == {fx: 1.2}
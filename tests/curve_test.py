@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from assets.instruments import Stock, Option, create_futures
+from assets.pricing import RateCurve, futures_fair_value, value_options
+
+
+def test_rate_curve_interpolation_and_discounting():
+    curve = RateCurve([0.5, 1.0, 2.0], [0.02, 0.03, 0.04])
+    np.testing.assert_allclose(curve.zero_rate([0.25, 0.75, 1.5, 5.0]), [0.02, 0.025, 0.035, 0.04])
+    np.testing.assert_allclose(curve.discount_factor(1.0), np.exp(-0.03))
+    np.testing.assert_allclose(curve.discount([100, 200], [1.0, 2.0]), [100 * np.exp(-0.03), 200 * np.exp(-0.08)])
+    np.testing.assert_allclose(curve.forward_rate(1.0, 2.0), 0.05)
+
+    from_dfs = RateCurve([1.0, 2.0], discount_factors=np.exp([-0.03, -0.08]), interpolation="log_linear")
+    np.testing.assert_allclose(from_dfs.zero_rate([1.0, 2.0]), [0.03, 0.04])
+    np.testing.assert_allclose(from_dfs.forward_rate(1.25, 1.75), 0.05)  # piecewise-constant forwards
+    np.testing.assert_allclose(from_dfs.zero_rate(0.5), 0.03)
+
+    with pytest.raises(ValueError):
+        RateCurve([1.0], [0.01], discount_factors=[0.99])
+    with pytest.raises(ValueError):
+        RateCurve([0.0, 1.0], [0.01, 0.02])
+
+
+def test_futures_strip_fair_value_and_basis():
+    spot = Stock("CRVA", price=100)
+    strip = create_futures(spot, ["450320", "450620", "450920"], [100, 101, 102], 10, prices=[101, 102, None])
+    for f, T in zip(strip, [0.25, 0.5, 0.75]):
+        f.expiration.fix_time(T)
+    rates, dividends = RateCurve.flat(0.04), RateCurve.flat(0.01)
+    fv = futures_fair_value(strip, rates, dividends)
+    expected = 100 * np.exp(0.03 * np.array([0.25, 0.5, 0.75]))
+    np.testing.assert_allclose(fv.fair_forward, expected)
+    np.testing.assert_allclose(fv.basis[:2], [101, 102] - expected[:2])
+    assert np.isnan(fv.basis[2])
+    np.testing.assert_allclose(fv.value, 10 * (expected - [100, 101, 102]))
+
+
+def test_value_options_accepts_curves():
+    stock = Stock("CRVB", price=100)
+    option = Option(stock, strike=100, expiration="450620", option_type="C")
+    option.expiration.fix_time(0.5)
+    curve = RateCurve([0.25, 1.0], [0.01, 0.03])
+    flat = value_options([option], 0.2, r=0.01 + 0.02 / 3)
+    curved = value_options([option], 0.2, r=curve)
+    np.testing.assert_allclose(curved.price, flat.price)
@@ -0,0 +1,31 @@
+from datetime import datetime
+from assets.core import Asset
+from assets.instruments import Stock, Futures, Option, create_options
+
+
+def test_reverse_index_tracks_direct_and_transitive_derivatives():
+    stock = Stock("REVA", price=100)
+    fut = Futures(stock, expiration="451220", forward_price=100, contract_size=10)
+    calls = create_options(stock, [90, 100, 110], "451120", "C")
+    put = Option(stock, 95, "460115", "P")
+    on_fut = Option(fut, 100, "451115", "C")
+
+    assert stock.derivatives() == [fut, *calls, put]
+    assert stock.derivatives(Option) == [*calls, put]
+    assert stock.derivatives(transitive=True) == [fut, *calls, put, on_fut]
+    assert fut.derivatives() == [on_fut]
+    assert stock.derivatives(Option, min_strike=95, max_strike=105) == [calls[1], put]
+    assert stock.derivatives(end=datetime(2046, 1, 1)) == [fut, *calls]
+    assert stock.derivatives(Option, transitive=True, start=datetime(2045, 11, 17)) == [*calls, put]
+    # Re-construction does not duplicate entries.
+    Option(stock, 95, "460115", "P")
+    assert stock.derivatives(Option) == [*calls, put]
+
+
+def test_eviction_removes_settled_derivatives():
+    stock = Stock("REVB", price=120)
+    expired = Option(stock, 100, "450105", "C")
+    live = Option(stock, 100, "460105", "C")
+    Option.settle_expired(now=datetime(2045, 2, 1))
+    assert expired not in Asset.derivative_index
+    assert stock.derivatives() == [live]
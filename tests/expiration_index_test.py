@@ -0,0 +1,114 @@
+from datetime import datetime
+from assets.core import Asset, Derivative
+from assets.instruments import Stock, Futures, Option, create_options
+
+
+def test_index_tracks_constructed_and_bulk_created_derivatives():
+    stock = Stock("EXPA", price=100)
+    late = Futures(stock, expiration="450301", forward_price=100, contract_size=10)
+    early = create_options(stock, [90, 110], "450110", "C")
+    mid = Option(stock, 100, "450120", "P")
+    assert all(d in Asset.expiration_index for d in early + [mid, late])
+    assert stock not in Asset.expiration_index
+
+    now = datetime(2045, 1, 12)
+    window = Derivative.expiring_within(10, now=now)
+    assert mid in window and late not in window and early[0] not in window
+    assert Option.expiring_within(60, now=now) == [d for d in Asset.expiration_index.expiring_within(60, now)
+                                                   if isinstance(d, Option)]
+    assert Futures.expiring_within(60, now=now) == [late]
+    assert set(early) <= set(Asset.expiration_index.expiring(datetime(2045, 1, 10), datetime(2045, 1, 12)))
+    # Re-constructing an indexed contract does not duplicate it.
+    size = len(Asset.expiration_index)
+    Option(stock, 100, "450120", "P")
+    assert len(Asset.expiration_index) == size
+
+
+def test_settle_expired_sets_final_values_and_evicts():
+    stock = Stock("EXPB", price=105)
+    unpriced = Option(Stock("EXPC"), 10, "450210", "C")
+    call, put = create_options(stock, [100, 100], "450210", ["C", "P"])
+    live = Option(stock, 100, "450310", "C")
+
+    settled = Option.settle_expired(now=datetime(2045, 2, 20))
+    assert settled[call] == 500 and settled[put] == 0
+    assert unpriced not in settled and live not in settled
+    assert call.price == 500
+    assert call not in Asset.expiration_index and live in Asset.expiration_index
+    assert unpriced in Asset.expiration_index
+    assert Option(stock, 100, "450210", "C") is not call
+
+
+def test_settled_futures_keep_a_quote_and_evicted_contracts_are_freed():
+    import gc
+    import weakref
+
+    stock = Stock("EXPD", price=120)
+    fut = Futures(stock, expiration="450215", forward_price=100, contract_size=10)
+    option = Option(stock, 100, "450215", "C")
+    option_ref = weakref.ref(option)
+    option_id = option.id
+
+    settled = Derivative.settle_expired(now=datetime(2045, 2, 20))
+    assert settled[fut] == 200 and settled[option] == 2000
+    assert fut.price == 120
+    assert option.price == 2000
+    assert Asset.price_book.asset(option_id) is None
+
+    del settled, option
+    gc.collect()
+    assert option_ref() is None
+    assert Asset.price_book.get(option_id) == 2000
+
+
+def test_single_adds_are_merged_in_expiry_order():
+    stock = Stock("EXPE")
+    dates = ["450905", "450901", "450903", "450902", "450904"]
+    options = [Option(stock, 10, d, "C") for d in dates]
+    Asset.expiration_index.remove(options[2])
+    assert options[2] not in Asset.expiration_index
+    expiring = Asset.expiration_index.expiring(datetime(2045, 9, 1), datetime(2045, 9, 7))
+    assert expiring == [options[i] for i in (1, 3, 4, 0)]
+    Asset.expiration_index.add(options[2])
+    expiring = Asset.expiration_index.expiring(datetime(2045, 9, 1), datetime(2045, 9, 7))
+    assert expiring == [options[i] for i in (1, 3, 2, 4, 0)]
+
+
+
+def test_concurrent_adds_and_queries_keep_the_index_consistent():
+    import sys
+    import threading
+    from assets.core.expiration_index import ExpirationIndex
+
+    stock = Stock("EXPF")
+    options = create_options(stock, [float(k) for k in range(1, 201)], "451010", "C")
+    index = ExpirationIndex()
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def churn(chunk):
+        barrier.wait()
+        try:
+            for _ in range(50):
+                for option in chunk:
+                    index.add(option)
+                    index.expired(datetime(2000, 1, 1))  # merges the pending adds
+                index.remove_many(chunk)
+            index.add_many(chunk)
+        except Exception as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=churn, args=(options[i::8],)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    expiring = index.expiring()
+    assert len(expiring) == len(index) == 200
+    assert {o._id for o in expiring} == {o._id for o in options}
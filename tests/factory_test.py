@@ -0,0 +1,76 @@
+import pytest
+from assets.instruments import (Stock, Futures, Option, create_options, create_futures,
+                                options_from_symbols, options_from_csv, futures_from_csv)
+from assets.utils import parse_option_symbol, parse_futures_symbol
+
+
+def test_parse_option_symbol_inverts_make_name():
+    underlying = Stock("FCTA")
+    option = Option(underlying, strike=205.5, expiration="450620", option_type="put")
+    parsed = parse_option_symbol(option.name)
+    assert parsed == ("FCTA", "450620", "P", 205.5)
+    assert parse_option_symbol("BRK.B250620C00450000").underlying == "BRK.B"
+    with pytest.raises(ValueError):
+        parse_option_symbol("FCTA450620X00205500")
+
+
+def test_parse_futures_symbol_inverts_make_name():
+    fut = Futures(Stock("FCTB"), expiration="451220", forward_price=10, contract_size=100)
+    assert parse_futures_symbol(fut.name) == ("FCTB", "12", "20")
+    with pytest.raises(ValueError):
+        parse_futures_symbol("FCTB20")
+
+
+def test_create_options_matches_constructor():
+    underlying = Stock("FCTC", price=100)
+    options = create_options(underlying, [90, 100, 110, 100], "450620", ["C", "call", "P", "C"],
+                             prices=[12.0, None, 9.5, 6.0])
+    assert [o.name for o in options[:3]] == [
+        Option._make_name(underlying, k, "450620", t) for k, t in ((90, "C"), (100, "C"), (110, "P"))
+    ]
+    assert options[1] is options[3]
+    assert options[3].price == 6.0
+    assert options[2].option_type == "P" and options[2].strike == 110
+    assert options[0].expiration is not options[2].expiration
+    assert Option(underlying, 90, "450620", "C", price=12.0) is options[0]
+    assert underlying.price == 100
+
+
+def test_create_options_validates_columns():
+    with pytest.raises(ValueError):
+        create_options("FCTD", [90, 100], "450620", ["C", "X"])
+    with pytest.raises(ValueError):
+        create_options("FCTD", [90, float("nan")], "450620", "C")
+    with pytest.raises(ValueError):
+        create_options("FCTD", [90, 100], ["450620", "451340"], "C")
+    with pytest.raises(ValueError):
+        create_options("FCTD", [90, 100, 110], ["450620", "450620"], "C")
+
+
+def test_create_futures_and_symbols():
+    futs = create_futures(["FCTE", "FCTF"], ["450320", "450620"], [50.0, 60.0], 1000, prices=[49.0, 61.0])
+    assert [f.name for f in futs] == ["FCTEH20", "FCTFM20"]
+    assert futs[0].price_at_expiration(51) == 1000
+    assert isinstance(futs[1].underlying, Stock)
+    opts = options_from_symbols(["FCTE450320C00055000", "FCTE450320P00045000"], underlyings=futs[0], multiplier=1)
+    assert opts[0].underlying is futs[0]
+    assert opts[1].strike == 45 and opts[1].multiplier == 1
+
+
+def test_instruments_from_csv(tmp_path):
+    path = tmp_path / "options.csv"
+    path.write_text("underlying,strike,expiration,option_type,price\n"
+                    "FCTG,10,450620,C,1.5\n"
+                    "FCTG,12,450620,P,\n")
+    options = options_from_csv(path, price="price")
+    assert [o.name for o in options] == ["FCTG450620C00010000", "FCTG450620P00012000"]
+    assert options[0].price == 1.5 and options[1].price is None
+
+    path = tmp_path / "symbols.csv"
+    path.write_text("symbol\nFCTG450620C00010000\n")
+    assert options_from_csv(path, symbol="symbol") == options[:1]
+
+    path = tmp_path / "futures.csv"
+    path.write_text("underlying,expiration,forward_price,contract_size\nFCTH,450920,3.5,5000\n")
+    fut, = futures_from_csv(path)
+    assert fut.name == "FCTHU20" and fut.contract_size == 5000
@@ -0,0 +1,66 @@
+import pickle
+import numpy as np
+import pytest
+from assets.core import Asset, ValuationContext
+from assets.instruments import Stock, Currency, Futures, Option
+from assets.pricing import FXSnapshot, value_portfolio
+
+
+def _book():
+    eur = Currency("FXTEUR", exchange_rate=1.10)
+    jpy = Currency("FXTJPY", exchange_rate=0.0070)
+    sap = Stock("FXTA", price=200, currency=eur)
+    toyota = Stock("FXTB", price=3000, currency="FXTJPY")
+    apple = Stock("FXTC", price=150)
+    call = Option(sap, strike=200, expiration="451120", option_type="C", price=900)
+    return eur, jpy, sap, toyota, apple, call
+
+
+def test_instruments_carry_a_denomination_currency():
+    eur, jpy, sap, toyota, apple, call = _book()
+    assert sap.currency is eur and toyota.currency is jpy and apple.currency is None
+    assert call.currency is eur
+    future = Futures(toyota, expiration="451220", forward_price=3000, contract_size=100)
+    assert future.currency is jpy
+    assert Stock("FXTA").currency is eur
+    call.set_currency("USD")
+    assert call.currency.name == "USD" and call.currency.price == 1.0
+    call.set_currency(None)
+    assert call.currency is eur
+    with pytest.raises(TypeError):
+        sap.set_currency(3)
+    assert pickle.loads(pickle.dumps(sap)).currency is eur
+
+
+def test_portfolio_is_converted_in_one_step_with_a_shared_snapshot():
+    eur, jpy, sap, toyota, apple, call = _book()
+    positions = {sap: 10, toyota: 100, apple: 5, call: -2}
+    result = value_portfolio(positions, reporting="FXTEUR")
+
+    np.testing.assert_allclose(result.local_values, [2000, 300000, 750, -1800])
+    expected = np.array([2000, 300000 * 0.007 / 1.1, 750 / 1.1, -1800])
+    np.testing.assert_allclose(result.values, expected)
+    assert list(result.currencies) == ["FXTEUR", "FXTJPY", "USD", "FXTEUR"]
+    assert result.by_currency["FXTEUR"] == pytest.approx(200)
+    assert result.total == pytest.approx(expected.sum())
+
+    fx = FXSnapshot()
+    eur.set_price(1.2)
+    assert value_portfolio(positions, "FXTEUR", fx).total == pytest.approx(result.total)
+    assert fx.rate("FXTEUR", "FXTJPY") == pytest.approx(1.1 / 0.007)
+    with ValuationContext({jpy: 0.0065}):
+        assert value_portfolio(positions, "USD").values[1] == pytest.approx(300000 * 0.0065)
+    with pytest.raises(ValueError):
+        value_portfolio(positions, reporting="FXTCHF")
+    assert "Currency(FXTCHF)" not in Asset._assets
+    assert FXSnapshot(["FXTCHF"], rates={"fxtchf": 0.9}).usd_rate("FXTCHF") == 0.9
+    with pytest.raises(ValueError):
+        value_portfolio({Stock("FXTD", currency="FXTEUR"): 1})
+
+
+def test_futures_are_valued_per_contract():
+    eur, jpy, sap, toyota, apple, call = _book()
+    future = Futures(sap, expiration="451220", forward_price=190, contract_size=100, price=210)
+    result = value_portfolio({future: 2}, reporting="USD")
+    assert result.local_values[0] == pytest.approx(2 * 100 * 210)
+    assert result.values[0] == pytest.approx(2 * 100 * 210 * 1.1)
@@ -0,0 +1,70 @@
+import os
+import pytest
+from assets.instruments import Stock, Option
+from assets.price_providers import YFinanceOptionChainProvider
+from assets.price_providers.option_price_providers import RecordedChainSource
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "option_chains")
+
+
+class CountingSource(RecordedChainSource):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.requests = []
+
+    def fetch(self, ticker, expiration):
+        self.requests.append((ticker, expiration))
+        return super().fetch(ticker, expiration)
+
+
+def test_get_chain_interns_options_with_quotes():
+    underlying = Stock("CHNA", price=100)
+    existing = Option(underlying, 100, "450616", "C")
+    provider = YFinanceOptionChainProvider(RecordedChainSource(FIXTURES))
+    options = provider.get_chain(underlying, "450616")
+
+    assert len(options) == 6
+    assert options[1] is existing
+    assert existing.price == pytest.approx(510.0)
+    assert (existing.bid, existing.ask) == (pytest.approx(500.0), pytest.approx(520.0))
+    assert existing.open_interest == 1450
+    assert existing.implied_volatility == 0.21
+    assert [o.option_type for o in options] == ["C"] * 3 + ["P"] * 3
+    assert options[5].strike == 110 and options[5].price is None
+    assert options[5].open_interest is None and options[5].bid == pytest.approx(1060.0)
+
+
+def test_update_price_issues_one_request_per_chain():
+    underlying = Stock("CHNA", price=100)
+    source = CountingSource(FIXTURES)
+    provider = YFinanceOptionChainProvider(source)
+    options = [Option(underlying, k, "450616", t) for k in (90, 100) for t in ("C", "P")]
+    provider.update_price(options)
+
+    assert source.requests == [("CHNA", "2045-06-16")]
+    assert [o.price for o in options] == pytest.approx([1240.0, 85.0, 510.0, 420.0])
+    assert provider.get_previous_close_price(options[0]) == pytest.approx(1200.0)
+
+
+def test_update_price_reports_unquoted_options():
+    underlying = Stock("CHNA", price=100)
+    provider = YFinanceOptionChainProvider(RecordedChainSource(FIXTURES))
+    with pytest.raises(ValueError):
+        provider.update_price(Option(underlying, 95, "450616", "C"))
+    with pytest.raises(ValueError):
+        provider.get_chain(underlying, "451215")
+    with pytest.raises(TypeError):
+        provider.update_price(underlying)
+
+
+def test_contracts_not_traded_in_the_fetched_chain_are_not_reported_as_fetched():
+    underlying = Stock("CHNA", price=100)
+    provider = YFinanceOptionChainProvider(RecordedChainSource(FIXTURES))
+    untraded = Option(underlying, 110, "450616", "P", price=999.0)
+    traded = Option(underlying, 90, "450616", "C")
+    results = provider.fetch_prices([untraded, traded])
+
+    assert isinstance(results[0], ValueError) and results[1] == pytest.approx(1240.0)
+    assert untraded.price == 999.0
+    with pytest.raises(ValueError):
+        provider.update_price(untraded)
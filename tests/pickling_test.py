@@ -0,0 +1,49 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from assets import AssetBatch
+from assets.core import Asset
+from assets.instruments import Stock, Futures, Option, create_options
+from assets.pricing import value_options
+
+
+def _value(options):
+    return value_options(list(options), 0.3).price.tolist(), [o.underlying.underlying.name for o in options]
+
+
+def test_pickle_round_trip_reinterns_and_preserves_links():
+    stock = Stock("PKLA", price=100)
+    fut = Futures(stock, expiration="451220", forward_price=100, contract_size=10, price=101)
+    options = [Option(fut, k, "451120", "C", multiplier=10) for k in (95, 105)]
+    options[0].expiration.fix_time(0.5)
+
+    restored = pickle.loads(pickle.dumps(options))
+    assert restored == options  # already registered: same instances
+    assert pickle.loads(pickle.dumps(AssetBatch(options))).assets == options
+
+    # Simulate a fresh process by evicting the assets from the registry.
+    Asset._unregister_many([stock, fut, *options])
+    restored = pickle.loads(pickle.dumps(options))
+    assert restored[0] is not options[0]
+    assert restored[0].underlying is restored[1].underlying
+    assert restored[0].underlying.underlying is Stock("PKLA")
+    assert restored[0].expiration.T == 0.5
+    assert restored[0].underlying.price == 101
+    assert Option(restored[0].underlying, 95, "451120", "C", multiplier=10) is restored[0]
+
+
+def test_batches_are_valued_in_worker_processes():
+    stock = Stock("PKLB", price=100)
+    fut = Futures(stock, expiration="451220", forward_price=100, contract_size=10, price=100)
+    options = create_options(fut, np.arange(50.0, 150.0), "451120", "C", multiplier=10)
+    for o in options:
+        o.expiration.fix_time(0.5)
+    batch = AssetBatch(options)
+    assert len(pickle.dumps(batch)) < len(pickle.dumps(options))
+
+    expected = value_options(options, 0.3).price
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        prices, names = pool.submit(_value, batch).result()
+    np.testing.assert_allclose(prices, expected)
+    assert names == ["PKLB"] * 100
@@ -0,0 +1,109 @@
+import numpy as np
+from assets.core import Asset, PriceBook
+from assets.instruments import Stock, Option, create_options
+
+
+def test_assets_get_stable_ids_and_prices_live_in_price_book():
+    a = Stock("PBKA", price=10)
+    b = Stock("PBKB")
+    assert Stock("PBKA", price=10).id == a.id
+    assert b.id != a.id
+    assert Asset.price_book.asset(a.id) is a
+    assert Asset.price_book.prices[a.id] == 10
+    assert np.isnan(Asset.price_book.prices[b.id])
+    assert b.price is None
+
+
+def test_bulk_reads_and_writes_by_id():
+    stocks = [Stock(f"PBKC{i}") for i in range(5)]
+    ids = Asset.price_book.ids(stocks)
+    Asset.price_book.set_prices(ids, np.arange(5.0))
+    assert [s.price for s in stocks] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    stocks[2].set_price(None)
+    np.testing.assert_array_equal(Asset.price_book.get_prices(ids[[1, 2]]), [1.0, np.nan])
+
+
+def test_bulk_factory_assigns_ids_and_prices():
+    options = create_options(Stock("PBKD"), [1, 2], "450620", "C", prices=[0.5, None])
+    assert options[1].id == options[0].id + 1
+    assert options[0].price == 0.5 and options[1].price is None
+    assert Option(Stock("PBKD"), 2, "450620", "C").id == options[1].id
+
+
+def test_price_book_grows():
+    book = PriceBook(capacity=2)
+    ids = book.register_many(["a", "b", "c"])
+    book.set_prices(ids, [1.0, 2.0, 3.0])
+    assert book.register("d") == 3
+    assert len(book) == 4
+    np.testing.assert_array_equal(book.prices, [1.0, 2.0, 3.0, np.nan])
+    assert book.get(3) is None and book.get(2) == 3.0
+
+
+def test_prices_record_time_and_source_and_stale_selection():
+    from assets.price_providers import LocalPriceProvider
+    from assets.price_providers.price_provider import stale_assets
+
+    stocks = [Stock(f"PBKF{i}") for i in range(4)]
+    stocks[0].set_price(1.0, as_of=1000.0, source="feed")
+    stocks[1].set_price(2.0, as_of=1090.0)
+    Asset.price_book.set_prices(Asset.price_book.ids(stocks[2:3]), 3.0)
+    assert stocks[0].price_timestamp == 1000.0 and stocks[0].price_source == "feed"
+    assert stocks[2].price_timestamp is None and stocks[3].price_timestamp is None
+    assert stale_assets(stocks, max_age=30, now=1100.0) == [stocks[0], stocks[2], stocks[3]]
+
+    provider = LocalPriceProvider({s: 9.0 for s in stocks}, asset_class=Stock)
+    stocks[0].set_price(1.0)
+    provider.update_price(stocks, max_age=60)
+    assert [s.price for s in stocks] == [1.0, 9.0, 9.0, 9.0]
+    assert stocks[1].price_source is provider and stocks[0].price_source is None
+    stocks[1].set_price(None)
+    assert stocks[1].price_timestamp is None and stocks[1].price_source is None
+
+
+def test_concurrent_registration_hands_out_distinct_ids_and_keeps_prices():
+    import sys
+    import threading
+
+    book = PriceBook(capacity=1)
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def register():
+        barrier.wait()
+        try:
+            for _ in range(10000):
+                book.set(book.register(None), 1.0)
+        except Exception as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=register) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert len(book) == 80000
+    assert not np.isnan(book.prices).any()
+
+
+def test_concurrent_construction_hands_out_distinct_ids():
+    import threading
+
+    def build(t):
+        for i in range(2000):
+            Stock(f"PBKT{t}_{i}")
+
+    threads = [threading.Thread(target=build, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stocks = [Stock(f"PBKT{t}_{i}") for t in range(8) for i in range(2000)]
+    assert len(set(Asset.price_book.ids(stocks).tolist())) == len(stocks)
+    assert all(Asset.price_book.asset(s.id) is s for s in stocks)
@@ -0,0 +1,43 @@
+import json
+from assets.core import Asset, profiler
+from assets.instruments import Stock, Option, Futures, create_options
+from assets.price_providers import LocalPriceProvider
+from assets.utils import ExpirationDate, validation
+from assets.price_providers import price_provider
+
+
+def test_profiler_counts_constructions_hits_and_registry_growth():
+    with profiler:
+        stock = Stock("PRFB", price=100)
+        Stock("PRFB")
+        Stock("PRFB")
+        Option(stock, 100, "450616", "C")
+        create_options(stock, [90, 100, 110], "450616", "P")
+        Futures(stock, "451219", forward_price=100, contract_size=10)
+        LocalPriceProvider({stock: 1.0}, asset_class=Stock).update_price([stock, stock])
+        snapshot = profiler.snapshot()
+
+    classes = snapshot["classes"]
+    assert (classes["Stock"]["constructed"], classes["Stock"]["hits"]) == (1, 2)
+    assert classes["Option"]["constructed"] == 1 and classes["Option"]["bulk_registered"] == 3
+    assert classes["Futures"]["make_name_calls"] >= 1 and classes["Futures"]["make_name_seconds"] > 0
+    assert snapshot["expiration_parsing"]["calls"] == 3
+    assert snapshot["validate_type"] == {"calls": 3, "items": 5, "seconds": snapshot["validate_type"]["seconds"]}
+    assert snapshot["registry"]["growth"] == 6
+    assert snapshot["registry"]["by_class"]["Option"] >= 4
+    json.dumps(snapshot)
+
+
+def test_disabled_profiler_restores_original_functions():
+    originals = (Asset.__dict__["__new__"], Asset.__dict__["_register_many"], Stock.__dict__["_make_name"],
+                 ExpirationDate.__init__, price_provider.validate_type)
+    profiler.enable()
+    assert Stock.__dict__["_make_name"] is not originals[2]
+    profiler.disable()
+    assert (Asset.__dict__["__new__"], Asset.__dict__["_register_many"], Stock.__dict__["_make_name"],
+            ExpirationDate.__init__, price_provider.validate_type) == originals
+    assert price_provider.validate_type is validation.validate_type
+
+    Stock("PRFC")
+    assert "Stock" not in profiler.snapshot()["classes"]
+    assert not profiler.snapshot()["enabled"]
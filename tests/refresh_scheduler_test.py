@@ -0,0 +1,131 @@
+import pytest
+from assets.instruments import Stock, Option
+from assets.price_providers import PriceProvider, RefreshScheduler
+
+
+class CountingProvider(PriceProvider):
+    """In-memory provider recording every update_price call."""
+
+    def __init__(self, asset_class=Stock):
+        self._asset_class = asset_class
+        self.calls = []
+
+    @property
+    def asset_class(self):
+        return self._asset_class
+
+    def update_price(self, asset) -> None:
+        if isinstance(asset, list):
+            self.calls.append(list(asset))
+        super().update_price(asset)
+
+    def get_price(self, asset) -> float:
+        return 100.0 + len(self.calls)
+
+    def get_previous_close_price(self, asset) -> float:
+        return 100.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_scheduler_batches_due_assets():
+    clock = FakeClock()
+    provider = CountingProvider()
+    scheduler = RefreshScheduler(provider, default_interval=10, batch_size=2, clock=clock)
+    stocks = [Stock(t) for t in ("SCHA", "SCHB", "SCHC")]
+    for s in stocks:
+        scheduler.add(s)
+
+    assert scheduler.run_pending() == 3
+    assert [len(batch) for batch in provider.calls] == [2, 1]
+    assert all(s.price is not None for s in stocks)
+
+    clock.now = 5
+    assert scheduler.due() == []
+    assert scheduler.run_pending() == 0
+
+    clock.now = 10
+    assert set(scheduler.due()) == set(stocks)
+
+
+def test_scheduler_prioritizes_near_expiry_and_large_positions():
+    clock = FakeClock()
+    provider = CountingProvider(asset_class=(Stock, Option))
+    scheduler = RefreshScheduler(provider, default_interval=100, near_expiry_days=7, near_expiry_factor=0.25,
+                                 large_position=1000, large_position_factor=0.5, clock=clock)
+    stock = Stock("SCHD")
+    option = Option(stock, strike=50, expiration="451231", option_type="C")
+    scheduler.add(stock, position=5000)
+    scheduler.add(option)
+    assert scheduler.effective_interval(stock) == 50
+    assert scheduler.effective_interval(option) == 100
+    option.expiration.fix_time(2 / 365)
+    assert scheduler.effective_interval(option) == 25
+
+
+def test_scheduler_drops_expired_derivatives():
+    clock = FakeClock()
+    provider = CountingProvider(asset_class=(Stock, Option))
+    scheduler = RefreshScheduler(provider, clock=clock)
+    stock = Stock("SCHE")
+    expired = Option(stock, strike=50, expiration="200101", option_type="P")
+    scheduler.add(stock)
+    scheduler.add(expired)
+    assert scheduler.run_pending() == 1
+    assert expired not in scheduler
+    assert provider.calls == [[stock]]
+
+
+def test_scheduler_records_errors_and_rejects_wrong_type():
+    class FailingProvider(CountingProvider):
+        def get_price(self, asset):
+            raise ValueError("unavailable")
+
+    scheduler = RefreshScheduler(FailingProvider(), clock=FakeClock())
+    stock = Stock("SCHF")
+    scheduler.add(stock)
+    assert scheduler.run_pending() == 0
+    assert isinstance(scheduler.errors[stock], ValueError)
+    with pytest.raises(TypeError):
+        scheduler.add(Option(stock, strike=1, expiration="451231", option_type="C"))
+
+
+def test_scheduler_background_thread_stops_cleanly():
+    provider = CountingProvider()
+    scheduler = RefreshScheduler(provider, default_interval=0.01)
+    scheduler.add(Stock("SCHG"))
+    with scheduler:
+        assert scheduler.is_running()
+        for _ in range(200):
+            if len(provider.calls) >= 2:
+                break
+            scheduler._stop_event.wait(0.01)
+    assert not scheduler.is_running()
+    assert len(provider.calls) >= 2
+
+
+def test_scheduler_ignores_stale_entries_after_remove_and_add():
+    clock = FakeClock()
+    provider = CountingProvider()
+    scheduler = RefreshScheduler(provider, default_interval=10, clock=clock)
+    stock = Stock("SCHR")
+    scheduler.add(stock)
+    assert scheduler.run_pending() == 1  # next refresh due at 10
+
+    clock.now = 2
+    scheduler.remove(stock)
+    scheduler.add(stock)
+    assert scheduler.run_pending() == 1  # next refresh due at 12
+
+    clock.now = 10
+    assert scheduler.due() == []
+    assert scheduler.run_pending() == 0
+    clock.now = 12
+    assert scheduler.run_pending() == 1
+    assert [len(batch) for batch in provider.calls] == [1, 1, 1]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from assets.analytics import (simple_returns, log_returns, rolling_mean, rolling_std, ewma_volatility,
+                              correlation_matrix, RollingStats, EWMAVolatility)
+
+rng = np.random.default_rng(0)
+PRICES = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(300, 4)), axis=0))
+
+
+def test_returns():
+    np.testing.assert_allclose(simple_returns([[100, 50], [110, 45]]), [[0.1, -0.1]])
+    np.testing.assert_allclose(log_returns(PRICES), np.log(1 + simple_returns(PRICES)))
+
+
+def test_rolling_statistics_match_naive_windows():
+    window = 20
+    naive_mean = np.array([PRICES[i:i + window].mean(axis=0) for i in range(len(PRICES) - window + 1)])
+    naive_std = np.array([PRICES[i:i + window].std(axis=0, ddof=1) for i in range(len(PRICES) - window + 1)])
+    np.testing.assert_allclose(rolling_mean(PRICES, window), naive_mean)
+    np.testing.assert_allclose(rolling_std(PRICES, window), naive_std, rtol=1e-8)
+    with pytest.raises(ValueError):
+        rolling_mean(PRICES, 0)
+
+
+def test_ewma_volatility_matches_recursion():
+    returns = log_returns(PRICES)
+    vol = ewma_volatility(returns, lam=0.9)
+    variance = returns[0] ** 2
+    estimator = EWMAVolatility(lam=0.9)
+    for t, r in enumerate(returns):
+        variance = 0.9 * variance + 0.1 * r ** 2
+        np.testing.assert_allclose(vol[t], np.sqrt(variance))
+        np.testing.assert_allclose(estimator.update(r), np.sqrt(variance))
+    np.testing.assert_allclose(ewma_volatility(returns, 0.9, periods_per_year=252), vol * np.sqrt(252))
+
+
+def test_correlation_matrix():
+    returns = log_returns(PRICES)
+    np.testing.assert_allclose(correlation_matrix(returns), np.corrcoef(returns, rowvar=False))
+
+
+def test_rolling_stats_incremental_update():
+    stats = RollingStats(window=10, n_assets=4)
+    for t, bar in enumerate(PRICES[:55]):
+        stats.append(bar)
+    np.testing.assert_allclose(stats.mean, PRICES[45:55].mean(axis=0))
+    np.testing.assert_allclose(stats.std, PRICES[45:55].std(axis=0, ddof=1), rtol=1e-6)
+    partial = RollingStats(window=10, n_assets=4)
+    partial.extend(PRICES[:3])
+    np.testing.assert_allclose(partial.mean, PRICES[:3].mean(axis=0))
+
+
+def test_rolling_stats_are_accurate_on_price_levels():
+    prices = 1e8 + np.cumsum(rng.normal(0, 0.01, size=(57, 2)), axis=0)
+    stats = RollingStats(window=10, n_assets=2)
+    stats.extend(prices)
+    np.testing.assert_allclose(stats.mean, prices[-10:].mean(axis=0))
+    np.testing.assert_allclose(stats.std, prices[-10:].std(axis=0, ddof=1), rtol=1e-6)
@@ -0,0 +1,90 @@
+import csv
+import math
+from datetime import datetime
+import pytest
+from assets.__main__ import main
+from assets.batch import revalue_file, OUTPUT_COLUMNS
+from assets.instruments import Stock
+from assets.pricing import black76_price
+
+
+def write_positions(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["instrument", "underlying", "strike", "expiration", "option_type",
+                         "forward_price", "contract_size", "quantity", "vol"])
+        writer.writerows(rows)
+
+
+def read_results(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_revalue_file_streams_chunks_in_order(tmp_path):
+    positions, output = tmp_path / "positions.csv", tmp_path / "values.csv"
+    write_positions(positions, [
+        ["option", "RVLA", 100, "450616", "C", "", "", 2, "0.25"],
+        ["futures", "RVLA", "", "451219", "", 90, 10, -1, ""],
+        ["", "RVLB", 50, "450616", "P", "", "", 1, ""],
+        ["option", "RVLA", 100, "440101", "P", "", "", 3, ""],
+    ])
+    seen = []
+    underlying = Stock("RVLA", price=1.0)
+    stats = revalue_file(positions, output, {"RVLA": 100.0}, as_of=datetime(2045, 1, 2), vol=0.2, r=0.01,
+                         chunk_size=3, progress=seen.append)
+    results = read_results(output)
+
+    assert (stats.rows, stats.chunks, stats.errors) == (4, 2, 1)
+    assert [s.rows for s in seen] == [3, 4]
+    assert list(results[0]) == list(OUTPUT_COLUMNS)
+    assert [int(r["row"]) for r in results] == [0, 1, 2, 3]
+    T = float(results[0]["T"])
+    assert T == pytest.approx((165 + 1) / 365)
+    expected = 100 * black76_price(100 * math.exp(0.01 * T), 100, T, 0.25, 0.01, "C")
+    assert float(results[0]["unit_value"]) == pytest.approx(expected)
+    assert float(results[0]["value"]) == pytest.approx(2 * expected)
+    T = float(results[1]["T"])
+    assert float(results[1]["value"]) == pytest.approx(-10 * (100 * math.exp(0.01 * T) - 90))
+    assert results[2]["error"] == "no price for RVLB" and results[2]["value"] == ""
+    assert float(results[3]["value"]) == 0.0  # expired out of the money
+    assert stats.value == pytest.approx(sum(float(r["value"]) for r in results if r["value"]))
+    assert underlying.price == 1.0
+
+
+def test_command_line_with_workers(tmp_path, capsys):
+    positions, prices = tmp_path / "positions.csv", tmp_path / "prices.csv"
+    write_positions(positions, [["option", "RVLC", k, "451219", "C", "", "", 1, ""] for k in range(80, 125, 5)])
+    prices.write_text("name,price\nRVLC,101\n")
+    args = ["revalue", str(positions), "--prices", str(prices), "--as-of", "2045-01-02", "--vol", "0.3",
+            "--chunk-size", "4"]
+    assert main(args + ["-o", str(tmp_path / "serial.csv"), "--progress"]) == 0
+    assert main(args + ["-o", str(tmp_path / "parallel.csv"), "--workers", "2"]) == 0
+    assert (tmp_path / "serial.csv").read_text() == (tmp_path / "parallel.csv").read_text()
+    assert "chunk 3: 9 rows" in capsys.readouterr().err
+    assert main(["revalue", str(tmp_path / "missing.csv")]) == 2
+
+
+def test_malformed_rows_are_reported_and_contracts_are_not_registered(tmp_path):
+    from assets.core import Asset
+
+    positions, output = tmp_path / "positions.csv", tmp_path / "values.csv"
+    rows = [["option", "RVLD", 100 + k, "451219", "C", "", "", 1, ""] for k in range(50)]
+    rows[3][2] = ""
+    rows[7][4] = "X"
+    rows[9][3] = "451399"
+    rows[11] = ["futures", "RVLD", "", "451219", "", "abc", 10, 1, ""]
+    rows[12][7] = "two"
+    write_positions(positions, rows)
+    size = len(Asset._assets)
+    stats = revalue_file(positions, output, {"RVLD": 120.0}, as_of=datetime(2045, 1, 2), vol=0.2, chunk_size=8)
+    results = read_results(output)
+
+    assert len(Asset._assets) == size
+    assert (stats.rows, stats.errors) == (50, 5)
+    assert [r["error"] for r in results[:13] if r["error"]] == [
+        "missing strike", "invalid option_type 'X'",
+        "Invalid expiration date format: '451399'. Expected 'YYMMDD'.", "invalid forward_price 'abc'",
+        "invalid quantity 'two'"]
+    assert results[4]["name"] == "RVLD451219C00104000" and results[4]["error"] == ""
+    assert float(results[4]["value"]) > 0
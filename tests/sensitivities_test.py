@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from assets.core import ValuationContext
+from assets.instruments import Stock, Futures, Option
+from assets.pricing import black76_greeks, black76_price
+from assets.risk import BumpEngine, MonteCarloPricer
+from assets.strategies import Strategy
+
+
+def _book():
+    stock = Stock("BMPA", price=100)
+    call = Option(stock, strike=100, expiration="451120", option_type="C")
+    call.expiration.fix_time(0.5)
+    fut = Futures(stock, expiration="451220", forward_price=98, contract_size=10, price=101)
+    fut.expiration.fix_time(1.0)
+    put = Option(fut, strike=100, expiration="451121", option_type="P", multiplier=10)
+    put.expiration.fix_time(0.5)
+    return stock, call, fut, put
+
+
+def test_black76_sensitivities_match_closed_form():
+    stock, call, fut, put = _book()
+    engine = BumpEngine([call, put, fut, stock], vols=0.3, r=0.02, spot_bump=1e-4, vol_bump=1e-4, time_bump=1e-6)
+    result = engine.sensitivities()
+
+    F = 100 * np.exp(0.02 * 0.5)
+    g = black76_greeks(F, 100, 0.5, 0.3, 0.02, "C")
+    assert result.value[0] == pytest.approx(100 * g.price)
+    assert result.delta[0] == pytest.approx(100 * g.delta * F / 100, rel=1e-6)
+    assert result.gamma[0] == pytest.approx(100 * g.gamma * (F / 100) ** 2, rel=1e-4)
+    assert result.vega[0] == pytest.approx(100 * g.vega, rel=1e-6)
+    # Spot is held fixed, so theta includes the drift of the forward.
+    assert result.theta[0] == pytest.approx(100 * (g.theta - g.delta * F * 0.02), rel=1e-4)
+
+    g = black76_greeks(101, 100, 0.5, 0.3, 0.02, "P")
+    assert result.delta[1] == pytest.approx(10 * g.delta, rel=1e-6)  # with respect to the futures price
+    # Futures are valued off their own quote, like the options written on them.
+    assert result.value[2] == pytest.approx(10 * (101 - 98))
+    assert result.delta[2] == pytest.approx(10.0) and result.theta[2] == 0.0
+    assert result.delta[3] == pytest.approx(1.0) and result.vega[3] == 0.0
+    assert stock.price == 100 and fut.price == 101
+
+
+def test_strategies_monte_carlo_and_contexts():
+    stock, call, fut, put = _book()
+    upper = Option(stock, strike=110, expiration="451120", option_type="C")
+    upper.expiration.fix_time(0.5)
+    spread = Strategy([(call, 1, 0), (upper, -1, 0)])
+    closed = BumpEngine([spread, call, upper], vols=0.25).sensitivities()
+    np.testing.assert_allclose(closed.value[0], closed.value[1] - closed.value[2])
+    np.testing.assert_allclose(closed.vega[0], closed.vega[1] - closed.vega[2])
+
+    pricer = MonteCarloPricer(n_paths=100000, seed=7)
+    simulated = BumpEngine([spread], vols=0.25, pricer=pricer).sensitivities()
+    assert simulated.value[0] == pytest.approx(closed.value[0], rel=0.01)
+    assert simulated.delta[0] == pytest.approx(closed.delta[0], rel=0.02)
+    assert simulated.vega[0] == pytest.approx(closed.vega[0], rel=0.05)
+    with pytest.raises(ValueError):
+        BumpEngine([call], pricer=pricer)
+
+    with ValuationContext({stock: 120.0}):
+        shifted = BumpEngine([call], vols=0.25).revalue([0.0, 0.1])
+    assert shifted[0, 0] == pytest.approx(100 * black76_price(120, 100, 0.5, 0.25))
+    assert shifted[1, 0] == pytest.approx(100 * black76_price(132, 100, 0.5, 0.25))
+    assert stock.price == 100
+
+
+def test_mixed_driver_strategies_and_missing_vols_raise():
+    stock, call, fut, put = _book()
+    # Both legs settle on the stock, but the futures leg moves with its own quote.
+    with pytest.raises(ValueError, match="different prices"):
+        BumpEngine([Strategy([(fut, 1, 0), (call, 1, 0)])], vols=0.3)
+    with pytest.raises(ValueError, match="No volatility"):
+        BumpEngine([call, put], vols={put: 0.3})
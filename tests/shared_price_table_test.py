@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+from assets.instruments import Stock
+from assets.price_providers import SharedPricePublisher, SharedPriceReader
+
+
+def test_publish_and_read_in_process():
+    a, b = Stock("SHMA", price=10), Stock("SHMB", price=20)
+    with SharedPricePublisher() as publisher:
+        reader = SharedPriceReader(publisher.name)
+        assert reader.version == 0
+        assert reader.price(a) is None
+        version = publisher.publish_assets([a, b], timestamp=123.0)
+        assert version == reader.version == 1
+        prices, timestamps, read_version = reader.read([a.id, b.id])
+        np.testing.assert_array_equal(prices, [10, 20])
+        np.testing.assert_array_equal(timestamps, [123.0, 123.0])
+        assert read_version == 1
+        assert reader.prices[b.id] == 20
+
+        a.set_price(11)
+        publisher.publish()
+        assert reader.price(a) == 11 and reader.version == 2
+        reader.close()
+
+
+def test_publish_rejects_ids_beyond_capacity():
+    with SharedPricePublisher(capacity=1) as publisher:
+        with pytest.raises(ValueError):
+            publisher.publish([5])
+
+
+def test_reader_in_other_process():
+    stock = Stock("SHMC", price=42.5)
+    with SharedPricePublisher() as publisher:
+        publisher.publish()
+        script = f"""
+from assets.price_providers import SharedPriceReader
+reader = SharedPriceReader({publisher.name!r})
+prices, timestamps, version = reader.read([{stock.id}])
+print(prices[0], version)
+reader.close()
+"""
+        out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+        assert out.stdout.split() == ["42.5", "1"]
+        # The reader exiting must not destroy the segment.
+        with SharedPriceReader(publisher.name) as reader:
+            assert reader.price(stock) == 42.5
@@ -0,0 +1,63 @@
+import pickle
+import subprocess
+import sys
+from assets.core import Asset, save_registry, load_registry
+from assets.instruments import Stock, Futures, Option
+
+
+def _build_universe():
+    stock = Stock("SNPA", price=101.5)
+    fut = Futures(stock, expiration="451220", forward_price=105, contract_size=10, price=104.0)
+    fut_opt = Option(fut, strike=110, expiration="451120", option_type="C", price=2.5, multiplier=1)
+    opt = Option(stock, strike=100, expiration="450620", option_type="P")
+    opt.expiration.fix_time(0.5)
+    return stock, fut, fut_opt, opt
+
+
+def test_snapshot_reload_restores_state_in_place(tmp_path):
+    stock, fut, fut_opt, opt = _build_universe()
+    path = tmp_path / "registry.snap"
+    save_registry(path)
+
+    stock.set_price(1.0)
+    opt.expiration.unfix_time()
+    fut_opt.underlying = stock
+
+    restored = load_registry(path)
+    assert stock in restored
+    assert stock.price == 101.5
+    assert opt.price is None
+    assert opt.expiration.T == 0.5
+    assert fut_opt.underlying is fut
+    assert fut_opt.get_true_underlying(get_order=True) == (stock, 2)
+    assert Option(fut, strike=110, expiration="451120", option_type="C", price=2.5, multiplier=1) is fut_opt
+
+
+def test_snapshot_restores_singletons_in_fresh_process(tmp_path):
+    _build_universe()
+    path = tmp_path / "registry.snap"
+    with open(path, "wb") as f:
+        save_registry(f)
+    script = f"""
+from assets.core import Asset, load_registry
+from assets.instruments import Stock, Futures, Option
+load_registry({str(path)!r})
+stock = Stock("SNPA", price=101.5)
+fut = Asset._assets["Futures(SNPAZ20)"]
+fut_opt = Option(fut, strike=110, expiration="451120", option_type="C", price=2.5, multiplier=1)
+assert fut.underlying is stock and fut.forward_price == 105 and fut.contract_size == 10
+assert fut_opt.underlying is fut and fut_opt.multiplier == 1
+assert Asset._assets["Option(SNPA450620P00100000)"].expiration.T == 0.5
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_snapshot_rejects_unknown_payload(tmp_path):
+    path = tmp_path / "bad.snap"
+    path.write_bytes(pickle.dumps({"version": -1}))
+    try:
+        load_registry(path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from assets.instruments import Stock, Futures, Option
+from assets.strategies import PiecewiseLinearPayoff, Strategy
+
+GRID = np.linspace(0, 300, 3001)
+
+
+def _grid_payoff(legs, ST):
+    return sum(q * np.asarray(a.price_at_expiration(ST), dtype=float) for a, q in legs)
+
+
+def test_compiled_payoff_matches_price_at_expiration():
+    stock = Stock("STRA", price=100)
+    fut = Futures(stock, expiration="451220", forward_price=102, contract_size=10)
+    legs = [(Option(stock, 90, "451120", "P"), -2), (Option(stock, 110, "451120", "C"), 3),
+            (Option(stock, 110, "451120", "P"), 1), (fut, -1), (stock, 50)]
+    strategy = Strategy([(a, q, 0) for a, q in legs])
+    np.testing.assert_allclose(strategy.payoff(GRID), _grid_payoff(legs, GRID))
+    assert strategy.underlying is stock
+    assert strategy.cost == 0
+
+
+def test_spread_and_straddle_analytics_are_exact():
+    stock = Stock("STRB", price=100)
+    spread = Strategy.vertical_spread(stock, 95, 105, "451120", premiums=[700, 300])
+    assert spread.cost == 400
+    assert spread.max_profit() == pytest.approx(600)
+    assert spread.max_loss() == pytest.approx(400)
+    np.testing.assert_allclose(spread.breakevens(), [99.0])
+
+    straddle = Strategy.straddle(stock, 100, "451120", premiums=[500, 500])
+    np.testing.assert_allclose(straddle.breakevens(), [90.0, 110.0])
+    assert straddle.max_profit() == np.inf
+    assert straddle.max_loss() == pytest.approx(1000)
+
+    butterfly = Strategy.butterfly(stock, 90, 100, 110, "451120", premiums=[1200, 500, 100])
+    assert butterfly.max_profit() == pytest.approx(1000 - 300)
+    np.testing.assert_allclose(butterfly.breakevens(), [93.0, 107.0])
+    profit = butterfly.profit_at(GRID)
+    assert butterfly.max_loss() == pytest.approx(-profit.min())
+
+
+def test_short_call_and_default_premiums():
+    stock = Stock("STRC", price=100)
+    call = Option(stock, 100, "451120", "C", price=250)
+    short = Strategy([(call, -1)])
+    assert short.max_profit() == pytest.approx(250)
+    assert short.max_loss() == np.inf
+    np.testing.assert_allclose(short.breakevens(), [102.5])
+    with pytest.raises(ValueError):
+        Strategy([(Option(stock, 120, "451120", "C"), 1)])
+    with pytest.raises(ValueError):
+        Strategy([(call, 1, 0), (Option(Stock("STRD"), 1, "451120", "C"), 1, 0)])
+
+
+def test_payoff_algebra():
+    call = PiecewiseLinearPayoff([100], [1])
+    put = PiecewiseLinearPayoff([100], [1], intercept=100, slope=-1)
+    np.testing.assert_allclose((call + put)(GRID), np.abs(GRID - 100))
+    np.testing.assert_allclose((2 * call)(GRID), 2 * np.maximum(GRID - 100, 0))
+    assert PiecewiseLinearPayoff(slope=1).shift(-5).roots().tolist() == [5.0]
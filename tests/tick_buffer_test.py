@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from assets.core import TickBuffer
+from assets.instruments import Stock
+
+rng = np.random.default_rng(2)
+TIMES = np.sort(rng.uniform(0, 600, size=2000))
+PRICES = 100 + np.cumsum(rng.normal(0, 0.1, size=2000))
+VOLUMES = rng.integers(1, 100, size=2000).astype(float)
+
+
+def _naive_bars(times, prices, volumes, interval):
+    starts = times // interval * interval
+    rows = []
+    for s in np.unique(starts):
+        m = starts == s
+        rows.append((s, prices[m][0], prices[m].max(), prices[m].min(), prices[m][-1],
+                     (prices[m] * volumes[m]).sum() / volumes[m].sum(), volumes[m].sum(), m.sum()))
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_incremental_bars_match_naive_resampling(bulk):
+    buffer = TickBuffer(capacity=500, intervals=[60])
+    if bulk:
+        buffer.extend(TIMES[:700], PRICES[:700], VOLUMES[:700])
+        buffer.extend(TIMES[700:], PRICES[700:], VOLUMES[700:])
+    else:
+        for t, p, v in zip(TIMES, PRICES, VOLUMES):
+            buffer.append(t, p, v)
+    buffer.add_interval(7)  # late registration covers the kept ticks only
+    np.testing.assert_allclose(np.column_stack(buffer.bars(60)), _naive_bars(TIMES, PRICES, VOLUMES, 60))
+    np.testing.assert_allclose(np.column_stack(buffer.bars(7)),
+                               _naive_bars(TIMES[-500:], PRICES[-500:], VOLUMES[-500:], 7))
+    assert len(buffer.bars(60, include_current=False).start) == 9
+
+    times, prices, _ = buffer.ticks()
+    np.testing.assert_array_equal(times, TIMES[-500:])
+    assert len(buffer) == 500 and buffer.count == 2000
+    assert buffer.last_price() == PRICES[-1]
+
+
+def test_bar_ring_keeps_the_latest_bars():
+    buffer = TickBuffer(capacity=10, intervals=[1], bar_capacity=3)
+    buffer.extend(np.arange(10.0), np.arange(10.0))
+    np.testing.assert_array_equal(buffer.bars(1).start, [6, 7, 8, 9])
+
+
+def test_assets_record_ticks_from_set_price():
+    stock = Stock("TICKA", price=1.0)
+    assert stock.ticks is None
+    with pytest.raises(ValueError):
+        stock.record_tick(2.0)
+    buffer = stock.record_ticks(capacity=8, intervals=[60])
+    stock.set_price(2.0)
+    stock.set_price(None)
+    stock.record_tick(4.0, volume=3, timestamp=buffer.ticks()[0][0])
+    assert stock.price == 4.0
+    bars = stock.ticks.bars(60)
+    assert bars.count.tolist() == [2] and bars.vwap[0] == pytest.approx(3.5)
+    stock.stop_recording_ticks()
+    assert stock.ticks is None
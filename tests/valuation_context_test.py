@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from assets.core import ValuationContext
+from assets.instruments import Stock, Option
+from assets.pricing import value_options
+
+
+def test_relookup_keeps_price_and_fixed_time():
+    stock = Stock("CTXA", price=10)
+    assert Stock("CTXA").price == 10
+    option = Option(stock, 10, "451120", "C")
+    option.expiration.fix_time(0.5)
+    assert Option(stock, 10, "451120", "C").expiration.T == 0.5
+
+
+def test_context_overlays_prices_and_times_copy_on_write():
+    stock = Stock("CTXB", price=100)
+    other = Stock("CTXC", price=50)
+    option = Option(stock, 100, "451120", "C")
+    option.expiration.fix_time(1.0)
+
+    scenario = ValuationContext({stock: 120}, times={option: 0.25})
+    with scenario:
+        assert stock.price == 120 and other.price == 50
+        assert option.expiration.T == 0.25
+        other.set_price(55)
+        with scenario.child({stock: None}):
+            assert stock.price is None and other.price == 55
+        np.testing.assert_array_equal(scenario.get_prices([stock, other, option]), [120, 55, np.nan])
+    assert stock.price == 100 and other.price == 50 and option.expiration.T == 1.0
+    other.set_price(60)
+    with scenario:
+        assert other.price == 55
+
+
+def test_parallel_scenarios_value_independently():
+    stock = Stock("CTXD", price=100)
+    option = Option(stock, 100, "451120", "C")
+    option.expiration.fix_time(0.5)
+    spots = np.linspace(80, 120, 16)
+
+    def value(spot):
+        with ValuationContext({stock: spot}):
+            return value_options([option], 0.2).price[0]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        parallel = list(pool.map(value, spots))
+    sequential = [value(s) for s in spots]
+    np.testing.assert_allclose(parallel, sequential)
+    assert np.all(np.diff(parallel) > 0)
+    assert stock.price == 100
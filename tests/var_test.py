@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from assets.instruments import Stock, Currency, Futures, Option
+from assets.pricing import black76_price
+from assets.risk import RiskEngine
+
+rng = np.random.default_rng(1)
+
+
+def _book():
+    stock = Stock("VARA", price=100)
+    eur = Currency("VAREUR", exchange_rate=1.1)
+    fut = Futures(stock, expiration="451220", forward_price=98, contract_size=10, price=101)
+    fut.expiration.fix_time(1.0)
+    call = Option(fut, strike=100, expiration="451120", option_type="C", multiplier=10)
+    call.expiration.fix_time(0.5)
+    put = Option(stock, strike=95, expiration="451120", option_type="P")
+    put.expiration.fix_time(0.5)
+    return stock, eur, fut, call, put
+
+
+def test_linear_positions_and_full_option_revaluation():
+    stock, eur, fut, call, put = _book()
+    engine = RiskEngine({stock: 5, eur: 1000, fut: -2, call: 3, put: 4}, vols={call: 0.3}, r=0.02, chunk_size=7)
+    assert engine.underlyings == [stock, eur]
+    returns = rng.normal(0, 0.05, size=(50, 2))
+    pnl = engine.position_pnl(returns)
+
+    np.testing.assert_allclose(pnl[:, 0], 5 * 100 * returns[:, 0])
+    np.testing.assert_allclose(pnl[:, 1], 1000 * 1.1 * returns[:, 1])
+    np.testing.assert_allclose(pnl[:, 2], -2 * 10 * 101 * returns[:, 0])
+    F = 101 * (1 + returns[:, 0])
+    np.testing.assert_allclose(pnl[:, 3], 3 * 10 * (black76_price(F, 100, 0.5, 0.3, 0.02) - black76_price(101, 100, 0.5, 0.3, 0.02)))
+    S = 100 * (1 + returns[:, 0])
+    np.testing.assert_allclose(pnl[:, 4], 4 * (put.price_at_expiration(S) - put.price_at_expiration(100)))
+    np.testing.assert_allclose(engine.pnl(returns), pnl.sum(axis=1))
+
+
+def test_historical_var_es_and_components():
+    stock, eur, fut, call, put = _book()
+    engine = RiskEngine([(stock, 5), (eur, 1000), (call, 3)], vols=0.3)
+    returns = rng.normal(0, 0.02, size=(1000, 2))
+    report = engine.historical(returns, alpha=0.95)
+    losses = np.sort(-engine.pnl(returns))[::-1]
+    assert report.var == pytest.approx(losses[49])
+    assert report.es == pytest.approx(losses[:50].mean())
+    assert report.component_var.sum() == pytest.approx(report.var)
+    np.testing.assert_allclose(report.marginal_es, report.component_es / [5, 1000, 3])
+    with pytest.raises(ValueError):
+        engine.historical(returns[:, :1])
+
+
+def test_parametric_matches_delta_normal_and_monte_carlo_converges():
+    stock, eur, *_ = _book()
+    engine = RiskEngine({stock: 10, eur: -500})
+    cov = np.array([[0.0004, 0.0001], [0.0001, 0.0002]])
+    exposure = np.array([10 * 100, -500 * 1.1])
+    sigma = np.sqrt(exposure @ cov @ exposure)
+    report = engine.parametric(cov, alpha=0.99)
+    assert report.var == pytest.approx(2.326348 * sigma, rel=1e-5)
+    assert report.es == pytest.approx(2.665214 * sigma, rel=1e-5)
+    assert report.component_es.sum() == pytest.approx(report.es)
+
+    simulated = engine.monte_carlo(cov, n_scenarios=200000, alpha=0.99, seed=0)
+    assert simulated.var == pytest.approx(report.var, rel=0.03)
+
+
+def test_missing_prices_are_rejected():
+    with pytest.raises(ValueError):
+        RiskEngine({Stock("VARB"): 1})
+
+
+def test_monte_carlo_is_chunked_and_matches_historical_on_the_same_draws():
+    stock, eur, fut, call, put = _book()
+    positions = {stock: 5, eur: 1000, call: 3, put: -4}
+    cov = np.array([[0.0004, 0.0001], [0.0001, 0.0002]])
+    chunked = RiskEngine(positions, vols=0.3, chunk_size=37).monte_carlo(cov, n_scenarios=2000, alpha=0.97, seed=3)
+    engine = RiskEngine(positions, vols=0.3, chunk_size=5000)
+    draws = np.random.default_rng(3).multivariate_normal(np.zeros(2), cov, size=2000, method="cholesky")
+    expected = engine.historical(np.expm1(draws), alpha=0.97)
+    assert chunked.var == pytest.approx(expected.var) and chunked.es == pytest.approx(expected.es)
+    np.testing.assert_allclose(chunked.component_es, expected.component_es)
+    np.testing.assert_allclose(chunked.pnl, expected.pnl)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from assets.instruments import Stock, Option, create_options
+from assets.pricing import VolSurface
+
+
+def _chain(ticker):
+    stock = Stock(ticker, price=100)
+    options = create_options(stock, [90, 100, 110] * 2, ["450620"] * 3 + ["451220"] * 3, "C")
+    for o in options[:3]:
+        o.expiration.fix_time(0.5)
+    for o in options[3:]:
+        o.expiration.fix_time(1.0)
+    return stock, options
+
+
+def test_vol_surface_interpolates_in_strike_and_total_variance():
+    stock, options = _chain("VOLA")
+    surface = VolSurface(options, [0.30, 0.25, 0.28, 0.26, 0.22, 0.24])
+    assert surface.expirations == ["450620", "451220"]
+    np.testing.assert_allclose(surface.vol([90, 95, 120, 80], 0.5), [0.30, 0.275, 0.28, 0.30])
+    np.testing.assert_allclose(surface.vol(100, [0.25, 2.0]), [0.25, 0.22])
+    expected = np.sqrt((0.5 * 0.25 ** 2 * 0.5 + 0.5 * 0.22 ** 2 * 1.0) / 0.75)
+    np.testing.assert_allclose(surface.vol(100, 0.75), expected)
+    np.testing.assert_allclose(surface.vol_for(options), [0.30, 0.25, 0.28, 0.26, 0.22, 0.24])
+    assert surface.vol(np.ones((2, 3)) * 100, 0.5).shape == (2, 3)
+
+
+def test_vol_surface_incremental_update_and_removal():
+    stock, options = _chain("VOLB")
+    surface = VolSurface(options, [0.30, 0.25, 0.28, 0.26, 0.22, 0.24])
+    far_slice = surface._slices["451220"]
+    surface.update([options[1]], [0.20])
+    assert surface._slices["451220"] is far_slice  # untouched slice is not rebuilt
+    np.testing.assert_allclose(surface.vol(100, 0.5), 0.20)
+    surface.update(options[3:], [np.nan] * 3)
+    assert surface.expirations == ["450620"]
+    assert len(surface) == 3
+
+
+def test_vol_surface_moneyness_and_validation():
+    stock, options = _chain("VOLC")
+    surface = VolSurface(options[:3], [0.30, 0.25, 0.28], by="moneyness")
+    np.testing.assert_allclose(surface.vol(1.0, 0.5), 0.25)
+    other = Option(Stock("VOLD", price=1), strike=1, expiration="450620", option_type="C")
+    with pytest.raises(ValueError):
+        surface.update([other], [0.2])
+    with pytest.raises(ValueError):
+        VolSurface(options, [0.2], by="strike")
+    with pytest.raises(ValueError):
+        VolSurface(options, [0.2] * 6, by="delta")
+
+
+def test_moneyness_quotes_are_keyed_by_strike_across_spot_moves():
+    stock, options = _chain("VOLE")
+    surface = VolSurface(options[:3], [0.30, 0.25, 0.28], by="moneyness")
+    stock.set_price(110)
+    surface.update([options[1]], [0.20])
+    assert len(surface) == 3
+    np.testing.assert_allclose(surface.vol(100 / 110, 0.5), 0.20)
+    np.testing.assert_allclose(surface.vol_for(options[:3]), [0.30, 0.20, 0.28])
+    surface.update([options[0]], [np.nan])
+    assert len(surface) == 2